@@ -1,12 +1,13 @@
 """
 Generate week sheets from the Schedule Generator sheet.
-Reads the matchup matrix and creates game schedules for each week.
+Reads the matchup matrix and builds the whole season with season_scheduler: matchup counts honored,
+two courts per round, refs from the teams sitting out (team-ref), no 3-round idle streaks and
+balanced home/away.
 """
 
 import argparse
 import openpyxl
 import re
-from itertools import combinations
 
 from league_schedule_format import (
     DEDICATED_REF,
@@ -16,6 +17,8 @@ from league_schedule_format import (
     read_format_from_teams_sheet,
     win_loss_start_row,
 )
+from season_scheduler import schedule_season, season_meetings
+from suggest_idle_swaps import format_score, score_schedule
 
 def get_teams_from_schedule_generator(ws):
     """Extract team names from Schedule Generator sheet."""
@@ -56,41 +59,8 @@ def get_matchup_matrix(ws, teams):
     
     return matrix
 
-def generate_round_robin_schedule(teams, games_per_matchup=2):
-    """Generate a round-robin schedule where each team plays each other team N times."""
-    schedule = []
-    game_num = 1
-    
-    # Generate all possible matchups
-    for team1, team2 in combinations(teams, 2):
-        for _ in range(games_per_matchup):
-            schedule.append({
-                'game': game_num,
-                'team1': team1,
-                'team2': team2
-            })
-            game_num += 1
-    
-    return schedule
-
-def distribute_games_into_weeks(schedule, num_weeks):
-    """Distribute games evenly across weeks."""
-    games_per_week = len(schedule) // num_weeks
-    if len(schedule) % num_weeks != 0:
-        games_per_week += 1
-    
-    weeks = [[] for _ in range(num_weeks)]
-    
-    for i, game in enumerate(schedule):
-        week_index = i // games_per_week
-        if week_index >= num_weeks:
-            week_index = num_weeks - 1
-        weeks[week_index].append(game)
-    
-    return weeks
-
 def create_week_sheet(wb, week_name, games, teams, schedule_format=TEAM_REF):
-    """Create or update a week sheet with the game schedule."""
+    """Create or update a week sheet from season_scheduler rounds (parse_week_schedule dicts)."""
     wl_start = win_loss_start_row(len(games), schedule_format)
     new_last_game_row = wl_start - 1
 
@@ -104,20 +74,25 @@ def create_week_sheet(wb, week_name, games, teams, schedule_format=TEAM_REF):
             old_last_game_row = new_last_game_row
         clear_until_row = max(new_last_game_row, old_last_game_row)
         for row in range(2, clear_until_row + 1):
-            for col in range(1, 6):
+            for col in range(1, 11):
                 ws.cell(row, col).value = None
     else:
         ws = wb.create_sheet(week_name)
         ws.cell(1, 2).value = 'Court 1'
+    two_courts = any(game['court2_playing'][0] for game in games)
+    ws.cell(1, 7).value = 'Court 2' if two_courts else None
 
     row = 2
     for game in games:
-        ws.cell(row, 1).value = f'Game {game["game"]:02d}'
-        ws.cell(row, 2).value = game['team1']
-        ws.cell(row, 4).value = game['team2']
+        ws.cell(row, 1).value = game['gameNumber']
+        ws.cell(row, 2).value, ws.cell(row, 4).value = game['court1_playing']
+        if game['court2_playing'][0]:
+            ws.cell(row, 7).value, ws.cell(row, 9).value = game['court2_playing']
         row += 1
         if schedule_format == TEAM_REF:
-            ws.cell(row, 2).value = 'Ref'
+            ws.cell(row, 2).value = f"Refs: {game['court1Ref']}" if game['court1Ref'] else 'Ref'
+            if game['court2Ref']:
+                ws.cell(row, 7).value = f"Refs: {game['court2Ref']}"
             row += 1
 
     return ws
@@ -136,7 +111,7 @@ def resolve_schedule_format(wb, explicit_format=None):
     return TEAM_REF
 
 
-def main(file_path, num_weeks=6, schedule_format=None):
+def main(file_path, num_weeks=6, schedule_format=None, seed=0):
     """Main function to generate schedule from Schedule Generator."""
     print(f"Loading workbook: {file_path}")
     wb = openpyxl.load_workbook(file_path)
@@ -162,22 +137,17 @@ def main(file_path, num_weeks=6, schedule_format=None):
     for team in teams:
         print(f"  {team}: {matrix[team]}")
     
-    # Determine games per matchup (typically 2)
-    games_per_matchup = 2
-    if teams:
-        # Check first matchup to see how many games
-        first_team = teams[0]
-        if teams[1] in matrix[first_team]:
-            games_per_matchup = matrix[first_team][teams[1]]
-    
     print(f"\n=== Generating Schedule ===")
-    print(f"Games per matchup: {games_per_matchup}")
     print(f"Number of weeks: {num_weeks}")
-    
-    schedule = generate_round_robin_schedule(teams, games_per_matchup)
-    print(f"Total games: {len(schedule)}")
-    
-    weeks = distribute_games_into_weeks(schedule, num_weeks)
+    print(f"Total games: {len(season_meetings(teams, matrix))}")
+
+    try:
+        weeks, notes = schedule_season(teams, matrix, num_weeks, schedule_format, seed=seed)
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return
+    for note in notes:
+        print(f"  Relaxed: {note}")
     
     print(f"\n=== Creating Week Sheets ===")
     week_names = []
@@ -193,7 +163,7 @@ def main(file_path, num_weeks=6, schedule_format=None):
             # Create new name - you might want to customize this
             week_name = f'Week {i}'
         
-        print(f"  {week_name}: {len(week_games)} games")
+        print(f"  {week_name}: {len(week_games)} rounds  {format_score(score_schedule(week_games))}")
         create_week_sheet(wb, week_name, week_games, teams, schedule_format)
         week_names.append(week_name)
     
@@ -204,7 +174,7 @@ def main(file_path, num_weeks=6, schedule_format=None):
     print(f"\nNext steps:")
     print(f"  1. Review the generated week sheets")
     print(f"  2. Run setup_standings.py to add win/loss formulas")
-    print(f"  3. Manually adjust game order if needed")
+    print(f"  3. Check with: python3 suggest_idle_swaps.py --file \"{file_path}\" --all-weeks")
 
 if __name__ == '__main__':
     import sys
@@ -219,12 +189,14 @@ if __name__ == '__main__':
         default=None,
         help='Week sheet layout: team-ref (game+ref rows) or dedicated-ref (game rows only)',
     )
+    parser.add_argument('--seed', type=int, default=0, help='Scheduler seed (default: 0)')
     args, _unknown = parser.parse_known_args()
 
     if args.file_path:
         file_path = args.file_path
         num_weeks = args.num_weeks
         schedule_format = args.format
+        seed = args.seed
     else:
         # Interactive mode
         print("📅 Schedule Generator")
@@ -271,6 +243,7 @@ if __name__ == '__main__':
         
         print()
         schedule_format = None
+        seed = 0
 
-    main(file_path, num_weeks, schedule_format)
+    main(file_path, num_weeks, schedule_format, seed)
 
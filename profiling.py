@@ -0,0 +1,106 @@
+"""
+Opt-in timing and counters for the swap tools (--profile / --profile-out).
+
+Profile collects wall time per named phase and integer counters (candidates, prunes, scorer calls).
+Phases are coarse (one per load, search or write), so a Profile is always passed and only reported
+when asked for; hot loops count in locals and add the totals once. lap(name) books the time since
+the previous phase or lap, for straight-line report code that would otherwise need re-indenting.
+
+  prof = Profile()
+  with profile_run(prof, report=args.profile, pstats_path=args.profile_out):
+      with prof.phase("workbook load"):
+          ...
+      search()
+      prof.lap("search")
+      prof.count("deep-partial: pruned by floor", pruned, of="deep-partial: pairs")
+
+The report goes to stderr so --format ndjson output stays clean. pstats_path also runs the whole
+block under cProfile, dumps the stats there (read with python -m pstats) and prints the top entries.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+PSTATS_TOP = 25
+
+
+class Profile:
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self.calls: Counter[str] = Counter()
+        self.counts: Counter[str] = Counter()
+        self.share_of: dict[str, str] = {}
+        self._mark = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, t0)
+
+    def lap(self, name: str) -> None:
+        self._add(name, self._mark)
+
+    def _add(self, name: str, since: float) -> None:
+        now = time.perf_counter()
+        self.seconds[name] = self.seconds.get(name, 0.0) + now - since
+        self.calls[name] += 1
+        self._mark = now
+
+    def count(self, name: str, n: int = 1, *, of: str | None = None) -> None:
+        """`of`: another counter this one is a part of; the report shows the percentage."""
+        self.counts[name] += n
+        if of is not None:
+            self.share_of[name] = of
+
+    def report(self, total: float | None = None) -> list[str]:
+        lines = ["--- Profile ---"]
+        width = max((len(k) for k in (*self.seconds, *self.counts)), default=0)
+        for name, secs in self.seconds.items():
+            share = f"  {secs / total:6.1%}" if total else ""
+            calls = f"  x{self.calls[name]}" if self.calls[name] > 1 else ""
+            lines.append(f"  {name:<{width}}  {secs:9.3f}s{share}{calls}")
+        if total is not None:
+            lines.append(f"  {'total':<{width}}  {total:9.3f}s")
+        for name, n in self.counts.items():
+            whole = self.counts.get(self.share_of.get(name, ""), 0)
+            share = f"  {n / whole:6.1%} of {self.share_of[name]}" if whole else ""
+            lines.append(f"  {name:<{width}}  {n:>10d}{share}")
+        return lines
+
+
+@contextmanager
+def profile_run(
+    profile: Profile,
+    *,
+    report: bool = False,
+    pstats_path: str | None = None,
+    stream: TextIO | None = None,
+) -> Iterator[Profile]:
+    out = stream or sys.stderr
+    cprof = cProfile.Profile() if pstats_path else None
+    t0 = time.perf_counter()
+    if cprof is not None:
+        cprof.enable()
+    try:
+        yield profile
+    finally:
+        if cprof is not None:
+            cprof.disable()
+        total = time.perf_counter() - t0
+        if report or cprof is not None:
+            out.write("\n" + "\n".join(profile.report(total)) + "\n")
+        if cprof is not None:
+            cprof.dump_stats(pstats_path)
+            out.write(f"\ncProfile stats: {pstats_path} (top {PSTATS_TOP} by cumulative time)\n")
+            pstats.Stats(cprof, stream=out).sort_stats("cumulative").print_stats(PSTATS_TOP)
+        out.flush()
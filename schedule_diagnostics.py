@@ -0,0 +1,175 @@
+"""
+NDJSON records for week-schedule diagnostics (suggest_idle_swaps / suggest_ref_swaps_week4 --format ndjson).
+
+One JSON object per line, keyed by "type". Field names are stable and follow the web side
+(app/components/schedule/types.ts: gameNumber, team, severity, conflictType), so the admin app can
+read precomputed results instead of re-parsing the xlsx. Slots are 1-based round positions in the sheet.
+
+  {"type": "week", "schema": 1, "file": ..., "sheet": ..., "rounds": 20, "teams": [...], "score": {...}}
+  {"type": "conflict", "sheet": ..., "conflictType": "consecutive-without-playing", "team": ...,
+   "gameNumber": <last game>, "gameNumbers": [...], "slots": [...], "severity": "warning"}
+  {"type": "suggestion", "sheet": ..., "kind": "partial_swaps", "rank": 1, "score": {...}, "moves": [...],
+   "complete": true}            # false: --time-budget / --target-score stopped the search early
+
+conflictType is one of consecutive-without-playing, consecutive-ref, double-court, consecutive-matchup,
+ref-and-play. Moves:
+  {"op": "swapRounds", "a": 4, "b": 14}
+  {"op": "swapCourts", "a": 10, "courtA": 1, "b": 18, "courtB": 2}
+  {"op": "flipRefs", "slots": [3, 7]}
+  {"op": "swapRefs", "a": 5, "courtA": 2, "b": 9, "courtB": 1}
+  {"op": "reorder", "order": [1, 2, 4, 3, ...]}      # new slot k holds old slot order[k - 1]
+  {"op": "arrange", "courts": [[1, 1], [1, 2], [7, 2], [3, 1], ...]}
+                                # court c of new slot k holds old (game, court) courts[2(k - 1) + c - 1];
+                                # apply whole, the weeks between single court swaps may have blockers
+  {"op": "setRefs", "slot": 6, "court1Ref": ..., "court2Ref": ...}
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Iterable, Iterator, TextIO
+
+from suggest_idle_swaps import (
+    Score,
+    find_idle_streak_issues,
+    find_same_team_both_courts_issues,
+    ref_play_conflicts,
+    score_schedule,
+)
+from suggest_ref_swaps_week4 import find_consecutive_refs, find_consecutive_same_matchup
+from week_schedule import WeekSchedule, as_week_schedule
+
+NDJSON_SCHEMA = 1
+
+
+def score_fields(s: Score) -> dict[str, int]:
+    return {
+        "idleCount": s.idle_count,
+        "refPairs": s.ref_pairs,
+        "sameMatchAdj": s.same_match_adj,
+        "refPlay": s.ref_play,
+    }
+
+
+def swap_rounds_op(a: int, b: int) -> dict[str, Any]:
+    """a, b: 1-based slots."""
+    return {"op": "swapRounds", "a": a, "b": b}
+
+
+def swap_courts_op(m: tuple[int, int, int, int]) -> dict[str, Any]:
+    """m: (game_a, court_a, game_b, court_b), 1-based as in format_partial_move."""
+    ga, ca, gb, cb = m
+    return {"op": "swapCourts", "a": ga, "courtA": ca, "b": gb, "courtB": cb}
+
+
+def flip_refs_op(mask: int) -> dict[str, Any]:
+    """mask: apply_ref_flip_mask bits (bit i = slot i + 1)."""
+    return {"op": "flipRefs", "slots": [i + 1 for i in range(mask.bit_length()) if mask >> i & 1]}
+
+
+def arrange_op(layout: Iterable[tuple[int, int]]) -> dict[str, Any]:
+    """layout: optimize_week's Layout, 1-based (game, court) per court in slot order."""
+    return {"op": "arrange", "courts": [[g, c] for g, c in layout]}
+
+
+def week_records(
+    games: list[dict[str, Any]] | WeekSchedule, *, file: str, sheet: str
+) -> Iterator[dict[str, Any]]:
+    """
+    The week header, then every conflict the checkers find, in sheet order per check. Pass the
+    week's WeekSchedule when the caller checks it further, so it is interned once.
+    """
+    week = as_week_schedule(games)
+    labels = week.game_numbers
+    yield {
+        "type": "week",
+        "schema": NDJSON_SCHEMA,
+        "file": file,
+        "sheet": sheet,
+        "rounds": len(week),
+        "teams": week.teams,
+        "score": score_fields(score_schedule(week)),
+    }
+    for issue in find_idle_streak_issues(week):
+        yield _conflict(
+            sheet,
+            "consecutive-without-playing",
+            issue["team"],
+            issue["game_numbers"],
+            [k + 1 for k in issue["slot_indices"]],
+            issue["severity"],
+        )
+    for team, i, j in find_consecutive_refs(week):
+        yield _conflict(
+            sheet,
+            "consecutive-ref",
+            team,
+            [labels[i], labels[j]],
+            [i + 1, j + 1],
+            "warning",
+        )
+    slot_of = {label: k + 1 for k, label in enumerate(labels)}
+    for x in find_same_team_both_courts_issues(week):
+        yield _conflict(
+            sheet, "double-court", x["team"], [x["gameNumber"]], [slot_of[x["gameNumber"]]], "error"
+        )
+    for i, j, matchup in find_consecutive_same_matchup(week):
+        rec = _conflict(
+            sheet,
+            "consecutive-matchup",
+            " vs ".join(sorted(matchup)),
+            [labels[i], labels[j]],
+            [i + 1, j + 1],
+            "warning",
+        )
+        rec["teams"] = sorted(matchup)
+        yield rec
+    for ref, i, court in ref_play_conflicts(week):
+        rec = _conflict(sheet, "ref-and-play", ref, [labels[i]], [i + 1], "error")
+        rec["court"] = 1 if court == "court1" else 2
+        yield rec
+
+
+def suggestion_record(
+    sheet: str,
+    kind: str,
+    rank: int,
+    moves: list[dict[str, Any]],
+    score: Score | None = None,
+    **extra: Any,
+) -> dict[str, Any]:
+    rec: dict[str, Any] = {"type": "suggestion", "sheet": sheet, "kind": kind, "rank": rank}
+    if score is not None:
+        rec["score"] = score_fields(score)
+    rec["moves"] = moves
+    rec.update(extra)
+    return rec
+
+
+def write_ndjson(records: Iterable[dict[str, Any]], stream: TextIO | None = None) -> None:
+    out = stream or sys.stdout
+    for rec in records:
+        out.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+        out.write("\n")
+    out.flush()
+
+
+def _conflict(
+    sheet: str,
+    conflict_type: str,
+    team: str,
+    game_numbers: list[str],
+    slots: list[int],
+    severity: str,
+) -> dict[str, Any]:
+    return {
+        "type": "conflict",
+        "sheet": sheet,
+        "conflictType": conflict_type,
+        "team": team,
+        "gameNumber": game_numbers[-1],
+        "gameNumbers": game_numbers,
+        "slots": slots,
+        "severity": severity,
+    }
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark the schedule search engines: wall time, evaluations per second and peak memory.
+
+Engines: search_deep_partial_swap_sequences, search_two_round_swaps, search_ref_flips and
+optimize_week (suggest_idle_swaps), best_sequence_search (seven_team_balance_idle_reserve_g18, weeks
+of 18+ rounds) and optimize_game_order_evenness (generate_5team_dedicated_schedule).
+
+Cases are synthetic weeks (5-12 teams x 10-30 rounds, fixed seeds) plus every week sheet of the
+checked-in workbooks (public/league_schedules/*.xlsx and the Seven Team template when present).
+"Evaluations" are score lookups (ScoreCache hits + misses) for the cached searches, annealing moves
+for optimize_week, DP transitions for search_ref_flips and evenness scorings for the 5-team order.
+
+  python3 scripts/benchmark_schedule_search.py                       # quick grid + workbooks
+  python3 scripts/benchmark_schedule_search.py --sizes 7x18,12x30 --engines deep_partial,optimize
+  python3 scripts/benchmark_schedule_search.py --full --json bench.json
+  python3 scripts/benchmark_schedule_search.py --json new.json --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import glob
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for p in (ROOT, ROOT / "scripts"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import generate_5team_dedicated_schedule as five_team  # noqa: E402
+from profiling import Profile  # noqa: E402
+from seven_team_balance_idle_reserve_g18 import DEFAULT_FILE as SEVEN_TEAM_FILE  # noqa: E402
+from seven_team_balance_idle_reserve_g18 import IDX_MAX_SWAP, best_sequence_search  # noqa: E402
+from suggest_idle_swaps import (  # noqa: E402
+    ScoreCache,
+    optimize_week,
+    search_deep_partial_swap_sequences,
+    search_ref_flips,
+    search_two_round_swaps,
+)
+from week_sheet_reader import read_week_sheets  # noqa: E402
+
+QUICK_SIZES = ((5, 10), (7, 18), (10, 24), (12, 30))
+FULL_SIZES = tuple((t, r) for t in (5, 6, 7, 8, 10, 12) for r in (10, 18, 24, 30))
+OPTIMIZE_ITERS = 20000
+EVENNESS_WEEKS = 2
+
+
+def synthetic_week(n_teams: int, n_rounds: int, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    parse_week_schedule-shaped week: two courts per round, the teams idle longest play next
+    (with some noise, so there are streaks to fix), refs from the teams sitting out, and a
+    single-court final round.
+    """
+    rng = random.Random(seed * 1000 + n_teams * 100 + n_rounds)
+    teams = [f"Team {k + 1:02d}" for k in range(n_teams)]
+    idle = {t: 0 for t in teams}
+    games: list[dict[str, Any]] = []
+    for r in range(n_rounds):
+        order = sorted(teams, key=lambda t: -idle[t] + rng.random() * 2.5)
+        play, rest = order[:4], order[4:]
+        rng.shuffle(play)
+        c1 = (play[0], play[1])
+        c2 = (play[2], play[3]) if r < n_rounds - 1 else ("", "")
+        refs = (rest + ["", ""])[:2]
+        for t in teams:
+            idle[t] = 0 if t in play else idle[t] + 1
+        games.append({
+            "gameNumber": f"Game {r + 1:02d}",
+            "court1Ref": refs[0],
+            "court2Ref": refs[1],
+            "court1_playing": c1,
+            "court2_playing": c2,
+            "court1_teams": frozenset(set(c1) - {""}),
+            "court2_teams": frozenset(set(c2) - {""}),
+            "playing": {t for t in (*c1, *c2) if t},
+            "row": 2 + 2 * r,
+            "refRow": 3 + 2 * r,
+        })
+    return games
+
+
+def workbook_cases() -> list[tuple[str, list[dict[str, Any]]]]:
+    paths = sorted(glob.glob(str(ROOT / "public/league_schedules/*.xlsx")))
+    if Path(SEVEN_TEAM_FILE).exists():
+        paths.append(str(SEVEN_TEAM_FILE))
+    cases = []
+    for path in paths:
+        try:
+            weeks = read_week_sheets(path)
+        except Exception as exc:  # noqa: BLE001 - one unreadable workbook should not stop the run
+            print(f"  skip {Path(path).name}: {exc}", file=sys.stderr)
+            continue
+        for sheet, week in weeks.items():
+            # Dedicated-ref weeks have no ref rows; the team-ref searches do not apply.
+            if week["format"] == "team-ref" and len(week["games"]) >= 4:
+                cases.append((f"{Path(path).stem} / {sheet.strip()}", week["games"]))
+    return cases
+
+
+def _deep_partial(games: list[dict[str, Any]]) -> int:
+    cache = ScoreCache()
+    search_deep_partial_swap_sequences(games, lock_final_single=True, top=30, cache=cache)
+    return cache.hits + cache.misses
+
+
+def _two_round(games: list[dict[str, Any]]) -> int:
+    cache = ScoreCache()
+    search_two_round_swaps(games, top=30, cache=cache)
+    return cache.hits + cache.misses
+
+
+def _ref_flips(games: list[dict[str, Any]]) -> int:
+    prof = Profile()
+    search_ref_flips(games, profile=prof)
+    return prof.counts["ref-flip: DP transitions"]
+
+
+def _optimize(games: list[dict[str, Any]]) -> int:
+    _best, _blockers, _layout, iters = optimize_week(
+        games,
+        fixed_slots=(),
+        moves="both",
+        time_budget=float("inf"),
+        max_iters=OPTIMIZE_ITERS,
+        seed=0,
+        lock_final_single=True,
+        cache=ScoreCache(),
+    )
+    return iters
+
+
+def _best_sequence(games: list[dict[str, Any]]) -> int:
+    cache = ScoreCache()
+    best_sequence_search(games, max_depth=2, wide_depth2=False, cache=cache)
+    return cache.hits + cache.misses
+
+
+ENGINES: dict[str, tuple[Callable[[list[dict[str, Any]]], int], Callable[[list[dict[str, Any]]], bool]]] = {
+    "deep_partial": (_deep_partial, lambda g: True),
+    "two_round": (_two_round, lambda g: True),
+    "ref_flips": (_ref_flips, lambda g: True),
+    "optimize": (_optimize, lambda g: True),
+    # Swaps rounds 01-17 and keeps the rest fixed.
+    "best_sequence": (_best_sequence, lambda g: len(g) > IDX_MAX_SWAP + 1),
+}
+
+
+def evenness_case(week_index: int) -> Callable[[], int]:
+    """optimize_game_order_evenness on one 5-team dedicated-ref week, counting swap scorings."""
+    teams = [f"Team {i}" for i in range(1, 6)]
+    raw = five_team.assign_home_away(teams, five_team.heavy_sets()[week_index], week_index)
+
+    def run() -> int:
+        calls = 0
+        peek = five_team.EvennessScorer.peek
+
+        def counted(self: five_team.EvennessScorer, i: int, j: int) -> float:
+            nonlocal calls
+            calls += 1
+            return peek(self, i, j)
+
+        five_team.EvennessScorer.peek = counted
+        try:
+            five_team.optimize_game_order_evenness(raw, teams)
+        finally:
+            five_team.EvennessScorer.peek = peek
+        return calls
+
+    return run
+
+
+def measure(run: Callable[[], int], *, repeat: int, memory: bool) -> dict[str, Any]:
+    """Best-of-`repeat` wall time, then one extra traced run for peak memory (tracing slows it)."""
+    best = float("inf")
+    evals = 0
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        evals = run()
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "seconds": best,
+        "evaluations": evals,
+        "evals_per_sec": evals / best if best > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def parse_sizes(spec: str) -> list[tuple[int, int]]:
+    sizes = []
+    for part in spec.split(","):
+        teams, rounds = part.lower().split("x")
+        sizes.append((int(teams), int(rounds)))
+    return sizes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark schedule search engines.")
+    parser.add_argument("--sizes", help="Synthetic weeks as TEAMSxROUNDS,... (default: quick grid)")
+    parser.add_argument("--full", action="store_true", help="Full 5-12 teams x 10-30 rounds grid")
+    parser.add_argument(
+        "--engines",
+        default=",".join([*ENGINES, "evenness"]),
+        help=f"Comma list from {', '.join([*ENGINES, 'evenness'])}",
+    )
+    parser.add_argument("--no-synthetic", action="store_true")
+    parser.add_argument("--no-workbooks", action="store_true")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case (best kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Earlier --json output to show speedups against")
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES and e != "evenness"]
+    if unknown:
+        raise SystemExit(f"Unknown engine(s): {', '.join(unknown)}")
+
+    cases: list[tuple[str, list[dict[str, Any]]]] = []
+    if not args.no_synthetic:
+        sizes = parse_sizes(args.sizes) if args.sizes else (FULL_SIZES if args.full else QUICK_SIZES)
+        cases += [(f"synthetic {t}x{r}", synthetic_week(t, r)) for t, r in sizes]
+    if not args.no_workbooks:
+        cases += workbook_cases()
+
+    jobs: list[tuple[str, str, Callable[[], int]]] = []
+    for engine in engines:
+        if engine == "evenness":
+            jobs += [("evenness", f"5-team week {w + 1}", evenness_case(w)) for w in range(EVENNESS_WEEKS)]
+            continue
+        fn, applies = ENGINES[engine]
+        jobs += [(engine, name, (lambda fn=fn, g=games: fn(g))) for name, games in cases if applies(games)]
+
+    baseline: dict[tuple[str, str], dict[str, Any]] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {(r["engine"], r["case"]): r for r in json.load(f)["results"]}
+
+    results = []
+    print(f"{'engine':14s} {'case':52s} {'seconds':>9s} {'evals':>9s} {'evals/s':>10s} {'peak MiB':>9s}")
+    for engine, name, run in jobs:
+        r = {"engine": engine, "case": name, **measure(run, repeat=args.repeat, memory=not args.no_memory)}
+        results.append(r)
+        peak = f"{r['peak_bytes'] / 2**20:9.1f}" if r["peak_bytes"] is not None else f"{'-':>9s}"
+        eps = f"{r['evals_per_sec']:10.0f}" if r["evals_per_sec"] else f"{'-':>10s}"
+        line = f"{engine:14s} {name[:52]:52s} {r['seconds']:9.3f} {r['evaluations']:9d} {eps} {peak}"
+        old = baseline.get((engine, name))
+        if old and r["seconds"] > 0:
+            line += f"  x{old['seconds'] / r['seconds']:.2f} vs baseline"
+        print(line, flush=True)
+
+    if args.json:
+        meta = {"python": sys.version.split()[0], "repeat": args.repeat, "optimize_iters": OPTIMIZE_ITERS}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,38 @@
 #!/usr/bin/env python3
 """
-Generate a 6-week, 5-team dedicated-ref league schedule.
+Generate a dedicated-ref league schedule for 4-10 teams (default: 6 weeks, 5 teams).
 
-Per night: 25 games, 10 per team (5 home / 5 away), each pairing 2 or 3 games.
+Default 5-team night: 25 games, 10 per team (5 home / 5 away), each pairing 2 or 3 games.
 Per season: 15 games per pairing across 6 weeks.
+
+Other sizes (--teams / --num-teams, --games-per-team G): each team plays G games a night, every
+pairing G // (n - 1) or one more. The pairings that get the extra game form a regular graph of
+degree G % (n - 1), built from a round-robin factorization of K_n (circle-method perfect
+matchings for even n, Walecki Hamiltonian cycles for odd n) and rotated across weeks so every
+pairing's season total is within one of the others. n * G must be even. Nights with two heavy
+pairings per team (the 5-team default) use a rotation of Hamiltonian cycles instead, found on
+first use by heavy_sets(n, num_weeks) and kept in scripts/.heavy_sets_cache.json.
+
+--starts K keeps the most even of K game orders per night (the default order plus K - 1 seeded
+randomized ones); --jobs N runs all weeks' starts over N processes. Seeds come from --seed, the
+week and the start only, so the season does not depend on --jobs. --exact then searches each
+night for the shortest possible longest break and the best score at it (exact_game_order), and
+reports whether the order is proven optimal or how far it could be from optimal.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import sys
+from bisect import insort
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import random
-from itertools import combinations, permutations
+from itertools import permutations
 from pathlib import Path
+from typing import Any, Callable, Iterator
 
 import openpyxl
 
@@ -23,11 +42,17 @@ if str(ROOT) not in sys.path:
 
 from league_schedule_format import DEDICATED_REF, write_format_to_teams_sheet
 
-GAMES_PER_WEEK = 25
 GAMES_PER_TEAM_PER_WEEK = 10
-HOME_PER_TEAM_PER_WEEK = 5
-SEASON_GAMES_PER_PAIRING = 15
 NUM_WEEKS_DEFAULT = 6
+NUM_TEAMS_DEFAULT = 5
+MIN_TEAMS = 4
+MAX_TEAMS = 10
+# Seeded order_games runs add up to this much to each candidate's greedy urgency (one slot of
+# waiting counts 1, an overdue slot 400), enough to reorder near-ties only.
+ORDER_NOISE = 2.0
+# Search nodes per phase of exact_game_order before it settles for the best order so far
+# (a default 5-team night proves optimal in about 360k).
+EXACT_ORDER_NODES = 500_000
 
 
 def pair_key(a: int, b: int) -> tuple[int, int]:
@@ -45,80 +70,255 @@ def cycle_edges(perm: tuple[int, ...]) -> frozenset[tuple[int, int]]:
     return frozenset(edges)
 
 
-def find_heavy_sets(n: int = 5, num_weeks: int = 6) -> list[frozenset[tuple[int, int]]]:
-    """Pick num_weeks distinct 5-cycles so each pairing is heavy exactly num_weeks/2 times."""
+def canonical_cycles(n: int) -> Iterator[tuple[int, ...]]:
+    """
+    Every Hamiltonian cycle of K_n once, as the vertex order starting at 0 whose second vertex
+    is below its last, in lexicographic order ((n - 1)! / 2 of them).
+    """
+    for rest in permutations(range(1, n)):
+        if rest[0] < rest[-1]:
+            yield (0, *rest)
+
+
+def find_heavy_sets(
+    n: int = 5, num_weeks: int = 6, max_checks: int | None = None
+) -> list[frozenset[tuple[int, int]]]:
+    """
+    Pick num_weeks Hamiltonian cycles (repeats allowed) so each pairing is heavy on
+    2 * num_weeks / (n - 1) weeks, or the floor / ceiling of it when that is fractional
+    (3 of 6 weeks for 5 teams). Cycles are tried in canonical order and in nondecreasing
+    index, so each rotation is searched once. RuntimeError if there is none, or none within
+    max_checks cycle tests.
+    """
     pairings = all_pairings(n)
-    target = num_weeks // 2  # each pairing is heavy on 3 of 6 weeks
-
-    cycles: list[frozenset[tuple[int, int]]] = []
-    seen: set[frozenset[tuple[int, int]]] = set()
-    for perm in permutations(range(n)):
-        edges = cycle_edges(perm)
-        if len(edges) == 5 and edges not in seen:
-            seen.add(edges)
-            cycles.append(edges)
-
-    pair_counts: Counter[tuple[int, int]] = Counter()
-    chosen: list[frozenset[tuple[int, int]]] = []
-
-    def backtrack(week: int) -> bool:
+    bit = {p: 1 << k for k, p in enumerate(pairings)}
+    cycles = [sum(bit[e] for e in cycle_edges(c)) for c in canonical_cycles(n)]
+    low, rem = divmod(num_weeks * n, len(pairings))
+    high = low + (rem > 0)
+
+    counts = [0] * len(pairings)
+    full = 0 if high else (1 << len(pairings)) - 1
+    deficit = low * len(pairings)
+    checks = 0
+    chosen: list[int] = []
+
+    def backtrack(week: int, start: int) -> bool:
+        nonlocal full, deficit, checks
         if week == num_weeks:
-            return all(pair_counts[p] == target for p in pairings)
-
-        for cycle in cycles:
-            if any(pair_counts[edge] + 1 > target for edge in cycle):
+            return deficit == 0
+        if deficit > (num_weeks - week) * n:
+            return False
+
+        for k in range(start, len(cycles)):
+            checks += 1
+            if max_checks is not None and checks > max_checks:
+                return False
+            mask = cycles[k]
+            if mask & full:
                 continue
 
-            chosen.append(cycle)
-            for edge in cycle:
-                pair_counts[edge] += 1
-
-            if backtrack(week + 1):
+            chosen.append(mask)
+            rest = mask
+            while rest:
+                b = rest & -rest
+                rest ^= b
+                i = b.bit_length() - 1
+                deficit -= counts[i] < low
+                counts[i] += 1
+                if counts[i] == high:
+                    full |= b
+
+            if backtrack(week + 1, k):
                 return True
 
             chosen.pop()
-            for edge in cycle:
-                pair_counts[edge] -= 1
+            rest = mask
+            while rest:
+                b = rest & -rest
+                rest ^= b
+                i = b.bit_length() - 1
+                counts[i] -= 1
+                deficit += counts[i] < low
+                full &= ~b
 
         return False
 
-    if not backtrack(0):
-        raise RuntimeError("Could not construct heavy-set rotation for 5-team dedicated schedule")
+    if not backtrack(0, 0):
+        raise RuntimeError(
+            f"Could not construct heavy-set rotation for {n} teams over {num_weeks} weeks"
+        )
 
-    return chosen
+    return [frozenset(p for p in pairings if mask & bit[p]) for mask in chosen]
+
+
+# Cycle tests before heavy_sets gives up and the caller falls back to round_robin_factors.
+HEAVY_SET_CHECKS = 2_000_000
+# Bump when find_heavy_sets would pick a different rotation for the same (n, num_weeks).
+HEAVY_SET_CACHE_VERSION = 1
+HEAVY_SET_CACHE = Path(__file__).resolve().with_name(".heavy_sets_cache.json")
+
+_heavy_sets: dict[tuple[int, int], list[frozenset[tuple[int, int]]]] = {}
+
+
+def heavy_sets(n: int = 5, num_weeks: int = 6) -> list[frozenset[tuple[int, int]]]:
+    """
+    find_heavy_sets(n, num_weeks), or [] when there is no rotation within HEAVY_SET_CHECKS.
+    Memoized per process and kept in HEAVY_SET_CACHE (SCHEDULE_HEAVY_SETS_CACHE=0 in the
+    environment turns the file off).
+    """
+    key = (n, num_weeks)
+    if key in _heavy_sets:
+        return _heavy_sets[key]
+    use_file = os.environ.get("SCHEDULE_HEAVY_SETS_CACHE", "1") != "0"
+    stored = _load_heavy_set_cache() if use_file else {}
+    entry = stored.get(f"{n},{num_weeks}")
+    sets = _heavy_sets_from_json(entry, n, num_weeks) if entry is not None else None
+    if sets is None:
+        try:
+            sets = find_heavy_sets(n, num_weeks, HEAVY_SET_CHECKS)
+        except RuntimeError:
+            sets = []
+        if use_file:
+            stored[f"{n},{num_weeks}"] = [sorted(s) for s in sets]
+            _store_heavy_set_cache(stored)
+    _heavy_sets[key] = sets
+    return sets
+
+
+def _heavy_sets_from_json(
+    entry: list[list[list[int]]], n: int, num_weeks: int
+) -> list[frozenset[tuple[int, int]]] | None:
+    """The cached rotation if it is still a valid one, else None (recompute)."""
+    try:
+        sets = [frozenset(pair_key(a, b) for a, b in week) for week in entry]
+    except (TypeError, ValueError):
+        return None
+    if not sets:
+        return sets
+    pairings = all_pairings(n)
+    low, rem = divmod(num_weeks * n, len(pairings))
+    counts = Counter(p for s in sets for p in s)
+    if len(sets) != num_weeks or set(counts) - set(pairings):
+        return None
+    if any(not low <= counts[p] <= low + (rem > 0) for p in pairings):
+        return None
+    return sets
+
+
+def _load_heavy_set_cache() -> dict[str, list[list[list[int]]]]:
+    try:
+        with open(HEAVY_SET_CACHE, encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(stored, dict) or stored.get("version") != HEAVY_SET_CACHE_VERSION:
+        return {}
+    sets = stored.get("sets")
+    return sets if isinstance(sets, dict) else {}
+
+
+def _store_heavy_set_cache(sets: dict[str, list[list[list[int]]]]) -> None:
+    """Best effort: an unwritable directory just means no cache."""
+    tmp = HEAVY_SET_CACHE.with_name(f"{HEAVY_SET_CACHE.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": HEAVY_SET_CACHE_VERSION, "sets": sets}, f)
+        os.replace(tmp, HEAVY_SET_CACHE)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def __getattr__(name: str) -> Any:
+    # HEAVY_SETS (the default 5-team, 6-week rotation) is computed on first use, not at import.
+    if name == "HEAVY_SETS":
+        return heavy_sets(NUM_TEAMS_DEFAULT, NUM_WEEKS_DEFAULT)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def night_shape(n: int, games_per_team: int) -> tuple[int, int]:
+    """(base, extra): every pairing plays base games a night, each team has extra heavy pairings."""
+    if not MIN_TEAMS <= n <= MAX_TEAMS:
+        raise ValueError(f"dedicated schedule supports {MIN_TEAMS}-{MAX_TEAMS} teams, got {n}")
+    if games_per_team < 1:
+        raise ValueError(f"games per team must be at least 1, got {games_per_team}")
+    if n * games_per_team % 2:
+        raise ValueError(f"{n} teams x {games_per_team} games per team is an odd number of slots")
+    return divmod(games_per_team, n - 1)
+
+
+def round_robin_factors(n: int) -> list[frozenset[tuple[int, int]]]:
+    """
+    Edge-disjoint regular factors covering every pairing once: n - 1 perfect matchings (circle
+    method) for even n, (n - 1) / 2 Hamiltonian cycles (Walecki) for odd n.
+    """
+    if n % 2 == 0:
+        m = n - 1
+        factors = []
+        for r in range(m):
+            edges = {pair_key(r, m)}
+            for k in range(1, n // 2):
+                edges.add(pair_key((r + k) % m, (r - k) % m))
+            factors.append(frozenset(edges))
+        return factors
+
+    # Zigzag 0, 1, m-1, 2, m-2, ... around the m = n - 1 rim, closed through the hub n - 1.
+    m = n - 1
+    zigzag = [0]
+    for i in range(1, m // 2 + 1):
+        zigzag.append(i)
+        if len(zigzag) < m:
+            zigzag.append(m - i)
+    return [
+        cycle_edges((n - 1, *((z + k) % m for z in zigzag)))
+        for k in range(m // 2)
+    ]
 
 
-HEAVY_SETS = find_heavy_sets()
+def week_heavy_set(
+    n: int,
+    week_index: int,
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+    num_weeks: int = NUM_WEEKS_DEFAULT,
+) -> frozenset[tuple[int, int]]:
+    """Pairings that play base + 1 games on this night."""
+    _base, extra = night_shape(n, games_per_team)
+    if extra == 2:
+        # One Hamiltonian cycle a night (the 5-team default), balanced over the season.
+        rotation = heavy_sets(n, num_weeks)
+        if rotation:
+            return rotation[week_index % len(rotation)]
+    if extra == 0:
+        return frozenset()
+    factors = round_robin_factors(n)
+    per_week = extra // (1 if n % 2 == 0 else 2)
+    start = week_index * per_week
+    return frozenset().union(*(factors[(start + k) % len(factors)] for k in range(per_week)))
 
 
 def assign_home_away(
     teams: list[str],
     heavy_set: frozenset[tuple[int, int]],
     week_index: int,
+    base: int = 2,
 ) -> list[tuple[str, str]]:
-    """Build 25 (home, away) games for one week with balanced home/away counts."""
+    """Build one week's (home, away) games (25 for 5 teams) with balanced home/away counts."""
     idx = {i: teams[i] for i in range(len(teams))}
     games: list[tuple[str, str]] = []
     home_counts = Counter()
     away_counts = Counter()
 
     for pairing in all_pairings(len(teams)):
-        count = 3 if pairing in heavy_set else 2
+        count = base + 1 if pairing in heavy_set else base
         a, b = pairing
         team_a, team_b = idx[a], idx[b]
 
         pairing_games: list[tuple[str, str]] = []
         start_home_a = (week_index + a + b) % 2 == 0
         for game_i in range(count):
-            if count == 3:
-                if game_i == 0:
-                    home_is_a = start_home_a
-                elif game_i == 1:
-                    home_is_a = not start_home_a
-                else:
-                    home_is_a = start_home_a
-            else:
-                home_is_a = game_i == 0 if start_home_a else game_i == 1
+            home_is_a = start_home_a if game_i % 2 == 0 else not start_home_a
 
             if home_is_a:
                 pairing_games.append((team_a, team_b))
@@ -131,10 +331,11 @@ def assign_home_away(
             games.append((home, away))
 
     # Fix home/away imbalance by swapping within same pairings
+    cap = {t: (home_counts[t] + away_counts[t] + 1) // 2 for t in teams}
     for _ in range(20):
         fixed = False
         for team in teams:
-            if home_counts[team] > HOME_PER_TEAM_PER_WEEK:
+            if home_counts[team] > cap[team]:
                 for i, (home, away) in enumerate(games):
                     if home == team:
                         games[i] = (away, home)
@@ -144,7 +345,7 @@ def assign_home_away(
                         away_counts[home] += 1
                         fixed = True
                         break
-            elif away_counts[team] > HOME_PER_TEAM_PER_WEEK:
+            elif away_counts[team] > cap[team]:
                 for i, (home, away) in enumerate(games):
                     if away == team:
                         games[i] = (away, home)
@@ -157,9 +358,60 @@ def assign_home_away(
         if not fixed:
             break
 
+    if any(abs(home_counts[t] - away_counts[t]) > 1 for t in teams):
+        return _euler_home_away(games)
     return games
 
 
+def _euler_home_away(games: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """
+    Alternate home within each pairing and point each odd pairing's spare home game along an
+    Euler walk of the odd-pairing graph (odd-degree teams joined through a dummy), so every
+    team's home and away counts differ by at most one.
+    """
+    by_pair: dict[frozenset[str], list[tuple[str, str]]] = {}
+    for game in games:
+        by_pair.setdefault(frozenset(game), []).append(game)
+
+    adjacency: dict[str | None, list[tuple[str | None, int]]] = {}
+    edges: list[frozenset[str]] = []
+    for pair, pair_games in by_pair.items():
+        if len(pair_games) % 2:
+            a, b = sorted(pair)
+            adjacency.setdefault(a, []).append((b, len(edges)))
+            adjacency.setdefault(b, []).append((a, len(edges)))
+            edges.append(pair)
+    dummy_edges = 0
+    for team in sorted(t for t in adjacency if t is not None and len(adjacency[t]) % 2):
+        adjacency.setdefault(None, []).append((team, len(edges) + dummy_edges))
+        adjacency[team].append((None, len(edges) + dummy_edges))
+        dummy_edges += 1
+
+    spare_home: dict[frozenset[str], str] = {}
+    used = [False] * (len(edges) + dummy_edges)
+    for start in adjacency:
+        node = start
+        while True:
+            while adjacency[node] and used[adjacency[node][-1][1]]:
+                adjacency[node].pop()
+            if not adjacency[node]:
+                break
+            nxt, e = adjacency[node].pop()
+            used[e] = True
+            if e < len(edges) and node is not None:
+                spare_home[edges[e]] = node
+            node = nxt
+
+    result: list[tuple[str, str]] = []
+    for pair, pair_games in by_pair.items():
+        a, b = sorted(pair)
+        first = spare_home.get(pair, a)
+        second = b if first == a else a
+        for game_i in range(len(pair_games)):
+            result.append((first, second) if game_i % 2 == 0 else (second, first))
+    return result
+
+
 def team_idle_gaps(ordered: list[tuple[str, str]], team: str) -> list[int]:
     """Idle slots before, between, and after a team's games in the ordered list."""
     positions = [i for i, (home, away) in enumerate(ordered) if team in (home, away)]
@@ -192,18 +444,134 @@ def schedule_evenness_score(ordered: list[tuple[str, str]], teams: list[str]) ->
 def count_adjacent_duplicate_pairings_from_tuples(
     teams: list[str], games: list[tuple[str, str]]
 ) -> int:
+    index = {t: i for i, t in enumerate(teams)}
     count = 0
     for i in range(1, len(games)):
-        prev = pair_key(teams.index(games[i - 1][0]), teams.index(games[i - 1][1]))
-        cur = pair_key(teams.index(games[i][0]), teams.index(games[i][1]))
+        prev = pair_key(index[games[i - 1][0]], index[games[i - 1][1]])
+        cur = pair_key(index[games[i][0]], index[games[i][1]])
         if prev == cur:
             count += 1
     return count
 
 
-def order_games(games: list[tuple[str, str]], teams: list[str]) -> list[tuple[str, str]]:
-    """Build an order that keeps idle time between games even for every team."""
+class EvennessScorer:
+    """
+    schedule_evenness_score for one ordering, kept current as games are swapped.
+
+    A team with k games in an n-slot night always has k + 1 gaps summing to n - k, so its
+    variance term is (sum of squared gaps) - (n - k)^2 / (k + 1) and only the squares change.
+    peek(i, j) scores a swap from the (at most four) teams in the two games and the four
+    neighbouring adjacencies without touching the order; swap(i, j) applies it.
+    """
+
+    def __init__(self, ordered: list[tuple[str, str]], teams: list[str]) -> None:
+        self.order = list(ordered)
+        index = {t: i for i, t in enumerate(teams)}
+        self._pair = [pair_key(index[home], index[away]) for home, away in self.order]
+        self.positions: dict[str, list[int]] = {}
+        for pos, (home, away) in enumerate(self.order):
+            self.positions.setdefault(home, []).append(pos)
+            self.positions.setdefault(away, []).append(pos)
+        n = len(self.order)
+        self.squares: dict[str, int] = {}
+        self.max_gap: dict[str, int] = {}
+        for team, positions in self.positions.items():
+            self.squares[team], self.max_gap[team] = self._gaps(positions)
+        self.total_squares = sum(self.squares.values())
+        self.offset = sum((n - len(p)) ** 2 / (len(p) + 1) for p in self.positions.values())
+        self.adjacent = sum(self._pair[b] == self._pair[b + 1] for b in range(n - 1))
+        self._pending: tuple[int, int, dict[str, tuple[list[int], int, int]], int] | None = None
+
+    def _gaps(self, positions: list[int]) -> tuple[int, int]:
+        """(sum of squared gaps, longest gap) for a team playing at sorted `positions`."""
+        prev = -1
+        squares = 0
+        longest = 0
+        for pos in positions:
+            gap = pos - prev - 1
+            squares += gap * gap
+            if gap > longest:
+                longest = gap
+            prev = pos
+        gap = len(self.order) - 1 - prev
+        return squares + gap * gap, max(longest, gap)
+
+    def score(self) -> float:
+        """Same value as schedule_evenness_score(self.order, teams), up to float rounding."""
+        return (
+            max(self.max_gap.values(), default=0) * 1000
+            + (self.total_squares - self.offset)
+            + self.adjacent * 250
+        )
+
+    def peek(self, i: int, j: int) -> float:
+        """The score after swapping the games at i and j; the order is left as it is."""
+        order = self.order
+        first, second = order[i], order[j]
+        changed: dict[str, tuple[list[int], int, int]] = {}
+        adjacent = self.adjacent
+        if first != second:
+            pair = self._pair
+            last = len(order) - 1
+            pi, pj = pair[i], pair[j]
+            for b in {i - 1, i, j - 1, j}:
+                if 0 <= b < last:
+                    x, y = pair[b], pair[b + 1]
+                    adjacent -= x == y
+                    x = pj if b == i else pi if b == j else x
+                    y = pj if b + 1 == i else pi if b + 1 == j else y
+                    adjacent += x == y
+            for team, old, new in (
+                (first[0], i, j), (first[1], i, j), (second[0], j, i), (second[1], j, i)
+            ):
+                if team in second and team in first:
+                    continue
+                positions = self.positions[team][:]
+                positions.remove(old)
+                insort(positions, new)
+                changed[team] = (positions, *self._gaps(positions))
+        self._pending = (i, j, changed, adjacent)
+        squares = self.total_squares
+        longest = 0
+        for team, gap in self.max_gap.items():
+            if team in changed:
+                _positions, team_squares, gap = changed[team]
+                squares += team_squares - self.squares[team]
+            if gap > longest:
+                longest = gap
+        return longest * 1000 + (squares - self.offset) + adjacent * 250
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap the games at i and j in place."""
+        pending = self._pending
+        if pending is None or pending[:2] != (i, j):
+            self.peek(i, j)
+            pending = self._pending
+        _i, _j, changed, adjacent = pending
+        self._pending = None
+        order = self.order
+        order[i], order[j] = order[j], order[i]
+        self._pair[i], self._pair[j] = self._pair[j], self._pair[i]
+        self.adjacent = adjacent
+        for team, (positions, squares, longest) in changed.items():
+            self.positions[team] = positions
+            self.total_squares += squares - self.squares[team]
+            self.squares[team] = squares
+            self.max_gap[team] = longest
+
+
+def order_games(
+    games: list[tuple[str, str]], teams: list[str], seed: int | None = None
+) -> list[tuple[str, str]]:
+    """
+    Build an order that keeps idle time between games even for every team. With a `seed`, the
+    greedy pass breaks near-ties at random and the swap search uses that seed, so different
+    seeds give different starting points for order_games_multistart.
+    """
+    rng = random.Random(seed) if seed is not None else None
     remaining = games[:]
+    if rng is not None:
+        rng.shuffle(remaining)
     ordered: list[tuple[str, str]] = []
     last_pos: dict[str, int] = {t: -1 for t in teams}
     games_remaining_per_team = Counter()
@@ -247,6 +615,8 @@ def order_games(games: list[tuple[str, str]], teams: list[str]) -> list[tuple[st
                     adj_penalty = 5000
 
             score = urgency - adj_penalty
+            if rng is not None:
+                score += rng.random() * ORDER_NOISE
 
             if score > best_score:
                 best_score = score
@@ -261,41 +631,81 @@ def order_games(games: list[tuple[str, str]], teams: list[str]) -> list[tuple[st
         games_remaining_per_team[pick[1]] -= 1
 
     ordered = _fix_adjacent_same_pairing(ordered, teams)
-    return optimize_game_order_evenness(ordered, teams)
+    return optimize_game_order_evenness(ordered, teams, 42 if seed is None else seed)
+
+
+def order_games_multistart(
+    games: list[tuple[str, str]],
+    teams: list[str],
+    starts: int = 1,
+    *,
+    seed: int = 0,
+    week_index: int = 0,
+    jobs: int = 1,
+) -> list[tuple[str, str]]:
+    """
+    Best of `starts` order_games runs by schedule_evenness_score (earliest start on ties). Start 0
+    is the unseeded order_games, so more starts never do worse; start k uses
+    start_seed(seed, week_index, k). `jobs` > 1 runs the starts in a process pool.
+    """
+    tasks = [(games, teams, s) for s in start_seeds(starts, seed, week_index)]
+    return min(_run_tasks(_ordering_start, tasks, jobs), key=lambda r: r[0])[1]
+
+
+def start_seeds(starts: int, seed: int, week_index: int) -> list[int | None]:
+    return [None, *(start_seed(seed, week_index, k) for k in range(1, starts))]
+
+
+def start_seed(seed: int, week_index: int, start: int) -> int:
+    """Seed for one multi-start run; fixed by (seed, week, start), whatever the --jobs count."""
+    return seed * 1_000_003 + week_index * 1009 + start
+
+
+def _run_tasks(fn: Callable[..., Any], tasks: list[tuple[Any, ...]], jobs: int) -> list[Any]:
+    """fn(*task) for each task, in task order (`jobs` > 1: over a process pool)."""
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = [pool.submit(fn, *task) for task in tasks]
+            return [f.result() for f in futures]
+    return [fn(*task) for task in tasks]
+
+
+def _ordering_start(
+    games: list[tuple[str, str]], teams: list[str], seed: int | None
+) -> tuple[float, list[tuple[str, str]]]:
+    """One multi-start run (a process-pool task): (schedule_evenness_score, order)."""
+    ordered = order_games(games, teams, seed)
+    return schedule_evenness_score(ordered, teams), ordered
 
 
 def optimize_game_order_evenness(
-    ordered: list[tuple[str, str]], teams: list[str]
+    ordered: list[tuple[str, str]], teams: list[str], seed: int = 42
 ) -> list[tuple[str, str]]:
     """Hill-climb and random-swap search to even out breaks between games."""
-    best = list(ordered)
-    best_score = schedule_evenness_score(best, teams)
-    n = len(best)
+    scorer = EvennessScorer(ordered, teams)
+    best_score = scorer.score()
+    n = len(scorer.order)
 
     improved = True
     while improved:
         improved = False
         for i in range(n):
             for j in range(i + 1, n):
-                candidate = best[:]
-                candidate[i], candidate[j] = candidate[j], candidate[i]
-                score = schedule_evenness_score(candidate, teams)
+                score = scorer.peek(i, j)
                 if score < best_score:
-                    best = candidate
+                    scorer.swap(i, j)
                     best_score = score
                     improved = True
 
-    rng = random.Random(42)
+    rng = random.Random(seed)
     for _ in range(30000):
         i, j = rng.sample(range(n), 2)
-        candidate = best[:]
-        candidate[i], candidate[j] = candidate[j], candidate[i]
-        score = schedule_evenness_score(candidate, teams)
+        score = scorer.peek(i, j)
         if score < best_score:
-            best = candidate
+            scorer.swap(i, j)
             best_score = score
 
-    return _fix_adjacent_same_pairing(best, teams)
+    return _fix_adjacent_same_pairing(scorer.order, teams)
 
 
 def _fix_adjacent_same_pairing(
@@ -329,80 +739,443 @@ def _fix_adjacent_same_pairing(
     return result
 
 
-def build_week_games(teams: list[str], week_index: int) -> list[dict[str, str]]:
-    if len(teams) != 5:
-        raise ValueError("5-team dedicated schedule requires exactly 5 teams")
+def max_gap_lower_bound(games: list[tuple[str, str]], teams: list[str]) -> int:
+    """
+    No order of `games` has a shorter longest break: a team with k of the L games has L - k idle
+    slots over k + 1 breaks, and if every break is at most G, any G + 1 straight games include
+    every team (two per game).
+    """
+    plays = Counter(t for game in games for t in game)
+    playing = [t for t in teams if plays[t]]
+    per_team = max((-(-(len(games) - plays[t]) // (plays[t] + 1)) for t in playing), default=0)
+    half = -(-len(playing) // 2)
+    return max(per_team, half - 1 if len(games) >= half else 0)
 
-    heavy = HEAVY_SETS[week_index % len(HEAVY_SETS)]
-    raw = assign_home_away(teams, heavy, week_index)
-    ordered = order_games(raw, teams)
 
-    return [
-        {"team1": home, "team2": away, "game": i + 1}
-        for i, (home, away) in enumerate(ordered)
-    ]
+def exact_game_order(
+    games: list[tuple[str, str]],
+    teams: list[str],
+    *,
+    incumbent: list[tuple[str, str]] | None = None,
+    max_nodes: int = EXACT_ORDER_NODES,
+) -> dict[str, Any]:
+    """
+    Order one single-court night with the shortest possible longest break, then the lowest
+    schedule_evenness_score at that break (squared gaps, 250 per back-to-back repeat).
+
+    Phase 1 is a depth-first search for each break limit G from max_gap_lower_bound up, over
+    (games left, slots since each team last played). Teams at the limit must play next, every
+    team's remaining games must still fit, and a dead state also rules out every state with the
+    same games left and waits no shorter. Phase 2 is branch and bound at the best G: each team's
+    remaining squared gaps are bounded by an even split, and proven future-cost bounds are kept
+    per (games left, waits, last game). `incumbent` (default order_games) is the order to beat.
+    Each phase stops after `max_nodes` nodes.
+
+    Returns order, max_gap, max_gap_lower_bound (== max_gap when proven), score,
+    score_lower_bound (no order with the smallest longest break scores lower), optimal and nodes.
+    """
+    if incumbent is None:
+        incumbent = order_games(games, teams)
+    index = {t: i for i, t in enumerate(teams)}
+    n, slots = len(teams), len(games)
+    types = sorted({pair_key(index[a], index[b]) for a, b in games})
+    type_of = {p: k for k, p in enumerate(types)}
+    pending: list[list[tuple[str, str]]] = [[] for _ in types]
+    for a, b in games:
+        pending[type_of[pair_key(index[a], index[b])]].append((a, b))
+    plays = [0] * n
+    for a, b in types:
+        plays[a] += len(pending[type_of[(a, b)]])
+        plays[b] += len(pending[type_of[(a, b)]])
+    active = [t for t in range(n) if plays[t]]
+    offset = sum((slots - plays[t]) ** 2 / (plays[t] + 1) for t in active)
+
+    counts = [len(p) for p in pending]
+    idle = [0] * n
+    left = plays[:]
+    seq: list[int] = []
+    limit = 0
+    nodes = 0
+    out_of_nodes = False
+
+    def fits(slots_left: int) -> bool:
+        for t in active:
+            r, c = left[t], idle[t]
+            if r == 0:
+                if c + slots_left > limit:
+                    return False
+            elif r > slots_left or slots_left - r > limit - c + r * limit:
+                return False
+        return True
+
+    def candidates(last: int) -> list[int]:
+        forced = [t for t in active if idle[t] == limit]
+        if len(forced) > 2:
+            return []
+        ks = [k for k in range(len(types)) if counts[k] and all(t in types[k] for t in forced)]
+        ks.sort(key=lambda k: (-idle[types[k][0]] - idle[types[k][1]], k == last, k))
+        return ks
+
+    def place(k: int) -> tuple[int, int]:
+        a, b = types[k]
+        closed = (idle[a], idle[b])
+        for t in active:
+            idle[t] += 1
+        idle[a] = idle[b] = 0
+        left[a] -= 1
+        left[b] -= 1
+        counts[k] -= 1
+        seq.append(k)
+        return closed
+
+    def unplace(k: int, closed: tuple[int, int]) -> None:
+        a, b = types[k]
+        for t in active:
+            idle[t] -= 1
+        idle[a], idle[b] = closed
+        left[a] += 1
+        left[b] += 1
+        counts[k] += 1
+        seq.pop()
+
+    dead: dict[tuple[int, ...], list[tuple[int, ...]]] = {}
+
+    def feasible(last: int) -> bool:
+        nonlocal nodes, out_of_nodes
+        if len(seq) == slots:
+            return True
+        if nodes >= max_nodes:
+            out_of_nodes = True
+            return False
+        nodes += 1
+        key = tuple(counts)
+        waits = tuple(idle)
+        if any(all(w <= x for w, x in zip(worse, waits)) for worse in dead.get(key, ())):
+            return False
+        for k in candidates(last):
+            closed = place(k)
+            if fits(slots - len(seq)) and feasible(k):
+                return True
+            unplace(k, closed)
+            if out_of_nodes:
+                return False
+        dead.setdefault(key, []).append(waits)
+        return False
 
+    def even_split(total: int, parts: int) -> int:
+        q, r = divmod(total, parts)
+        return r * (q + 1) ** 2 + (parts - r) * q * q
+
+    def remaining_bound(slots_left: int) -> int:
+        """Squared breaks still to come if each team's idle slots were spread evenly."""
+        bound = 0
+        for t in active:
+            c, r = idle[t], left[t]
+            spare = slots_left - r
+            if r == 0:
+                bound += (c + spare) ** 2
+            elif c * (r + 1) > c + spare:
+                # Already waiting longer than an even share: that break stays at least c.
+                bound += c * c + even_split(spare, r)
+            else:
+                bound += even_split(c + spare, r + 1)
+        return bound
+
+    best_seq = [type_of[pair_key(index[a], index[b])] for a, b in incumbent]
+    best_gap = max((max(team_idle_gaps(incumbent, teams[t])) for t in active), default=0)
+    gap_floor = max_gap_lower_bound(games, teams)
+    for limit in range(gap_floor, best_gap):
+        dead.clear()
+        if fits(slots) and feasible(-1):
+            best_seq, best_gap = seq[:], limit
+            break
+        if out_of_nodes:
+            break
+        gap_floor = limit + 1
+    gap_proven = gap_floor == best_gap
+    phase_one_nodes = nodes
+
+    # Phase 2: squared gaps + 250 per repeat, every break <= best_gap.
+    limit = best_gap
+    counts = [len(p) for p in pending]
+    idle = [0] * n
+    left = plays[:]
+    seq = []
+    nodes = 0
+    out_of_nodes = False
+    best_cost = 0
+    waits = [0] * n
+    for pos, k in enumerate(best_seq):
+        a, b = types[k]
+        best_cost += waits[a] ** 2 + waits[b] ** 2 + (250 if pos and best_seq[pos - 1] == k else 0)
+        waits = [w + 1 for w in waits]
+        waits[a] = waits[b] = 0
+    best_cost += sum(waits[t] ** 2 for t in active)
+    future: dict[tuple[Any, ...], int] = {}
+
+    def bnb(last: int, cost: int) -> int:
+        """A lower bound on the cost still to come from here (exact once below best_cost - cost)."""
+        nonlocal best_cost, best_seq, nodes, out_of_nodes
+        slots_left = slots - len(seq)
+        if slots_left == 0:
+            end = sum(idle[t] ** 2 for t in active)
+            if cost + end < best_cost:
+                best_cost, best_seq = cost + end, seq[:]
+            return end
+        key = (tuple(counts), tuple(idle), last)
+        bound = max(remaining_bound(slots_left), future.get(key, 0))
+        if cost + bound >= best_cost:
+            return bound
+        if nodes >= max_nodes:
+            out_of_nodes = True
+            return bound
+        nodes += 1
+        best_future = 1 << 40  # no way to finish within the limit from here
+        for k in candidates(last):
+            a, b = types[k]
+            step = idle[a] ** 2 + idle[b] ** 2 + (250 if k == last else 0)
+            closed = place(k)
+            if fits(slots_left - 1):
+                best_future = min(best_future, step + bnb(k, cost + step))
+            unplace(k, closed)
+        bound = max(bound, best_future)
+        future[key] = bound
+        return bound
+
+    root_bound = remaining_bound(slots)
+    searched = bnb(-1, 0)
+    # Below the best proven break, any order still pays at least the even-split squares.
+    cost_floor = min(best_cost, searched) if gap_proven else root_bound
+    queues = [list(p) for p in pending]
+    order = [queues[k].pop(0) for k in best_seq]
+    return {
+        "order": order,
+        "max_gap": best_gap,
+        "max_gap_lower_bound": gap_floor,
+        "score": schedule_evenness_score(order, teams),
+        "score_lower_bound": gap_floor * 1000 + cost_floor - offset,
+        "optimal": gap_proven and cost_floor == best_cost,
+        "nodes": phase_one_nodes + nodes,
+    }
+
+
+def week_raw_games(
+    teams: list[str],
+    week_index: int,
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+    num_weeks: int = NUM_WEEKS_DEFAULT,
+) -> list[tuple[str, str]]:
+    """One night's (home, away) games before ordering."""
+    base, _extra = night_shape(len(teams), games_per_team)
+    heavy = week_heavy_set(len(teams), week_index, games_per_team, num_weeks)
+    return assign_home_away(teams, heavy, week_index, base)
 
-def build_season(teams: list[str], num_weeks: int = NUM_WEEKS_DEFAULT) -> list[list[dict[str, str]]]:
-    return [build_week_games(teams, w) for w in range(num_weeks)]
 
+def build_week_games(
+    teams: list[str],
+    week_index: int,
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+    num_weeks: int = NUM_WEEKS_DEFAULT,
+    *,
+    starts: int = 1,
+    seed: int = 0,
+) -> list[dict[str, str]]:
+    raw = week_raw_games(teams, week_index, games_per_team, num_weeks)
+    ordered = order_games_multistart(raw, teams, starts, seed=seed, week_index=week_index)
+    return _numbered(ordered)
+
+
+def build_season(
+    teams: list[str],
+    num_weeks: int = NUM_WEEKS_DEFAULT,
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+    *,
+    starts: int = 1,
+    seed: int = 0,
+    jobs: int = 1,
+    exact: bool = False,
+    exact_nodes: int = EXACT_ORDER_NODES,
+    reports: list[dict[str, Any]] | None = None,
+) -> list[list[dict[str, str]]]:
+    """
+    build_week_games for every week. With `jobs` > 1 all weeks' starts share one process pool;
+    seeds depend only on (seed, week, start), so the season is the same for any `jobs`.
+    `exact` then runs exact_game_order from each week's best order; its results (without the
+    order) go to `reports`, one per week.
+    """
+    tasks = []
+    raws = []
+    for w in range(num_weeks):
+        raws.append(week_raw_games(teams, w, games_per_team, num_weeks))
+        tasks += [(raws[w], teams, s) for s in start_seeds(starts, seed, w)]
+    results = _run_tasks(_ordering_start, tasks, jobs)
+    orders = [
+        min(results[w * starts:(w + 1) * starts], key=lambda r: r[0])[1] for w in range(num_weeks)
+    ]
+    if exact:
+        exact_tasks = [(raws[w], teams, orders[w], exact_nodes) for w in range(num_weeks)]
+        solved = _run_tasks(_exact_week, exact_tasks, jobs)
+        orders = [r.pop("order") for r in solved]
+        if reports is not None:
+            reports.extend(solved)
+    return [_numbered(ordered) for ordered in orders]
 
-def validate_week(teams: list[str], games: list[dict[str, str]]) -> list[str]:
-    errors: list[str] = []
-    if len(games) != GAMES_PER_WEEK:
-        errors.append(f"expected {GAMES_PER_WEEK} games, got {len(games)}")
 
-    team_games = Counter()
-    home_games = Counter()
-    away_games = Counter()
-    pairing_counts: Counter[tuple[str, str]] = Counter()
+def _exact_week(
+    games: list[tuple[str, str]],
+    teams: list[str],
+    incumbent: list[tuple[str, str]],
+    max_nodes: int,
+) -> dict[str, Any]:
+    """exact_game_order as a process-pool task."""
+    return exact_game_order(games, teams, incumbent=incumbent, max_nodes=max_nodes)
 
-    for game in games:
-        home, away = game["team1"], game["team2"]
-        team_games[home] += 1
-        team_games[away] += 1
-        home_games[home] += 1
-        away_games[away] += 1
-        pairing_counts[pair_key(teams.index(home), teams.index(away))] += 1
 
-    for team in teams:
-        if team_games[team] != GAMES_PER_TEAM_PER_WEEK:
-            errors.append(f"{team}: expected {GAMES_PER_TEAM_PER_WEEK} games, got {team_games[team]}")
-        if home_games[team] != HOME_PER_TEAM_PER_WEEK:
-            errors.append(f"{team}: expected {HOME_PER_TEAM_PER_WEEK} home games, got {home_games[team]}")
-        if away_games[team] != HOME_PER_TEAM_PER_WEEK:
-            errors.append(f"{team}: expected {HOME_PER_TEAM_PER_WEEK} away games, got {away_games[team]}")
-
-    for pairing in combinations(range(len(teams)), 2):
-        count = pairing_counts[pairing]
-        if count not in (2, 3):
-            names = (teams[pairing[0]], teams[pairing[1]])
-            errors.append(f"pairing {names}: expected 2 or 3 games, got {count}")
+def _numbered(ordered: list[tuple[str, str]]) -> list[dict[str, str]]:
+    return [
+        {"team1": home, "team2": away, "game": i + 1}
+        for i, (home, away) in enumerate(ordered)
+    ]
+
+
+def season_pairing_range(
+    n: int, num_weeks: int, games_per_team: int = GAMES_PER_TEAM_PER_WEEK
+) -> tuple[int, int]:
+    """Fewest and most season games any pairing should get (15 and 15 for the 5-team default)."""
+    total = num_weeks * games_per_team
+    return total // (n - 1), -(-total // (n - 1))
+
+
+def encode_season(
+    teams: list[str], weeks: list[list[dict[str, str]]]
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    The season as flat int columns, one entry per game in week and game order: week index, home
+    team index, away team index. ValueError for a team not in `teams`.
+    """
+    index = {t: i for i, t in enumerate(teams)}
+    week_col: list[int] = []
+    home_col: list[int] = []
+    away_col: list[int] = []
+    for w, week in enumerate(weeks):
+        for game in week:
+            for name in (game["team1"], game["team2"]):
+                if name not in index:
+                    raise ValueError(f"{name!r} is not in teams")
+            week_col.append(w)
+            home_col.append(index[game["team1"]])
+            away_col.append(index[game["team2"]])
+    return week_col, home_col, away_col
+
+
+def season_tallies(
+    teams: list[str], weeks: list[list[dict[str, str]]]
+) -> dict[str, list[int]]:
+    """
+    Per-week counts from one pass over encode_season, as flat lists indexed w * n + team
+    (games, home, away) or w * P + pairing (pairings, in all_pairings order), plus games and
+    back-to-back repeated pairings per week.
+    """
+    n = len(teams)
+    pairings = all_pairings(n)
+    pair_id = [0] * (n * n)
+    for k, (a, b) in enumerate(pairings):
+        pair_id[a * n + b] = pair_id[b * n + a] = k
+    num_pairs = len(pairings)
+    week_col, home_col, away_col = encode_season(teams, weeks)
+
+    home = [0] * (len(weeks) * n)
+    away = [0] * (len(weeks) * n)
+    pairs = [0] * (len(weeks) * num_pairs)
+    games = [0] * len(weeks)
+    adjacent = [0] * len(weeks)
+    prev_week = prev_pair = -1
+    for w, h, a in zip(week_col, home_col, away_col):
+        home[w * n + h] += 1
+        away[w * n + a] += 1
+        pid = pair_id[h * n + a]
+        pairs[w * num_pairs + pid] += 1
+        games[w] += 1
+        if w == prev_week and pid == prev_pair:
+            adjacent[w] += 1
+        prev_week, prev_pair = w, pid
+    return {
+        "home": home,
+        "away": away,
+        "team_games": [x + y for x, y in zip(home, away)],
+        "pairs": pairs,
+        "games": games,
+        "adjacent": adjacent,
+    }
+
+
+def validate_week(
+    teams: list[str], games: list[dict[str, str]], games_per_team: int = GAMES_PER_TEAM_PER_WEEK
+) -> list[str]:
+    return _week_errors(teams, season_tallies(teams, [games]), 0, games_per_team)
+
+
+def _week_errors(
+    teams: list[str], tallies: dict[str, list[int]], week: int, games_per_team: int
+) -> list[str]:
+    errors: list[str] = []
+    n = len(teams)
+    base, extra = night_shape(n, games_per_team)
+    games_per_week = n * games_per_team // 2
+    if tallies["games"][week] != games_per_week:
+        errors.append(f"expected {games_per_week} games, got {tallies['games'][week]}")
+
+    home_low, home_high = games_per_team // 2, (games_per_team + 1) // 2
+    expected_home = str(home_low) if home_low == home_high else f"{home_low}-{home_high}"
+    for t, team in enumerate(teams):
+        played = tallies["team_games"][week * n + t]
+        home = tallies["home"][week * n + t]
+        away = tallies["away"][week * n + t]
+        if played != games_per_team:
+            errors.append(f"{team}: expected {games_per_team} games, got {played}")
+        if not home_low <= home <= home_high:
+            errors.append(f"{team}: expected {expected_home} home games, got {home}")
+        if not home_low <= away <= home_high:
+            errors.append(f"{team}: expected {expected_home} away games, got {away}")
+
+    allowed = (base, base + 1) if extra else (base,)
+    expected_pairing = " or ".join(str(c) for c in allowed)
+    pairings = all_pairings(n)
+    for k, count in enumerate(tallies["pairs"][week * len(pairings):(week + 1) * len(pairings)]):
+        if count not in allowed:
+            names = (teams[pairings[k][0]], teams[pairings[k][1]])
+            errors.append(f"pairing {names}: expected {expected_pairing} games, got {count}")
 
     return errors
 
 
 def count_adjacent_duplicate_pairings(teams: list[str], games: list[dict[str, str]]) -> int:
-    tuples = [(g["team1"], g["team2"]) for g in games]
-    return count_adjacent_duplicate_pairings_from_tuples(teams, tuples)
+    return season_tallies(teams, [games])["adjacent"][0]
 
 
-def validate_season(teams: list[str], weeks: list[list[dict[str, str]]]) -> list[str]:
+def validate_season(
+    teams: list[str],
+    weeks: list[list[dict[str, str]]],
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+) -> list[str]:
     errors: list[str] = []
-    season_pairings: Counter[tuple[int, int]] = Counter()
+    tallies = season_tallies(teams, weeks)
+    for week_idx in range(len(weeks)):
+        errors.extend(
+            f"week {week_idx + 1}: {e}"
+            for e in _week_errors(teams, tallies, week_idx, games_per_team)
+        )
 
-    for week_idx, week in enumerate(weeks):
-        errors.extend(f"week {week_idx + 1}: {e}" for e in validate_week(teams, week))
-        for game in week:
-            pairing = pair_key(teams.index(game["team1"]), teams.index(game["team2"]))
-            season_pairings[pairing] += 1
+    pairings = all_pairings(len(teams))
+    season_pairings = [0] * len(pairings)
+    for k, count in enumerate(tallies["pairs"]):
+        season_pairings[k % len(pairings)] += count
 
-    for pairing in all_pairings(len(teams)):
-        count = season_pairings[pairing]
-        if count != SEASON_GAMES_PER_PAIRING:
-            errors.append(
-                f"season pairing {pairing}: expected {SEASON_GAMES_PER_PAIRING}, got {count}"
-            )
+    low, high = season_pairing_range(len(teams), len(weeks), games_per_team)
+    expected = str(low) if low == high else f"{low}-{high}"
+    for pairing, count in zip(pairings, season_pairings):
+        if not low <= count <= high:
+            errors.append(f"season pairing {pairing}: expected {expected}, got {count}")
 
     return errors
 
@@ -428,6 +1201,9 @@ def write_workbook(
         ws_teams.cell(1, col).value = team
     write_format_to_teams_sheet(ws_teams, DEDICATED_REF)
 
+    season_pairings: Counter[frozenset[str]] = Counter(
+        frozenset((g["team1"], g["team2"])) for week in weeks for g in week
+    )
     ws_gen = wb.create_sheet("Schedule Generator")
     ws_gen.cell(2, 1).value = ""
     for col, team in enumerate(teams, start=2):
@@ -438,7 +1214,7 @@ def write_workbook(
             if team == opponent:
                 ws_gen.cell(row_idx, col_idx).value = "-"
             else:
-                ws_gen.cell(row_idx, col_idx).value = SEASON_GAMES_PER_PAIRING
+                ws_gen.cell(row_idx, col_idx).value = season_pairings[frozenset((team, opponent))]
 
     ws_standings = wb.create_sheet("League Standings")
     ws_standings.cell(1, 1).value = "LEAGUE STANDINGS"
@@ -467,13 +1243,39 @@ def write_workbook(
     wb.save(path)
 
 
-def run_validation(teams: list[str] | None = None, num_weeks: int = NUM_WEEKS_DEFAULT) -> int:
-    teams = teams or [f"Team {i}" for i in range(1, 6)]
-    weeks = build_season(teams, num_weeks)
-    errors = validate_season(teams, weeks)
+def run_validation(
+    teams: list[str] | None = None,
+    num_weeks: int = NUM_WEEKS_DEFAULT,
+    games_per_team: int = GAMES_PER_TEAM_PER_WEEK,
+    *,
+    starts: int = 1,
+    seed: int = 0,
+    jobs: int = 1,
+    exact: bool = False,
+    exact_nodes: int = EXACT_ORDER_NODES,
+) -> int:
+    teams = teams or default_teams(NUM_TEAMS_DEFAULT)
+    reports: list[dict[str, Any]] = []
+    weeks = build_season(
+        teams,
+        num_weeks,
+        games_per_team,
+        starts=starts,
+        seed=seed,
+        jobs=jobs,
+        exact=exact,
+        exact_nodes=exact_nodes,
+        reports=reports,
+    )
+    errors = validate_season(teams, weeks, games_per_team)
 
     print(f"Validated {num_weeks}-week season for {', '.join(teams)}")
-    print(f"Heavy-set weeks: {len(HEAVY_SETS)} rotations")
+    base, extra = night_shape(len(teams), games_per_team)
+    rotation = heavy_sets(len(teams), num_weeks) if extra == 2 else []
+    if rotation:
+        print(f"Heavy-set weeks: {len(rotation)} rotations")
+    else:
+        print(f"{games_per_team} games per team: each pairing {base} a night, {extra} heavy per team")
     if errors:
         print(f"FAILED with {len(errors)} error(s):")
         for err in errors:
@@ -484,12 +1286,27 @@ def run_validation(teams: list[str] | None = None, num_weeks: int = NUM_WEEKS_DE
     for week_idx, week in enumerate(weeks, start=1):
         adj = count_adjacent_duplicate_pairings(teams, week)
         adj_note = f", {adj} adjacent duplicate pairing(s)" if adj else ""
-        print(f"  Week {week_idx}: {len(week)} games{adj_note}")
+        ordered = [(g["team1"], g["team2"]) for g in week]
+        longest = max(max(team_idle_gaps(ordered, t)) for t in teams)
+        print(f"  Week {week_idx}: {len(week)} games, longest break {longest}{adj_note}")
+        if reports:
+            r = reports[week_idx - 1]
+            if r["optimal"]:
+                print(f"    optimal (score {r['score']:.2f})")
+            else:
+                print(
+                    f"    best found: longest break >= {r['max_gap_lower_bound']}, "
+                    f"score {r['score']:.2f} >= {r['score_lower_bound']:.2f}"
+                )
     return 0
 
 
+def default_teams(n: int) -> list[str]:
+    return [f"Team {i}" for i in range(1, n + 1)]
+
+
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Generate 5-team dedicated-ref league schedule")
+    parser = argparse.ArgumentParser(description="Generate a 4-10 team dedicated-ref league schedule")
     parser.add_argument("--validate", action="store_true", help="Run validation only")
     parser.add_argument(
         "--output",
@@ -498,21 +1315,83 @@ def main() -> int:
     )
     parser.add_argument(
         "--teams",
-        nargs=5,
+        nargs="+",
         metavar="TEAM",
-        help="Exactly five team names",
+        help=f"{MIN_TEAMS}-{MAX_TEAMS} team names (default: Team 1 .. Team N)",
+    )
+    parser.add_argument(
+        "--num-teams",
+        type=int,
+        default=NUM_TEAMS_DEFAULT,
+        help=f"Number of default-named teams when --teams is omitted (default: {NUM_TEAMS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--games-per-team",
+        type=int,
+        default=GAMES_PER_TEAM_PER_WEEK,
+        help=f"Games each team plays per night (default: {GAMES_PER_TEAM_PER_WEEK})",
     )
     parser.add_argument("--weeks", type=int, default=NUM_WEEKS_DEFAULT)
+    parser.add_argument(
+        "--starts",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Randomized order_games runs per week; the most even is kept (default 1)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for --starts runs after the first; same seed, same season (default 0)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for the weeks' --starts runs (default 1)",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help=(
+            "Then search each night for the shortest possible longest break and the best score at "
+            "it; reports whether the order is proven optimal, else the lower bounds"
+        ),
+    )
+    parser.add_argument(
+        "--exact-nodes",
+        type=int,
+        default=EXACT_ORDER_NODES,
+        metavar="N",
+        help=f"Search nodes per --exact phase per night (default {EXACT_ORDER_NODES})",
+    )
     args = parser.parse_args()
-
-    teams = list(args.teams) if args.teams else [f"Team {i}" for i in range(1, 6)]
+    if args.starts < 1:
+        parser.error("--starts must be at least 1")
+    search = {
+        "starts": args.starts,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "exact": args.exact,
+        "exact_nodes": args.exact_nodes,
+    }
+
+    teams = list(args.teams) if args.teams else default_teams(args.num_teams)
+    if len(set(teams)) != len(teams):
+        parser.error("team names must be distinct")
+    try:
+        night_shape(len(teams), args.games_per_team)
+    except ValueError as exc:
+        parser.error(str(exc))
 
     if args.validate:
-        return run_validation(teams, args.weeks)
+        return run_validation(teams, args.weeks, args.games_per_team, **search)
 
     if args.output:
-        weeks = build_season(teams, args.weeks)
-        errors = validate_season(teams, weeks)
+        weeks = build_season(teams, args.weeks, args.games_per_team, **search)
+        errors = validate_season(teams, weeks, args.games_per_team)
         if errors:
             print("Validation failed; not writing workbook:")
             for err in errors:
@@ -522,7 +1401,7 @@ def main() -> int:
         print(f"Wrote {args.output}")
         return 0
 
-    return run_validation(teams, args.weeks)
+    return run_validation(teams, args.weeks, args.games_per_team, **search)
 
 
 if __name__ == "__main__":
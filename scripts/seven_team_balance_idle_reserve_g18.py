@@ -20,6 +20,7 @@ workbook changes.
 
   python3 scripts/seven_team_balance_idle_reserve_g18.py
   python3 scripts/seven_team_balance_idle_reserve_g18.py --write
+  python3 scripts/seven_team_balance_idle_reserve_g18.py --time-budget 5 --target-score 0
 """
 
 from __future__ import annotations
@@ -36,13 +37,21 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from suggest_idle_swaps import (  # noqa: E402
+    IncrementalScorer,
+    ScheduleHash,
     Score,
+    ScoreCache,
+    SearchBudget,
     apply_round_swap_to_sheet,
     find_idle_streak_issues,
+    parse_target_score,
+    rounds_for_in_place_moves,
     score_schedule,
     teams_in_week,
 )
-from suggest_ref_swaps_week4 import games_after_round_swap, parse_week_schedule  # noqa: E402
+from suggest_ref_swaps_week4 import parse_week_schedule, swap_rounds_in_place  # noqa: E402
+from profiling import Profile, profile_run  # noqa: E402
+from week_sheet_reader import read_week_sheets  # noqa: E402
 
 DEFAULT_FILE = ROOT / "public/league_templates/Seven Team League.xlsx"
 
@@ -51,9 +60,9 @@ IDX_MAX_SWAP = 16
 
 
 def simulate_swaps(base: list, moves: list[tuple[int, int]]):
-    g = copy.deepcopy(base)
+    g = rounds_for_in_place_moves(base)
     for i, j in moves:
-        g = games_after_round_swap(g, i, j)
+        swap_rounds_in_place(g, i, j)
     return g
 
 
@@ -114,8 +123,26 @@ def best_sequence_search(
     *,
     max_depth: int,
     wide_depth2: bool = False,
+    cache: ScoreCache | None = None,
+    budget: SearchBudget | None = None,
 ) -> tuple[list[list[tuple[int, int]]], Score]:
-    baseline = score_schedule(base)
+    """
+    Shortest-best round-swap sequences; sequences reaching an already scored week hit `cache`.
+    Swaps touching touch_swap_pool go first, so a `budget` stop returns the likeliest best so far.
+    """
+    work = rounds_for_in_place_moves(base)
+    scorer = IncrementalScorer(work)
+    baseline = scorer.score()
+    cache = ScoreCache() if cache is None else cache
+    budget = SearchBudget() if budget is None else budget
+    h = ScheduleHash(base)
+    hot = touch_swap_pool(base)
+
+    def promising_first(swaps: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        return sorted(swaps, key=lambda ij: ij[0] not in hot and ij[1] not in hot)
+
+    def stopped() -> bool:
+        return not budget.complete or budget.expired()
 
     best_sc: Score | None = None
     keep: list[list[tuple[int, int]]] = []
@@ -127,31 +154,51 @@ def best_sequence_search(
         if sig in seen_sig:
             return
         seen_sig.add(sig)
-        g = simulate_swaps(base, moves)
-        sc = score_schedule(g)
+        for i, j in moves:
+            h.swap_rounds(i, j)
+        verdict = cache.get(h.value)
+        if verdict is None:
+            for i, j in moves:
+                swap_rounds_in_place(work, i, j)
+                scorer.refresh(work, (i, j))
+            verdict = scorer.verdict()
+            cache.put(h.value, verdict)
+            for i, j in reversed(moves):
+                swap_rounds_in_place(work, i, j)
+                scorer.refresh(work, (i, j))
+        for i, j in reversed(moves):
+            h.swap_rounds(i, j)
+        sc = verdict[0]
         if not (sc < baseline):
             return
         if best_sc is None or sc < best_sc:
             best_sc = sc
             keep = [moves[:]]
+            budget.reached(sc)
         elif best_sc is not None and sc == best_sc:
             keep.append(moves[:])
 
-    for ij in SINGLES:
+    for ij in promising_first(SINGLES):
+        if stopped():
+            break
         consider([ij])
 
-    if max_depth >= 2:
+    if max_depth >= 2 and not stopped():
         pool2 = touch_swap_pool(base)
-        s2 = SINGLES if wide_depth2 else narrow_single_swaps(pool2)
+        s2 = promising_first(SINGLES if wide_depth2 else narrow_single_swaps(pool2))
         for ij in s2:
+            if stopped():
+                break
             for kl in s2:
                 consider([ij, kl])
 
-    if max_depth >= 3 and best_sc is None:
+    if max_depth >= 3 and best_sc is None and not stopped():
         pool = touch_swap_pool(base)
-        ns = narrow_single_swaps(pool)
+        ns = promising_first(narrow_single_swaps(pool))
         for ij in ns:
             for kl in ns:
+                if stopped():
+                    break
                 for mn in ns:
                     consider([ij, kl, mn])
 
@@ -160,7 +207,8 @@ def best_sequence_search(
 
     min_len = min(len(s) for s in keep)
     keep_fin: dict[tuple[tuple[int, int], ...], list[tuple[int, int]]] = {}
-    for s in keep:
+    # Enumeration order (SINGLES order, nested), whatever order the search visited them in.
+    for s in sorted(keep):
         if len(s) != min_len:
             continue
         ts = tuple(s)
@@ -246,13 +294,44 @@ def main() -> None:
         action="store_true",
         help="Mutate workbook in place (loads data_only=False for writes)",
     )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Per week: stop the sequence search after this many seconds and keep the best so far",
+    )
+    parser.add_argument(
+        "--target-score",
+        type=parse_target_score,
+        default=None,
+        metavar="IDLE,REF_PAIRS,SAME_MATCH,REF_PLAY",
+        help="Per week: stop the sequence search once a week scores at or below these (e.g. 0)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per phase and search counts to stderr",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        metavar="PATH",
+        help="Also run under cProfile and dump pstats to PATH (implies --profile)",
+    )
     args = parser.parse_args()
+    prof = Profile()
+    with profile_run(prof, report=args.profile, pstats_path=args.profile_out):
+        _run(args, prof)
+
 
+def _run(args: argparse.Namespace, prof: Profile) -> None:
     if not args.file.is_file():
         raise SystemExit(f"Missing file: {args.file}")
 
     prior_team: defaultdict[str, int] = defaultdict(int)
     picks: dict[str, tuple] = {}
+    cache = ScoreCache()
 
     # Pass 1: choose moves from pristine parse (fresh parse each outer loop from disk if --write simulated)
     # We need stable base per week reads from INITIAL file only:
@@ -260,12 +339,10 @@ def main() -> None:
     baseline_parse: dict[str, list] = {}
     baseline_g18: dict[str, object] = {}
 
-    wb0 = openpyxl.load_workbook(args.file, data_only=True)
-    for wi in range(1, 7):
-        name = f"Week {wi} Schedule"
-        baseline_parse[name] = parse_week_schedule(wb0[name], max_games=None)
+    names = [f"Week {wi} Schedule" for wi in range(1, 7)]
+    for name, week in read_week_sheets(args.file, names, profile=prof).items():
+        baseline_parse[name] = week["games"]
         baseline_g18[name] = copy.deepcopy(baseline_parse[name][17])
-    wb0.close()
 
     for wi in range(1, 7):
         sheet = f"Week {wi} Schedule"
@@ -273,15 +350,26 @@ def main() -> None:
         b0 = score_schedule(base)
         seq_list: list[list[tuple[int, int]]] = []
         score_result = b0
+        budget = SearchBudget(args.time_budget, args.target_score)
+        prof.lap("baseline scoring")
 
         if b0.idle_count == 0:
             pass  # optimal
         elif b0.idle_count == 1:
-            seq_list, score_result = best_sequence_search(base, max_depth=2, wide_depth2=False)
+            seq_list, score_result = best_sequence_search(
+                base, max_depth=2, wide_depth2=False, cache=cache, budget=budget
+            )
         else:
-            seq_list, score_result = best_sequence_search(base, max_depth=2, wide_depth2=True)
-            if not seq_list:
-                seq_list, score_result = best_sequence_search(base, max_depth=3, wide_depth2=False)
+            seq_list, score_result = best_sequence_search(
+                base, max_depth=2, wide_depth2=True, cache=cache, budget=budget
+            )
+            if not seq_list and budget.complete:
+                seq_list, score_result = best_sequence_search(
+                    base, max_depth=3, wide_depth2=False, cache=cache, budget=budget
+                )
+        prof.lap("sequence search")
+        if not budget.complete:
+            print(f"{sheet}: {budget.describe()}")
 
         if not seq_list:
             chosen = []
@@ -307,15 +395,21 @@ def main() -> None:
         validate_g18_unchanged(baseline_g18[sheet], simulate_swaps(baseline_parse[sheet], chosen or []))
 
         picks[sheet] = (chosen or [], score_schedule(g_final))
+        prof.lap("choose + validate")
 
     total_idle = sum(picks[s][1].idle_count for s in picks)
     print("\nTotals: idle_issues sum =", total_idle, " fair_counter:", dict(sorted(prior_team.items())))
+    print(f"Score cache: {cache.stats()}")
+    prof.count("sequences looked up", cache.hits + cache.misses)
+    prof.count("cache hits", cache.hits, of="sequences looked up")
+    prof.count("scored", cache.misses, of="sequences looked up")
 
     if not args.write:
         print("\n(dry-run) no file written — pass --write to save")
         return
 
-    wb = openpyxl.load_workbook(args.file, data_only=False)
+    with prof.phase("workbook load (writable)"):
+        wb = openpyxl.load_workbook(args.file, data_only=False)
 
     for wi in range(1, 7):
         sheet = f"Week {wi} Schedule"
@@ -333,8 +427,10 @@ def main() -> None:
         if idle_n != picks[sheet][1].idle_count:
             raise RuntimeError(f"{sheet} score mismatch after apply {idle_n=} expected {picks[sheet][1]}")
         print(f"wrote {sheet} verified idle={idle_n}")
+    prof.lap("sheet edits + re-parse")
 
-    wb.save(args.file)
+    with prof.phase("sheet write"):
+        wb.save(args.file)
     print(f"\nSaved: {args.file}")
 
 
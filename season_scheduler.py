@@ -0,0 +1,528 @@
+"""
+Season scheduler for create_schedule_from_generator: builds every week at once, clean by
+construction instead of repaired afterwards by suggest_idle_swaps.
+
+Two constraint passes, each a depth-first search with forward checking (restarted on new seeds):
+  1. assign_weeks spreads every meeting from the Schedule Generator counts over the weeks: week
+     sizes within one game of each other, each team's games per week within one of its season
+     average, a pairing's meetings in different (spread-out) weeks while it has no more meetings
+     than there are weeks, and on two courts each week's games must pair up with no team on both.
+  2. order_week lays one week's games out in rounds of two courts (one court when there are too few
+     teams for two matchups plus refs; an odd game count ends on a single court-1 round). No team
+     sits out more than MAX_IDLE_ROUNDS two-court rounds in a row (longer streaks are errors in
+     scheduleParser), no matchup repeats in back-to-back rounds, and team-ref weeks take refs from
+     the teams sitting out, never back-to-back, fewest season refs first. ORDER_SAMPLES orderings
+     are sampled and the best by suggest_idle_swaps.score_schedule is kept. A week with no ordering
+     under these rules gets them relaxed one at a time, and the result says which; if even that
+     fails, the season is split again from the next seed (SEASON_ATTEMPTS in all).
+Home/away is assigned last, over the whole season (assign_home_away).
+
+  weeks, notes = schedule_season(teams, get_matchup_matrix(ws, teams), 6, TEAM_REF)
+  weeks[0][0]  # {"gameNumber": "Game 01", "court1_playing": (home, away), "court1Ref": ..., ...}
+
+Rounds use parse_week_schedule's dict shape, so the swap tools' checkers and scorers apply as is.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Any
+
+from league_schedule_format import TEAM_REF
+from suggest_idle_swaps import Score, find_idle_streak_issues, score_schedule
+
+Pair = tuple[str, str]
+
+# scheduleParser: 2 idle two-court rounds in a row is a warning, 3+ an error.
+MAX_IDLE_ROUNDS = 2
+ORDER_SAMPLES = 8
+# Rules are relaxed once this many samples in a row find no order.
+ORDER_GIVE_UP = 2
+# Many short restarts beat one long search for both passes.
+WEEK_ASSIGN_ATTEMPTS = 20
+WEEK_ASSIGN_NODES = 2000
+ORDER_NODES = 5000
+# Fresh week splits tried when some week still has no round order after every relaxation.
+SEASON_ATTEMPTS = 5
+
+
+def season_meetings(teams: list[str], matrix: dict[str, dict[str, int]]) -> list[Pair]:
+    """Every meeting in the get_matchup_matrix counts (row team before column team in `teams`)."""
+    meetings: list[Pair] = []
+    for i, a in enumerate(teams):
+        for b in teams[i + 1 :]:
+            meetings += [(a, b)] * max(0, int(matrix.get(a, {}).get(b, 0)))
+    return meetings
+
+
+def schedule_season(
+    teams: list[str],
+    matrix: dict[str, dict[str, int]],
+    num_weeks: int,
+    schedule_format: str = TEAM_REF,
+    *,
+    seed: int = 0,
+) -> tuple[list[list[dict[str, Any]]], list[str]]:
+    """All weeks' rounds, plus one note per rule that had to be relaxed ("Week 3: ...")."""
+    duplicates = sorted(t for t, n in Counter(teams).items() if n > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate team names: {', '.join(duplicates)}")
+    team_ref = schedule_format == TEAM_REF
+    meetings = season_meetings(teams, matrix)
+    for attempt in range(SEASON_ATTEMPTS):
+        week_matchups = assign_weeks(
+            teams,
+            meetings,
+            num_weeks,
+            seed=seed + attempt * 100_003,
+            two_courts=_two_courts(teams, team_ref),
+        )
+        ref_counts: Counter[str] = Counter()
+        weeks: list[list[dict[str, Any]]] = []
+        notes: list[str] = []
+        try:
+            for w, matchups in enumerate(week_matchups, start=1):
+                games, relaxed = order_week(
+                    matchups,
+                    teams,
+                    team_ref=team_ref,
+                    ref_counts=ref_counts,
+                    seed=seed * 1009 + w,
+                )
+                weeks.append(games)
+                notes += [f"Week {w}: {rule}" for rule in relaxed]
+        except ValueError:
+            if attempt + 1 == SEASON_ATTEMPTS:
+                raise
+            continue
+        assign_home_away(weeks)
+        return weeks, notes
+    raise AssertionError("unreachable")
+
+
+def _two_courts(teams: list[str], team_ref: bool) -> bool:
+    """Two-court rounds need two matchups plus, in team-ref weeks, two refs sitting out."""
+    return len(teams) >= (6 if team_ref else 4)
+
+
+def assign_weeks(
+    teams: list[str],
+    meetings: list[Pair],
+    num_weeks: int,
+    *,
+    seed: int = 0,
+    two_courts: bool = True,
+) -> list[list[Pair]]:
+    """
+    Split `meetings` into `num_weeks` weeks (pass 1). The per-team and per-pairing limits are
+    loosened by one if no split meets them; ValueError if that fails too. With `two_courts`,
+    every week's games must pair up into rounds with no team on both courts (_pairable).
+    """
+    if num_weeks < 1:
+        raise ValueError("num_weeks must be at least 1")
+    total = len(meetings)
+    sizes = [total // num_weeks + (1 if w < total % num_weeks else 0) for w in range(num_weeks)]
+    for slack in (0, 1):
+        for attempt in range(WEEK_ASSIGN_ATTEMPTS):
+            rng = random.Random(seed * 1000 + slack * 100 + attempt)
+            weeks = _assign_weeks_once(teams, meetings, sizes, slack, rng, two_courts)
+            if weeks is not None:
+                return weeks
+    raise ValueError(f"No split of {total} games into {num_weeks} weeks fits the matchup counts")
+
+
+def _assign_weeks_once(
+    teams: list[str],
+    meetings: list[Pair],
+    sizes: list[int],
+    slack: int,
+    rng: random.Random,
+    two_courts: bool,
+) -> list[list[Pair]] | None:
+    n_weeks = len(sizes)
+    per_team = Counter(t for m in meetings for t in m)
+    per_pair = Counter(meetings)
+    lo = {t: per_team[t] // n_weeks - slack for t in teams}
+    hi = {t: -(-per_team[t] // n_weeks) + slack for t in teams}
+    pair_cap = {p: -(-c // n_weeks) + slack for p, c in per_pair.items()}
+    # Ties between equally constrained pairings break on this (seeded) order.
+    tiebreak = {p: rng.random() for p in per_pair}
+    todo = Counter(per_pair)
+    left = Counter(per_team)
+    team_week = {t: [0] * n_weeks for t in teams}
+    pair_week = {p: [0] * n_weeks for p in per_pair}
+    room = list(sizes)
+    placed: list[tuple[Pair, int]] = []
+    nodes = 0
+
+    def fits(t: str) -> bool:
+        need = sum(max(0, lo[t] - x) for x in team_week[t])
+        spare = sum(hi[t] - x for x in team_week[t])
+        return need <= left[t] <= spare
+
+    def fillable(w: int) -> bool:
+        return 2 * room[w] <= sum(min(hi[t] - team_week[t][w], left[t]) for t in teams)
+
+    def domain(p: Pair) -> list[int]:
+        a, b = p
+        return [
+            w
+            for w in range(n_weeks)
+            if room[w]
+            and team_week[a][w] < hi[a]
+            and team_week[b][w] < hi[b]
+            and pair_week[p][w] < pair_cap[p]
+        ]
+
+    def place() -> bool:
+        nonlocal nodes
+        if not todo:
+            return True
+        nodes += 1
+        if nodes > WEEK_ASSIGN_NODES:
+            return False
+        # Most constrained pairing first (fewest weeks left); an empty domain fails right here.
+        p, weeks = min(
+            ((q, domain(q)) for q in todo),
+            key=lambda item: (len(item[1]), -todo[item[0]], tiebreak[item[0]]),
+        )
+        a, b = p
+        met = [w for w in range(n_weeks) if pair_week[p][w]]
+        weeks.sort(
+            key=lambda w: (
+                pair_week[p][w],
+                (team_week[a][w] >= lo[a]) + (team_week[b][w] >= lo[b]),
+                -min((abs(w - v) for v in met), default=n_weeks),
+                -room[w],
+                rng.random(),
+            )
+        )
+        for w in weeks:
+            room[w] -= 1
+            team_week[a][w] += 1
+            team_week[b][w] += 1
+            pair_week[p][w] += 1
+            left[a] -= 1
+            left[b] -= 1
+            todo[p] -= 1
+            if not todo[p]:
+                del todo[p]
+            placed.append((p, w))
+            if (
+                fits(a)
+                and fits(b)
+                and fillable(w)
+                and (room[w] or not two_courts or _pairable([q for q, v in placed if v == w]))
+                and place()
+            ):
+                return True
+            placed.pop()
+            todo[p] += 1
+            room[w] += 1
+            team_week[a][w] -= 1
+            team_week[b][w] -= 1
+            pair_week[p][w] -= 1
+            left[a] += 1
+            left[b] += 1
+        return False
+
+    if not place():
+        return None
+    weeks: list[list[Pair]] = [[] for _ in sizes]
+    for p, w in placed:
+        weeks[w].append(p)
+    return weeks
+
+
+def _pairable(matchups: list[Pair]) -> bool:
+    """Whether a week's games split into two-court rounds with no shared team (one single if odd)."""
+    seen: set[tuple[tuple[Pair, ...], bool]] = set()
+
+    def split(rest: tuple[Pair, ...], single: bool) -> bool:
+        if not rest:
+            return True
+        if (rest, single) in seen:
+            return False
+        seen.add((rest, single))
+        first, others = rest[0], rest[1:]
+        if single and split(others, False):
+            return True
+        return any(
+            split(others[:i] + others[i + 1 :], single)
+            for i, q in enumerate(others)
+            if q not in others[:i] and not set(first) & set(q)
+        )
+
+    return split(tuple(sorted(matchups)), len(matchups) % 2 == 1)
+
+
+# (max idle two-court rounds or None, matchups may repeat back to back, refs may repeat back to back)
+_RELAXATIONS = (
+    (MAX_IDLE_ROUNDS, False, False),
+    (MAX_IDLE_ROUNDS, True, False),
+    (MAX_IDLE_ROUNDS, False, True),
+    (MAX_IDLE_ROUNDS, True, True),
+    (MAX_IDLE_ROUNDS + 1, False, False),
+    (MAX_IDLE_ROUNDS + 1, True, True),
+    (None, False, False),
+    (None, True, True),
+)
+
+
+def order_week(
+    matchups: list[Pair],
+    teams: list[str],
+    *,
+    team_ref: bool,
+    ref_counts: Counter[str] | None = None,
+    seed: int = 0,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    One week's rounds (pass 2) and the rules they break (empty when none): relaxations are tried
+    as bundles, but only the rules the chosen rounds actually break are reported.
+    `ref_counts` holds season ref duties so far and is updated with this week's.
+    """
+    ref_counts = Counter() if ref_counts is None else ref_counts
+    two_courts = _two_courts(teams, team_ref)
+    for max_idle, repeat_matchups, repeat_refs in _RELAXATIONS:
+        best: tuple[Score, int, list[dict[str, Any]], Counter[str]] | None = None
+        for k in range(ORDER_SAMPLES):
+            rounds = _order_week_once(
+                matchups,
+                teams,
+                two_courts=two_courts,
+                team_ref=team_ref,
+                max_idle=max_idle,
+                repeat_matchups=repeat_matchups,
+                repeat_refs=repeat_refs,
+                ref_counts=ref_counts,
+                rng=random.Random(seed * 100 + k),
+            )
+            if rounds is None:
+                if best is None and k + 1 >= ORDER_GIVE_UP:
+                    break
+                continue
+            games = round_dicts(rounds, team_ref=team_ref)
+            refs = ref_counts + Counter(r for _, rs in rounds for r in rs)
+            spread = max(refs.values(), default=0) - min((refs[t] for t in teams), default=0)
+            candidate = (score_schedule(games), spread, games, refs)
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+        if best is not None:
+            ref_counts.clear()
+            ref_counts.update(best[3])
+            score, games = best[0], best[2]
+            relaxed = []
+            longest = max((x["streak_len"] for x in find_idle_streak_issues(games)), default=0)
+            if longest > MAX_IDLE_ROUNDS:
+                relaxed.append(f"idle streaks up to {longest} rounds")
+            if score.same_match_adj:
+                relaxed.append("back-to-back matchups allowed")
+            if score.ref_pairs and team_ref:
+                relaxed.append("back-to-back refs allowed")
+            return games, relaxed
+    raise ValueError(f"No round order for {len(matchups)} games among {len(teams)} teams")
+
+
+def _order_week_once(
+    matchups: list[Pair],
+    teams: list[str],
+    *,
+    two_courts: bool,
+    team_ref: bool,
+    max_idle: int | None,
+    repeat_matchups: bool,
+    repeat_refs: bool,
+    ref_counts: Counter[str],
+    rng: random.Random,
+) -> list[tuple[tuple[Pair, ...], tuple[str, ...]]] | None:
+    """Rounds as (matchups, refs), or None when the search finds none within ORDER_NODES."""
+    n_two = len(matchups) // 2 if two_courts else 0
+    n_single = len(matchups) - 2 * n_two
+    remaining = Counter(matchups)
+    left = Counter(t for m in matchups for t in m)
+    idle = {t: 0 for t in teams}
+    refs_so_far = Counter(ref_counts)
+    rounds: list[tuple[tuple[Pair, ...], tuple[str, ...]]] = []
+    nodes = 0
+
+    def still_possible(two_left: int, single_left: int) -> bool:
+        for t in teams:
+            if left[t] > two_left + single_left:
+                return False
+            if max_idle is not None and two_left:
+                # Plays needed so no gap (including the one running now) exceeds max_idle.
+                need = -(-(two_left - max_idle + idle[t]) // (max_idle + 1))
+                if left[t] < need:
+                    return False
+        return True
+
+    def choose_refs(playing: set[str], count: int) -> tuple[str, ...] | None:
+        if not team_ref:
+            return ()
+        last = set(rounds[-1][1]) if rounds and not repeat_refs else set()
+        pool = [t for t in teams if t not in playing and t not in last]
+        if len(pool) < count:
+            return None
+        pool.sort(key=lambda t: (refs_so_far[t], -idle[t], rng.random()))
+        return tuple(pool[:count])
+
+    def play(games: tuple[Pair, ...], refs: tuple[str, ...], sign: int) -> None:
+        for p in games:
+            remaining[p] -= sign
+            for t in p:
+                left[t] -= sign
+        for r in refs:
+            refs_so_far[r] += sign
+
+    def step(d: int) -> bool:
+        nonlocal nodes
+        if d == n_two + n_single:
+            return True
+        nodes += 1
+        if nodes > ORDER_NODES:
+            return False
+        last_games = set(rounds[-1][0]) if rounds and not repeat_matchups else set()
+        kinds = [p for p in remaining if remaining[p] and p not in last_games]
+        if d < n_two:
+            must = {t for t in teams if max_idle is not None and idle[t] >= max_idle}
+            options = [
+                (p, q)
+                for i, p in enumerate(kinds)
+                for q in kinds[i + 1 :]
+                if not set(p) & set(q) and must <= {*p, *q}
+            ]
+            n_refs = 2
+        else:
+            options = [(p,) for p in kinds]
+            n_refs = 1
+        # Longest-idle teams first, then the teams with the most games still to play.
+        options.sort(
+            key=lambda games: (
+                -sum(idle[t] for p in games for t in p),
+                -sum(left[t] for p in games for t in p),
+                rng.random(),
+            )
+        )
+        for games in options:
+            playing = {t for p in games for t in p}
+            refs = choose_refs(playing, n_refs)
+            if refs is None:
+                continue
+            before = dict(idle)
+            for t in teams:
+                idle[t] = 0 if t in playing else idle[t] + 1
+            play(games, refs, 1)
+            rounds.append((games, refs))
+            two_left = max(0, n_two - d - 1)
+            single_left = n_single - max(0, d + 1 - n_two)
+            if still_possible(two_left, single_left) and step(d + 1):
+                return True
+            rounds.pop()
+            play(games, refs, -1)
+            idle.update(before)
+        return False
+
+    return rounds if step(0) else None
+
+
+def round_dicts(
+    rounds: list[tuple[tuple[Pair, ...], tuple[str, ...]]], *, team_ref: bool
+) -> list[dict[str, Any]]:
+    """parse_week_schedule-shaped rounds for the rows create_week_sheet writes."""
+    rows_per_game = 2 if team_ref else 1
+    games: list[dict[str, Any]] = []
+    for k, (matchups, refs) in enumerate(rounds):
+        c1 = matchups[0]
+        c2 = matchups[1] if len(matchups) > 1 else ("", "")
+        ref1, ref2 = (*refs, "", "")[:2]
+        row = 2 + k * rows_per_game
+        games.append({
+            "gameNumber": f"Game {k + 1:02d}",
+            "court1Ref": ref1,
+            "court2Ref": ref2,
+            "court1_playing": c1,
+            "court2_playing": c2,
+            "court1_teams": frozenset(set(c1) - {""}),
+            "court2_teams": frozenset(set(c2) - {""}),
+            "playing": {t for t in (*c1, *c2) if t},
+            "row": row,
+            "refRow": row + 1,
+        })
+    return games
+
+
+def assign_home_away(weeks: list[list[dict[str, Any]]]) -> None:
+    """
+    In place. In season order the team with the lower (home - away) so far hosts; on a tie a repeat
+    meeting swaps the previous host, else the first team in the pairing hosts. Any team still
+    two or more home games over even then has a chain of its hosted games flipped, ending at a
+    team with more away games; a team two or more away games over likewise flips a chain of games
+    it was the guest in, ending at a team with more home games. Everyone in between is unchanged,
+    so every team finishes with home - away in {-1, 0, 1}.
+    """
+    balance: Counter[str] = Counter()
+    last_host: dict[frozenset[str], str] = {}
+    slots: list[tuple[dict[str, Any], str]] = []
+    for week in weeks:
+        for g in week:
+            for court in ("court1_playing", "court2_playing"):
+                a, b = g[court]
+                if not a or not b:
+                    continue
+                key = frozenset((a, b))
+                if balance[a] != balance[b]:
+                    host = a if balance[a] < balance[b] else b
+                elif key in last_host:
+                    host = b if last_host[key] == a else a
+                else:
+                    host = a
+                guest = b if host == a else a
+                g[court] = (host, guest)
+                balance[host] += 1
+                balance[guest] -= 1
+                last_host[key] = host
+                slots.append((g, court))
+
+    # Home-heavy teams first: a chain can leave its far end at -2 or below, never at +2.
+    for sign in (1, -1):
+        for team in sorted(balance):
+            while balance[team] * sign >= 2:
+                path, end = _hosting_path(slots, team, balance, sign)
+                for g, court in path:
+                    host, guest = g[court]
+                    g[court] = (guest, host)
+                balance[team] -= 2 * sign
+                balance[end] += 2 * sign
+
+
+def _hosting_path(
+    slots: list[tuple[dict[str, Any], str]], start: str, balance: Counter[str], sign: int = 1
+) -> tuple[list[tuple[dict[str, Any], str]], str]:
+    """
+    Breadth-first: games start hosts, whose guest hosts the next, ending at a team with
+    balance < 0; with sign -1, games start is the guest in, through their hosts, to balance > 0.
+    Returns the path and the team it ends at.
+    """
+    # side 0 = host, 1 = guest; steps go from that side of a game to the other.
+    side = 0 if sign > 0 else 1
+    games_of: dict[str, list[tuple[dict[str, Any], str]]] = {}
+    for g, court in slots:
+        games_of.setdefault(g[court][side], []).append((g, court))
+    came_from: dict[str, tuple[str, tuple[dict[str, Any], str]] | None] = {start: None}
+    queue = [start]
+    for team in queue:
+        if balance[team] * sign < 0:
+            end = team
+            path = []
+            while came_from[team] is not None:
+                team, slot = came_from[team]
+                path.append(slot)
+            return path[::-1], end
+        for slot in games_of.get(team, ()):
+            other = slot[0][slot[1]][1 - side]
+            if other not in came_from:
+                came_from[other] = (team, slot)
+                queue.append(other)
+    raise AssertionError("home/away balances do not sum to zero")
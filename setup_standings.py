@@ -105,9 +105,15 @@ def find_win_loss_section(ws, schedule_format=TEAM_REF):
 
     return 30
 
+def has_second_court(ws):
+    """Week sheets with a 'Court 2' header in G1 list court 2 matchups in G/I (scores in H/J)."""
+    value = ws.cell(1, 7).value
+    return isinstance(value, str) and value.strip().lower() == 'court 2'
+
 def setup_week_sheet(ws, teams, week_name, schedule_format=TEAM_REF):
     """Set up win/loss formulas for a week sheet."""
     start_row = find_win_loss_section(ws, schedule_format)
+    dual_court = has_second_court(ws)
     
     # Headers
     ws.cell(start_row, 1).value = 'Team Wins/Losses This Week'
@@ -128,10 +134,14 @@ def setup_week_sheet(ws, teams, week_name, schedule_format=TEAM_REF):
             team_pattern = f'"{team}"'
         
         wins_formula = f'=SUMIFS(C:C,B:B,{team_pattern})+SUMIFS(E:E,D:D,{team_pattern})'
+        if dual_court:
+            wins_formula += f'+SUMIFS(H:H,G:G,{team_pattern})+SUMIFS(J:J,I:I,{team_pattern})'
         ws.cell(i, 2).value = wins_formula
         
         # Losses formula: Sum scores in E when team is in B (Team 1 loses, opponent's score) + Sum scores in C when team is in D (Team 2 loses, opponent's score)
         losses_formula = f'=SUMIFS(E:E,B:B,{team_pattern})+SUMIFS(C:C,D:D,{team_pattern})'
+        if dual_court:
+            losses_formula += f'+SUMIFS(J:J,G:G,{team_pattern})+SUMIFS(H:H,I:I,{team_pattern})'
         ws.cell(i, 3).value = losses_formula
     
     return start_row + 2  # Return the first data row
@@ -285,7 +295,8 @@ def setup_league_standings(wb, teams, week_sheets, week_start_row):
         ws.cell(11, 1).value = 'Week #'
         ws.cell(11, 2).value = 0
 
-    setup_head_to_head_matrix(ws, teams, week_sheets, dual_court=False)
+    dual_court = any(has_second_court(wb[week]) for week in week_sheets)
+    setup_head_to_head_matrix(ws, teams, week_sheets, dual_court=dual_court)
 
 def main(file_path):
     """Main function to set up standings for a league spreadsheet."""
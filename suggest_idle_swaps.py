@@ -1,16 +1,25 @@
 """
 Analyze a week sheet for "consecutive two-court rounds without playing" (idle streaks).
 Mirrors app/lib/scheduleParser.ts. Tries full-round swaps; optional 2-swap search and ref-flips.
-Partial-swap search and --apply-partial reject a team appearing on court 1 and court 2 in the same round.
+Partial-swap search, --apply-partial and --apply-order reject a team appearing on court 1 and court 2
+in the same round.
 
   python3 suggest_idle_swaps.py --file "public/league_schedules/Spring 2026 BYOT League.xlsx" --sheet "Week 3 Schedule"
   python3 suggest_idle_swaps.py ... --max-games 18   # optional cap
   python3 suggest_idle_swaps.py ... --deep
   python3 suggest_idle_swaps.py ... --deep-partial
   python3 suggest_idle_swaps.py ... --deep-partial --deep-partial-no-final-lock
+  python3 suggest_idle_swaps.py ... --deep-partial --jobs 8
   python3 suggest_idle_swaps.py ... --ref-flip
+  python3 suggest_idle_swaps.py ... --optimize --fix-slot 18 --time-budget 30 --seed 1
+  python3 suggest_idle_swaps.py ... --deep-partial --time-budget 5 --target-score 0   # anytime: best so far
+  # Whole season from one load (weeks in parallel), consolidated report + JSON:
+  python3 suggest_idle_swaps.py --file "..." --all-weeks --deep-partial --jobs 4 --json-summary season.json
+  python3 suggest_idle_swaps.py ... --deep-partial --format ndjson > week3.ndjson
+  python3 suggest_idle_swaps.py ... --deep-partial --profile [--profile-out run.pstats]
   python3 suggest_idle_swaps.py ... --apply-swap 4 14 --write
   python3 suggest_idle_swaps.py ... --apply-partial 10 1 18 2 --write
+  python3 suggest_idle_swaps.py ... --apply-order 1,2,7,4.1/9.2,... --write   # as printed by --optimize
   python3 suggest_idle_swaps.py ... --move-round-to-front 17 --write
   # Phase D (default): swaps one round from each of two idle streaks (can be same team, two streaks).
   # Two-week flex quadruplets (balanced 2 matchups W5<->W6, then deep-partial idle search each week):
@@ -22,20 +31,29 @@ from __future__ import annotations
 
 import argparse
 import copy
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+import heapq
+import json
+import math
+import random
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from itertools import combinations
 from typing import Any
 
 import openpyxl
 from openpyxl.cell.cell import MergedCell
 from openpyxl.worksheet.worksheet import Worksheet
+from week_schedule import NON_TEAM_SLOTS, TWO_COURTS, WeekSchedule, as_week_schedule, iter_bits
+from profiling import Profile, profile_run
+from week_sheet_reader import read_week_sheets
 
 from suggest_ref_swaps_week4 import (
     find_consecutive_refs,
     find_consecutive_same_matchup,
     games_after_round_swap,
-    parse_week_schedule,
+    swap_rounds_in_place,
 )
 
 
@@ -61,8 +79,10 @@ def team_is_playing(team: str, g: dict[str, Any]) -> bool:
     )
 
 
-def teams_in_week(games: list[dict[str, Any]]) -> list[str]:
+def teams_in_week(games: list[dict[str, Any]] | WeekSchedule) -> list[str]:
     """All teams that appear as players or refs (analogous to schedule stats keys for one week)."""
+    if isinstance(games, WeekSchedule):
+        return list(games.teams)
     seen: set[str] = set()
     for g in games:
         seen |= g["playing"]
@@ -73,82 +93,89 @@ def teams_in_week(games: list[dict[str, Any]]) -> list[str]:
 
 
 def find_idle_streak_issues(
-    games: list[dict[str, Any]], teams: list[str] | None = None
+    games: list[dict[str, Any]] | WeekSchedule, teams: list[str] | None = None
 ) -> list[dict[str, Any]]:
     """
     Same logic as scheduleParser.ts: two-court rounds only; streak when team not playing;
     flush on play or non-two-court row; record when streak length >= 2.
     Each issue includes slot_indices (0-based positions in `games`) for swap search.
     """
+    week = as_week_schedule(games)
     if teams is None:
-        teams = teams_in_week(games)
+        teams = week.teams
+    # Teams never seen this week get a bit past the interned ids: they sit out every two-court round.
+    bit_of: dict[str, int] = {}
+    for team in teams:
+        if team not in bit_of:
+            bit_of[team] = week.team_ids.get(team, len(week.teams) + len(bit_of))
+    tracked = 0
+    for b in bit_of.values():
+        tracked |= 1 << b
+
+    # One pass over rounds for all teams: a streak opens where a team's idle bit turns on and
+    # closes where it turns off; only bits that change are visited.
+    streaks: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+    start: dict[int, int] = {}
+    prev = 0
+    n = len(week)
+    for idx in range(n + 1):
+        cur = tracked & ~week.active_mask(idx) if idx < n and week.valid_courts[idx] == TWO_COURTS else 0
+        for b in iter_bits(prev & ~cur):
+            if idx - start[b] >= 2:
+                streaks[b].append((start[b], idx))
+        for b in iter_bits(cur & ~prev):
+            start[b] = idx
+        prev = cur
+
     issues: list[dict[str, Any]] = []
     for team in teams:
-        streak_rounds: list[dict[str, Any]] = []
-        streak_slots: list[int] = []
-        for idx, g in enumerate(games):
-            if not round_has_two_courts(g):
-                if len(streak_rounds) >= 2:
-                    issues.append(_idle_issue(team, streak_rounds, streak_slots))
-                streak_rounds = []
-                streak_slots = []
-                continue
-            if team_is_playing(team, g):
-                if len(streak_rounds) >= 2:
-                    issues.append(_idle_issue(team, streak_rounds, streak_slots))
-                streak_rounds = []
-                streak_slots = []
-            else:
-                streak_rounds.append(g)
-                streak_slots.append(idx)
-        if len(streak_rounds) >= 2:
-            issues.append(_idle_issue(team, streak_rounds, streak_slots))
+        for lo, hi in streaks.get(bit_of[team], ()):
+            issues.append(_idle_issue(week, team, list(range(lo, hi))))
     return issues
 
 
 def _idle_issue(
+    week: WeekSchedule,
     team: str,
-    streak_rounds: list[dict[str, Any]],
     streak_slots: list[int],
 ) -> dict[str, Any]:
-    n = len(streak_rounds)
-    game_numbers = [g["gameNumber"] for g in streak_rounds]
+    n = len(streak_slots)
+    game_numbers = [week.game_numbers[k] for k in streak_slots]
     return {
         "team": team,
         "game_numbers": game_numbers,
         "slot_indices": streak_slots[:],
-        "end_game": streak_rounds[-1]["gameNumber"],
+        "end_game": game_numbers[-1],
         "severity": "error" if n >= 3 else "warning",
         "streak_len": n,
     }
 
 
-def ref_play_conflicts(games: list[dict[str, Any]]) -> list[tuple[str, int, str]]:
+def ref_play_conflicts(
+    games: list[dict[str, Any]] | WeekSchedule,
+) -> list[tuple[str, int, str]]:
+    week = as_week_schedule(games)
     bad: list[tuple[str, int, str]] = []
-    for i, g in enumerate(games):
-        for court_label, ref in (
-            ("court1", g["court1Ref"]),
-            ("court2", g["court2Ref"]),
-        ):
-            if ref and ref in g["playing"]:
-                bad.append((ref, i, court_label))
+    for i in range(len(week)):
+        playing = week.playing[i]
+        for court_label, ref in (("court1", week.ref1[i]), ("court2", week.ref2[i])):
+            if ref >= 0 and playing >> ref & 1:
+                bad.append((week.teams[ref], i, court_label))
     return bad
 
 
 def find_same_team_both_courts_issues(
-    games: list[dict[str, Any]],
+    games: list[dict[str, Any]] | WeekSchedule,
 ) -> list[dict[str, Any]]:
     """
     Same team listed on court 1 and court 2 in one round (invalid for two-court play).
     Uses court cells, not `playing` (which is a set and hides duplicates).
     """
-    skip = {"", "BYE", "TBD"}
+    week = as_week_schedule(games)
     issues: list[dict[str, Any]] = []
-    for g in games:
-        on_c1 = {t for t in g["court1_playing"] if t and t not in skip}
-        on_c2 = {t for t in g["court2_playing"] if t and t not in skip}
-        for team in sorted(on_c1 & on_c2):
-            issues.append({"gameNumber": g["gameNumber"], "team": team})
+    for i in range(len(week)):
+        for t in iter_bits(week.court1_active[i] & week.court2_active[i]):
+            issues.append({"gameNumber": week.game_numbers[i], "team": week.teams[t]})
     return issues
 
 
@@ -168,13 +195,13 @@ class Score:
         )
 
 
-def score_schedule(games: list[dict[str, Any]]) -> Score:
-    teams = teams_in_week(games)
+def score_schedule(games: list[dict[str, Any]] | WeekSchedule) -> Score:
+    week = as_week_schedule(games)
     return Score(
-        idle_count=len(find_idle_streak_issues(games, teams)),
-        ref_pairs=len(find_consecutive_refs(games)),
-        same_match_adj=len(find_consecutive_same_matchup(games)),
-        ref_play=len(ref_play_conflicts(games)),
+        idle_count=len(find_idle_streak_issues(week)),
+        ref_pairs=len(find_consecutive_refs(week)),
+        same_match_adj=len(find_consecutive_same_matchup(week)),
+        ref_play=len(ref_play_conflicts(week)),
     )
 
 
@@ -185,6 +212,364 @@ def format_score(s: Score) -> str:
     )
 
 
+class IncrementalScorer:
+    """
+    Delta version of score_schedule (plus the partial_schedule_blockers checks) for swap searches.
+
+    Every Score field is a sum of per-round terms (ref_play) or terms over a short window of
+    adjacent rounds (idle streak starts, consecutive ref / same-matchup pairs). Rounds start from
+    the week's WeekSchedule masks (pass one to skip re-interning), so after a move changes a few
+    rounds, refresh only re-encodes those with WeekSchedule.encode_round and rescores them and
+    their neighbours. Moves must keep the week's team set, which round swaps, partial court swaps
+    and ref flips all do.
+    """
+
+    __slots__ = (
+        "_week",
+        "_all",
+        "_n",
+        "_idle",
+        "_refs",
+        "_m1",
+        "_m2",
+        "_single",
+        "_t_idle2",
+        "_t_idle3",
+        "_t_ref",
+        "_t_match",
+        "_t_rp",
+        "_t_dup",
+        "_totals",
+    )
+
+    def __init__(self, games: list[dict[str, Any]] | WeekSchedule) -> None:
+        week = self._week = as_week_schedule(games)
+        self._all = (1 << len(week.teams)) - 1
+        n = self._n = len(week)
+        self._idle = [0] * n
+        self._refs = [0] * n
+        self._m1 = [0] * n
+        self._m2 = [0] * n
+        self._single = [False] * n
+        self._t_rp = [0] * n
+        self._t_dup = [0] * n
+        for k in range(n):
+            self._load_round(
+                k, week.ref1[k], week.ref2[k], week.court1[k], week.court2[k], week.valid_courts[k]
+            )
+        self._t_idle2 = [self._idle2_term(r) for r in range(n)]
+        self._t_idle3 = [self._idle3_term(r) for r in range(n)]
+        self._t_ref = [self._ref_term(i) for i in range(n - 1)]
+        self._t_match = [self._match_term(i) for i in range(n - 1)]
+        # idle_count, error streaks, ref_pairs, same_match_adj, ref_play, same-team-both-courts
+        self._totals = [
+            sum(self._t_idle2),
+            sum(self._t_idle3),
+            sum(self._t_ref),
+            sum(self._t_match),
+            sum(self._t_rp),
+            sum(self._t_dup),
+        ]
+
+    def _mask(self, names: Any) -> int:
+        ids = self._week.team_ids
+        m = 0
+        for t in names:
+            if t:
+                m |= 1 << ids[t]
+        return m
+
+    def _load_round(self, k: int, r1: int, r2: int, c1: int, c2: int, valid: int) -> None:
+        """Round k's terms from its WeekSchedule encoding (ref ids, court bits, valid_courts)."""
+        playing = c1 | c2
+        self._idle[k] = self._all & ~playing if valid == TWO_COURTS else 0
+        self._refs[k] = (1 << r1 if r1 >= 0 else 0) | (1 << r2 if r2 >= 0 else 0)
+        self._m1[k] = c1 if c1.bit_count() == 2 else 0
+        self._m2[k] = c2 if c2.bit_count() == 2 else 0
+        self._single[k] = valid in (0b01, 0b10)
+        self._t_rp[k] = (r1 >= 0 and playing >> r1 & 1) + (r2 >= 0 and playing >> r2 & 1)
+        self._t_dup[k] = (c1 & c2 & ~self._week.non_team_mask).bit_count()
+
+    def _idle_at(self, r: int) -> int:
+        return self._idle[r] if 0 <= r < self._n else 0
+
+    def _idle2_term(self, r: int) -> int:
+        """Teams whose idle streak of length >= 2 starts at round r."""
+        return (self._idle[r] & self._idle_at(r + 1) & ~self._idle_at(r - 1)).bit_count()
+
+    def _idle3_term(self, r: int) -> int:
+        """Teams whose idle streak of length >= 3 (error severity) starts at round r."""
+        return (
+            self._idle[r] & self._idle_at(r + 1) & self._idle_at(r + 2) & ~self._idle_at(r - 1)
+        ).bit_count()
+
+    def _ref_term(self, i: int) -> int:
+        return (self._refs[i] & self._refs[i + 1]).bit_count()
+
+    def _match_term(self, i: int) -> int:
+        nxt = (self._m1[i + 1], self._m2[i + 1])
+        return sum(1 for cm in (self._m1[i], self._m2[i]) if cm and cm in nxt)
+
+    def refresh(self, games: list[dict[str, Any]], slots: Any) -> None:
+        """Re-read `games[k]` for each slot after an in-place move (or its undo) on `games`."""
+        for k in slots:
+            self._reload(k, games[k])
+        self._rescore_windows(slots)
+
+    def _reload(self, k: int, g: dict[str, Any]) -> None:
+        tot = self._totals
+        old_rp, old_dup = self._t_rp[k], self._t_dup[k]
+        _h1, _a1, _h2, _a2, r1, r2, c1, c2, valid = self._week.encode_round(
+            g["court1_playing"], g["court2_playing"], g["court1Ref"], g["court2Ref"]
+        )
+        self._load_round(k, r1, r2, c1, c2, valid)
+        tot[4] += self._t_rp[k] - old_rp
+        tot[5] += self._t_dup[k] - old_dup
+
+    def _rescore_windows(self, slots: Any) -> None:
+        n = self._n
+        tot = self._totals
+        window: set[int] = set()
+        for k in slots:
+            window.update(range(max(0, k - 2), min(n, k + 2)))
+        for r in window:
+            new2 = self._idle2_term(r)
+            tot[0] += new2 - self._t_idle2[r]
+            self._t_idle2[r] = new2
+            new3 = self._idle3_term(r)
+            tot[1] += new3 - self._t_idle3[r]
+            self._t_idle3[r] = new3
+            if r < n - 1:
+                new_ref = self._ref_term(r)
+                tot[2] += new_ref - self._t_ref[r]
+                self._t_ref[r] = new_ref
+                new_m = self._match_term(r)
+                tot[3] += new_m - self._t_match[r]
+                self._t_match[r] = new_m
+
+    def score(self) -> Score:
+        tot = self._totals
+        return Score(
+            idle_count=tot[0],
+            ref_pairs=tot[2],
+            same_match_adj=tot[3],
+            ref_play=tot[4],
+        )
+
+    def score_floor(self, slots: Any, players: Any, refs: Any) -> tuple[int, int, int, int]:
+        """
+        Lower bound on the Score fields after a move that only changes rounds in `slots`, and
+        there only the rounds of `players` (idle streaks) and `refs` (consecutive refs). Terms
+        outside that reach are unchanged and terms inside are never negative.
+        """
+        n = self._n
+        # A BYE/TBD side zeroes a round's idle mask, so moving one can change every team's idling.
+        if any(t in NON_TEAM_SLOTS for t in players):
+            p_bits = self._all
+        else:
+            p_bits = self._mask(players)
+        r_bits = self._mask(refs)
+        window: set[int] = set()
+        pairs: set[int] = set()
+        for k in slots:
+            window.update(range(max(0, k - 2), min(n, k + 2)))
+            pairs.update(i for i in (k - 1, k) if 0 <= i < n - 1)
+        tot = self._totals
+        idle, ref, match = tot[0], tot[2], tot[3]
+        idle_at = self._idle_at
+        for r in window:
+            idle -= (self._idle[r] & idle_at(r + 1) & ~idle_at(r - 1) & p_bits).bit_count()
+        refs_at = self._refs
+        for i in pairs:
+            ref -= (refs_at[i] & refs_at[i + 1] & r_bits).bit_count()
+            match -= self._t_match[i]
+        return idle, ref, match, tot[4] - sum(self._t_rp[k] for k in set(slots))
+
+    def partial_ok(self, *, lock_final_single: bool) -> bool:
+        """Same verdict as schedule_ok_for_deep_partial for the current rounds."""
+        tot = self._totals
+        if tot[1] or tot[4] or tot[5]:
+            return False
+        return not (lock_final_single and self._n and not self._single[-1])
+
+    def blocker_count(self, *, lock_final_single: bool) -> int:
+        """How far the rounds are from partial_ok: error streaks, ref/play and both-court clashes."""
+        tot = self._totals
+        final = bool(lock_final_single and self._n and not self._single[-1])
+        return tot[1] + tot[4] + tot[5] + final
+
+    def verdict(self) -> tuple[Score, int, bool]:
+        """
+        What searches need about the current rounds, as stored in ScoreCache: (score, blockers
+        other than the final-round lock, last round has exactly one matchup).
+        """
+        tot = self._totals
+        return self.score(), tot[1] + tot[4] + tot[5], not self._n or self._single[-1]
+
+
+def verdict_blockers(verdict: tuple[Score, int, bool], *, lock_final_single: bool) -> int:
+    """IncrementalScorer.blocker_count for a cached verdict."""
+    _, blockers, final_single = verdict
+    return blockers + (lock_final_single and not final_single)
+
+
+_ZOBRIST_BLOCKS: dict[tuple[tuple[str, str], str], int] = {}
+_ZOBRIST_KEYS: dict[tuple[int, int], int] = {}
+_ZOBRIST_RNG = random.Random(0x1D1E)
+
+
+def _zobrist_key(pos: int, block: int) -> int:
+    key = _ZOBRIST_KEYS.get((pos, block))
+    if key is None:
+        key = _ZOBRIST_KEYS[pos, block] = _ZOBRIST_RNG.getrandbits(64)
+    return key
+
+
+class ScheduleHash:
+    """
+    Zobrist hash of a week's court blocks (one court's matchup plus its ref), the ScoreCache key.
+
+    Round swaps and partial court swaps only move blocks between (round, court) positions, so the
+    hash follows a move with four XORs per block instead of rehashing the week. Game labels and
+    rows stay in their slots and are not hashed. Keys are process-wide, so one cache can serve
+    every search over any week in a run.
+    """
+
+    __slots__ = ("blocks", "value")
+
+    def __init__(self, games: list[dict[str, Any]]) -> None:
+        self.blocks: list[int] = []
+        for g in games:
+            for playing, ref in (
+                (g["court1_playing"], g["court1Ref"]),
+                (g["court2_playing"], g["court2Ref"]),
+            ):
+                block = (tuple(playing), ref)
+                self.blocks.append(_ZOBRIST_BLOCKS.setdefault(block, len(_ZOBRIST_BLOCKS)))
+        self.value = 0
+        for pos, block in enumerate(self.blocks):
+            self.value ^= _zobrist_key(pos, block)
+
+    def _swap(self, x: int, y: int) -> None:
+        blocks = self.blocks
+        bx, by = blocks[x], blocks[y]
+        self.value ^= (
+            _zobrist_key(x, bx) ^ _zobrist_key(y, by) ^ _zobrist_key(x, by) ^ _zobrist_key(y, bx)
+        )
+        blocks[x], blocks[y] = by, bx
+
+    def swap_rounds(self, i: int, j: int) -> None:
+        """Follow swap_rounds_in_place(games, i, j). Self-inverse."""
+        if i != j:
+            self._swap(2 * i, 2 * j)
+            self._swap(2 * i + 1, 2 * j + 1)
+
+    def swap_courts(self, game_a_1based: int, court_a: int, game_b_1based: int, court_b: int) -> None:
+        """Follow partial_court_swap_in_place with the same (valid) arguments. Self-inverse."""
+        self._swap(2 * game_a_1based + court_a - 3, 2 * game_b_1based + court_b - 3)
+
+
+class ScoreCache:
+    """Bounded LRU transposition table: ScheduleHash value -> IncrementalScorer.verdict()."""
+
+    def __init__(self, maxsize: int = 1 << 18) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[Score, int, bool]] = OrderedDict()
+
+    def get(self, key: int) -> tuple[Score, int, bool] | None:
+        verdict = self._entries.get(key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return verdict
+
+    def put(self, key: int, verdict: tuple[Score, int, bool]) -> None:
+        self._entries[key] = verdict
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"{self.hits}/{lookups} cache hits ({rate:.1%}), {len(self._entries)} entries"
+
+
+class SearchBudget:
+    """
+    Anytime limits for one search: a wall-clock budget and/or a target score. Searches call
+    expired() between batches of candidates and reached(score) on every improvement; either stops
+    the search, which then returns the best found so far. complete stays True only when the
+    enumeration ran to the end; otherwise stop_reason is "time" or "target".
+
+    target: (idle_count, ref_pairs, same_match_adj, ref_play) upper bounds, None = any value.
+    """
+
+    def __init__(
+        self,
+        time_budget: float | None = None,
+        target: tuple[int | None, ...] | None = None,
+    ) -> None:
+        self.deadline = None if time_budget is None else time.monotonic() + time_budget
+        self.target = target
+        self.complete = True
+        self.stop_reason: str | None = None
+
+    def expired(self) -> bool:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stop("time")
+            return True
+        return False
+
+    def reached(self, s: Score) -> bool:
+        if self.target is None:
+            return False
+        fields = (s.idle_count, s.ref_pairs, s.same_match_adj, s.ref_play)
+        if all(t is None or f <= t for f, t in zip(fields, self.target)):
+            self.stop("target")
+            return True
+        return False
+
+    def stop(self, reason: str) -> None:
+        if self.complete:
+            self.complete = False
+            self.stop_reason = reason
+
+    def describe(self) -> str:
+        if self.complete:
+            return "complete"
+        if self.stop_reason == "target":
+            return "stopped early: target score reached (best so far)"
+        return "stopped early: time budget used up (best so far)"
+
+
+def parse_target_score(text: str) -> tuple[int | None, ...]:
+    """'0' -> idle 0; '0,1' -> idle 0 and ref_pairs <= 1; '-' or empty skips a field."""
+    parts = [p.strip() for p in text.split(",")]
+    if len(parts) > 4:
+        raise ValueError("target score has at most 4 fields: idle,ref_pairs,same_match_adj,ref_play")
+    return tuple(int(p) if p not in ("", "-") else None for p in parts) + (None,) * (4 - len(parts))
+
+
+def promising_slots(games: list[dict[str, Any]] | WeekSchedule) -> set[int]:
+    """Rounds next to a problem (idle streak slots +/-1, consecutive refs, ref-play, same matchup)."""
+    week = as_week_schedule(games)
+    hot: set[int] = set()
+    for issue in find_idle_streak_issues(week):
+        for k in issue["slot_indices"]:
+            hot.update((k - 1, k, k + 1))
+    for _t, i, j in find_consecutive_refs(week):
+        hot.update((i, j))
+    for i, j, _m in find_consecutive_same_matchup(week):
+        hot.update((i, j))
+    for _r, i, _c in ref_play_conflicts(week):
+        hot.add(i)
+    return hot
+
+
 def games_after_partial_court_swap(
     games: list[dict[str, Any]],
     game_a_1based: int,
@@ -195,44 +580,180 @@ def games_after_partial_court_swap(
     """
     In-memory partial swap: one court's matchup + that court's ref between two rounds.
     Slot labels (gameNumber, row, refRow) unchanged — same as apply_partial_court_swap_to_sheet.
+    Untouched round dicts are shared with `games`.
+    """
+    rounds = partial_court_swap_rounds(
+        games, game_a_1based, court_a, game_b_1based, court_b
+    )
+    if rounds is None:
+        return None
+    g = list(games)
+    for k, x in rounds.items():
+        g[k] = x
+    return g
+
+
+# A court layout lists, for each court of each round in slot order, the (game, court) block
+# (1-based, from the current week) that ends up there: layout[2k + c - 1] feeds court c of round k + 1.
+Layout = tuple[tuple[int, int], ...]
+
+
+def identity_layout(n: int) -> Layout:
+    return tuple((k + 1, c) for k in range(n) for c in (1, 2))
+
+
+def layout_steps(layout: Layout) -> list[tuple[int, int, int, int]]:
+    """Partial court swaps (ga, ca, gb, cb) that build `layout` from the current week, at most 2n - 1."""
+    size = len(layout)
+    want = [2 * g + c - 3 for g, c in layout]
+    at = list(range(size))  # at[slot] = block currently there
+    where = list(range(size))
+    steps: list[tuple[int, int, int, int]] = []
+    for slot in range(size):
+        src = where[want[slot]]
+        if src == slot:
+            continue
+        steps.append((slot // 2 + 1, slot % 2 + 1, src // 2 + 1, src % 2 + 1))
+        at[slot], at[src] = at[src], at[slot]
+        where[at[slot]], where[at[src]] = slot, src
+    return steps
+
+
+def games_after_layout(games: list[dict[str, Any]], layout: Layout) -> list[dict[str, Any]]:
+    """In-memory week with every court moved to its place in `layout`; slot labels stay put."""
+    g = games
+    for step in layout_steps(layout):
+        g = games_after_partial_court_swap(g, *step)
+    return g
+
+
+def format_layout(layout: Layout) -> str:
+    """
+    --apply-order spec: one comma-separated token per round, "G" for all of former Game G,
+    else "G.C/H.D" (court 1 from Game G court C, court 2 from Game H court D).
+    """
+    tokens = []
+    for k in range(0, len(layout), 2):
+        (g1, c1), (g2, c2) = layout[k], layout[k + 1]
+        tokens.append(f"{g1}" if g1 == g2 and (c1, c2) == (1, 2) else f"{g1}.{c1}/{g2}.{c2}")
+    return ",".join(tokens)
+
+
+def parse_layout(spec: str, n: int) -> Layout:
+    """Inverse of format_layout for an n-round week; every court block must be used exactly once."""
+    tokens = [t.strip() for t in spec.split(",")]
+    if len(tokens) != n:
+        raise SystemExit(f"--apply-order needs {n} comma-separated rounds, got {len(tokens)}")
+    layout: list[tuple[int, int]] = []
+    for tok in tokens:
+        try:
+            if "/" in tok:
+                for half in tok.split("/", 1):
+                    g, c = half.split(".")
+                    layout.append((int(g), int(c)))
+            else:
+                layout += [(int(tok), 1), (int(tok), 2)]
+        except ValueError:
+            raise SystemExit(f"Bad --apply-order round {tok!r} (want G or G.C/H.D)") from None
+    if sorted(layout) != list(identity_layout(n)):
+        raise SystemExit(f"--apply-order must use each of Games 1..{n} courts 1 and 2 exactly once")
+    return tuple(layout)
+
+
+def rounds_for_in_place_moves(games: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Private working copy for the *_in_place move helpers: new round dicts and `playing` sets
+    (tuples and frozensets are immutable and stay shared). One copy per search, not per move.
+    """
+    return [{**g, "playing": set(g["playing"])} for g in games]
+
+
+_COURT_KEYS = {
+    1: ("court1_playing", "court1Ref", "court1_teams"),
+    2: ("court2_playing", "court2Ref", "court2_teams"),
+}
+
+
+def partial_court_swap_in_place(
+    games: list[dict[str, Any]],
+    game_a_1based: int,
+    court_a: int,
+    game_b_1based: int,
+    court_b: int,
+) -> tuple[int, int] | None:
+    """
+    In-place version of games_after_partial_court_swap on a rounds_for_in_place_moves copy.
+    Returns the touched 0-based slots, or None for an invalid move (nothing changed).
+    Self-inverse: applying the same move again undoes it.
     """
-    g = copy.deepcopy(games)
     ia = game_a_1based - 1
     ib = game_b_1based - 1
     if ia == ib and court_a == court_b:
         return None
     if court_a not in (1, 2) or court_b not in (1, 2):
         return None
-    if not (0 <= ia < len(g) and 0 <= ib < len(g)):
+    if not (0 <= ia < len(games) and 0 <= ib < len(games)):
         return None
-    A, B = g[ia], g[ib]
-    pa, ra = (
-        ("court1_playing", "court1Ref")
-        if court_a == 1
-        else ("court2_playing", "court2Ref")
-    )
-    pb, rb = (
-        ("court1_playing", "court1Ref")
-        if court_b == 1
-        else ("court2_playing", "court2Ref")
-    )
-    ta, t_ra = list(A[pa]), A[ra]
-    tb, t_rb = list(B[pb]), B[rb]
-    A[pa], A[ra] = (tb[0], tb[1]), t_rb
-    B[pb], B[rb] = (ta[0], ta[1]), t_ra
+    A, B = games[ia], games[ib]
+    pa, ra, ka = _COURT_KEYS[court_a]
+    pb, rb, kb = _COURT_KEYS[court_b]
+    A[pa], B[pb] = B[pb], A[pa]
+    A[ra], B[rb] = B[rb], A[ra]
+    A[ka], B[kb] = B[kb], A[ka]
+    for x in (A, B):
+        h1, a1 = x["court1_playing"]
+        h2, a2 = x["court2_playing"]
+        p = x["playing"]
+        p.clear()
+        for t in (h1, a1, h2, a2):
+            if t:
+                p.add(t)
+    return ia, ib
+
+
+
+def partial_court_swap_rounds(
+    games: list[dict[str, Any]],
+    game_a_1based: int,
+    court_a: int,
+    game_b_1based: int,
+    court_b: int,
+) -> dict[int, dict[str, Any]] | None:
+    """
+    Rounds touched by a partial court swap, keyed by 0-based slot; other rounds are unchanged.
+    Same validity rules and result as games_after_partial_court_swap, without copying the week.
+    """
+    ia = game_a_1based - 1
+    ib = game_b_1based - 1
+    if ia == ib and court_a == court_b:
+        return None
+    if court_a not in (1, 2) or court_b not in (1, 2):
+        return None
+    if not (0 <= ia < len(games) and 0 <= ib < len(games)):
+        return None
+    A = dict(games[ia])
+    B = A if ia == ib else dict(games[ib])
+    pa, ra = ("court1_playing", "court1Ref") if court_a == 1 else ("court2_playing", "court2Ref")
+    pb, rb = ("court1_playing", "court1Ref") if court_b == 1 else ("court2_playing", "court2Ref")
+    ta, t_ra = A[pa], A[ra]
+    tb, t_rb = B[pb], B[rb]
+    A[pa], A[ra] = tb, t_rb
+    B[pb], B[rb] = ta, t_ra
     for x in (A, B):
         h1, a1 = x["court1_playing"]
         h2, a2 = x["court2_playing"]
         x["playing"] = {t for t in [h1, a1, h2, a2] if t}
         x["court1_teams"] = frozenset({h1, a1} - {""})
         x["court2_teams"] = frozenset({h2, a2} - {""})
-    return g
+    return {ia: A, ib: B}
 
 
-def final_round_single_matchup_ok(games: list[dict[str, Any]]) -> bool:
+def final_round_single_matchup_ok(games: list[dict[str, Any]] | WeekSchedule) -> bool:
     """Exactly one court has a valid home/away matchup in the last parsed round."""
-    if not games:
+    if not len(games):
         return True
+    if isinstance(games, WeekSchedule):
+        return games.valid_courts[-1] in (0b01, 0b10)
     slot = games[-1]
     h1, a1 = slot["court1_playing"]
     h2, a2 = slot["court2_playing"]
@@ -242,12 +763,13 @@ def final_round_single_matchup_ok(games: list[dict[str, Any]]) -> bool:
 
 
 def partial_schedule_blockers(
-    games: list[dict[str, Any]],
+    games: list[dict[str, Any]] | WeekSchedule,
     teams: list[str],
     *,
     lock_final_single: bool,
 ) -> list[str]:
-    """Human-readable reasons a schedule is rejected by --deep-partial / --apply-partial."""
+    """Human-readable reasons a schedule is rejected by --deep-partial / --apply-partial / --apply-order."""
+    games = as_week_schedule(games)
     reasons: list[str] = []
     dups = find_same_team_both_courts_issues(games)
     if dups:
@@ -268,7 +790,7 @@ def partial_schedule_blockers(
 
 
 def schedule_ok_for_deep_partial(
-    games: list[dict[str, Any]],
+    games: list[dict[str, Any]] | WeekSchedule,
     teams: list[str],
     *,
     lock_final_single: bool,
@@ -295,11 +817,19 @@ def iter_canonical_partial_moves(n: int) -> list[tuple[int, int, int, int]]:
     return moves
 
 
+# Shards per worker for --jobs: more, smaller shards even out first moves that prune early.
+DEEP_PARTIAL_SHARDS_PER_JOB = 4
+
+
 def search_deep_partial_swap_sequences(
     games: list[dict[str, Any]],
     *,
     lock_final_single: bool = True,
     top: int = 30,
+    jobs: int = 1,
+    cache: ScoreCache | None = None,
+    profile: Profile | None = None,
+    budget: SearchBudget | None = None,
 ) -> tuple[
     list[tuple[Score, tuple[int, int, int, int]]],
     list[tuple[Score, tuple[int, int, int, int], tuple[int, int, int, int]]],
@@ -307,47 +837,256 @@ def search_deep_partial_swap_sequences(
     """
     Try one or two partial court-slot swaps (any order). Intermediate and final schedules must pass
     schedule_ok_for_deep_partial. Return strictly score-improving sequences vs baseline.
+
+    jobs > 1 shards the first move across a process pool. Shards are contiguous runs of moves and
+    each returns its own top-N, so the merged, stably sorted result matches jobs=1 exactly.
+    Workers keep their own ScoreCache; `cache` is used when jobs=1. `profile` gets the candidate,
+    prune and scoring counts. `budget` stops early with the best found so far (each worker checks
+    it on its own; shards not yet started are dropped once one reaches the target).
     """
-    teams = teams_in_week(games)
-    baseline = score_schedule(games)
     moves = iter_canonical_partial_moves(len(games))
+    budget = SearchBudget() if budget is None else budget
+    if jobs <= 1 or len(moves) < 2:
+        singles, doubles, counts = _deep_partial_shard(
+            games,
+            moves,
+            moves,
+            lock_final_single,
+            top,
+            ScoreCache() if cache is None else cache,
+            budget,
+        )
+        _record_deep_partial_counts(profile, counts)
+        return singles, doubles
+
+    chunk = max(1, -(-len(moves) // (jobs * DEEP_PARTIAL_SHARDS_PER_JOB)))
+    shards = [moves[i : i + chunk] for i in range(0, len(moves), chunk)]
     singles: list[tuple[Score, tuple[int, int, int, int]]] = []
     doubles: list[
         tuple[Score, tuple[int, int, int, int], tuple[int, int, int, int]]
     ] = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_deep_partial_worker,
+        initargs=(games, lock_final_single, top, budget),
+    ) as pool:
+        futures = [pool.submit(_deep_partial_worker, shard) for shard in shards]
+        for future in futures:
+            if future.cancelled():
+                continue
+            part_s, part_d, counts = future.result()
+            singles.extend(part_s)
+            doubles.extend(part_d)
+            _record_deep_partial_counts(profile, counts)
+            if counts["stopped_time"]:
+                budget.stop("time")
+            if counts["stopped_target"]:
+                budget.stop("target")
+                for f in futures:
+                    f.cancel()
+    singles.sort(key=_deep_partial_sort_key)
+    doubles.sort(key=_deep_partial_sort_key)
+    return singles[:top], doubles[:top]
 
-    for m1 in moves:
-        g1 = games_after_partial_court_swap(games, *m1)
-        if g1 is None or not schedule_ok_for_deep_partial(
-            g1, teams, lock_final_single=lock_final_single
-        ):
-            continue
-        s1 = score_schedule(g1)
-        if _better(s1, baseline):
-            singles.append((s1, m1))
 
-        k1 = partial_swap_move_key(m1)
-        for m2 in moves:
-            if partial_swap_move_key(m2) == k1:
-                continue
-            g2 = games_after_partial_court_swap(g1, *m2)
-            if g2 is None or not schedule_ok_for_deep_partial(
-                g2, teams, lock_final_single=lock_final_single
-            ):
-                continue
-            s2 = score_schedule(g2)
-            if _better(s2, baseline):
-                doubles.append((s2, m1, m2))
+_deep_partial_worker_state: dict[str, Any] = {}
 
-    def sort_key_s(
-        item: tuple[Score, ...],
-    ) -> tuple[int, int, int, int]:
-        s = item[0]
-        return (s.idle_count, s.ref_pairs, s.same_match_adj, s.ref_play)
 
-    singles.sort(key=sort_key_s)
-    doubles.sort(key=sort_key_s)
-    return singles[:top], doubles[:top]
+def _init_deep_partial_worker(
+    games: list[dict[str, Any]], lock_final_single: bool, top: int, budget: SearchBudget
+) -> None:
+    """Pool initializer: each worker process receives the week once, not once per shard."""
+    _deep_partial_worker_state.update(
+        games=games,
+        moves=iter_canonical_partial_moves(len(games)),
+        lock_final_single=lock_final_single,
+        top=top,
+        cache=ScoreCache(),
+        budget=budget,
+    )
+
+
+def _deep_partial_worker(
+    first_moves: list[tuple[int, int, int, int]],
+) -> tuple[
+    list[tuple[Score, tuple[int, int, int, int]]],
+    list[tuple[Score, tuple[int, int, int, int], tuple[int, int, int, int]]],
+    dict[str, int],
+]:
+    st = _deep_partial_worker_state
+    return _deep_partial_shard(
+        st["games"],
+        first_moves,
+        st["moves"],
+        st["lock_final_single"],
+        st["top"],
+        st["cache"],
+        st["budget"],
+    )
+
+
+def _record_deep_partial_counts(profile: Profile | None, counts: dict[str, int]) -> None:
+    if profile is None:
+        return
+    profile.count("deep-partial: first moves", counts["first"])
+    profile.count("deep-partial: first moves kept", counts["branches"], of="deep-partial: first moves")
+    profile.count("deep-partial: pairs", counts["pairs"])
+    for key, label in (
+        ("commuting", "pruned (commuting)"),
+        ("floor_baseline", "pruned (floor >= baseline)"),
+        ("floor_top", "pruned (floor >= top-N)"),
+        ("cache_hits", "cache hits"),
+        ("scored", "scored"),
+    ):
+        profile.count(f"deep-partial: {label}", counts[key], of="deep-partial: pairs")
+
+
+def _deep_partial_sort_key(item: tuple[Score, ...]) -> tuple[int, int, int, int]:
+    s = item[0]
+    return (s.idle_count, s.ref_pairs, s.same_match_adj, s.ref_play)
+
+
+def _deep_partial_shard(
+    games: list[dict[str, Any]],
+    first_moves: list[tuple[int, int, int, int]],
+    moves: list[tuple[int, int, int, int]],
+    lock_final_single: bool,
+    top: int,
+    cache: ScoreCache,
+    budget: SearchBudget | None = None,
+) -> tuple[
+    list[tuple[Score, tuple[int, int, int, int]]],
+    list[tuple[Score, tuple[int, int, int, int], tuple[int, int, int, int]]],
+    dict[str, int],
+]:
+    """
+    search_deep_partial_swap_sequences for first moves in `first_moves` (second move: any of `moves`),
+    plus candidate / prune counts for --profile and whether `budget` stopped it.
+
+    Branch and bound over the second move:
+      - moves on disjoint court slots commute, so each such pair is scored once, from the earlier
+        move in `moves` whose single-swap schedule passes (the other order only adds a duplicate);
+      - first moves are explored best single score first (ties: moves touching promising_slots
+        first), so the top-N cutoff tightens early and a budget cut keeps the likeliest branches;
+      - a second move is skipped when IncrementalScorer.score_floor shows it cannot beat the
+        baseline or the current top-N. That covers moves that touch no idle streak or blocker;
+      - pairs that land on an already scored week (e.g. two orders of a 3-cycle) hit `cache`.
+    Moves sharing a slot do not commute and are still tried in both orders. Ties keep move order,
+    as if every pair had been enumerated.
+    """
+    week = WeekSchedule.from_games(games)
+    scorer = IncrementalScorer(week)
+    baseline = scorer.score()
+    baseline_key = _deep_partial_sort_key((baseline,))
+    budget = SearchBudget() if budget is None else budget
+    singles: list[tuple[Score, tuple[int, int, int, int]]] = []
+    work = rounds_for_in_place_moves(games)
+    h = ScheduleHash(games)
+    hot = promising_slots(week)
+
+    move_slots = [partial_swap_move_key(m) for m in moves]
+    shard = set(first_moves)
+    first_ok: list[bool] = []
+    branches: list[tuple[tuple[int, int, int, int], bool, int]] = []
+    for i, m in enumerate(moves):
+        slots = partial_court_swap_in_place(work, *m)
+        if slots is None:
+            first_ok.append(False)
+            continue
+        scorer.refresh(work, slots)
+        ok = scorer.partial_ok(lock_final_single=lock_final_single)
+        first_ok.append(ok)
+        if ok and m in shard:
+            s1 = scorer.score()
+            if _better(s1, baseline):
+                singles.append((s1, m))
+                budget.reached(s1)
+            cold = m[0] - 1 not in hot and m[2] - 1 not in hot
+            branches.append((_deep_partial_sort_key((s1,)), cold, i))
+        partial_court_swap_in_place(work, *m)
+        scorer.refresh(work, slots)
+    branches.sort()
+
+    # (score key, i1, i2) of every kept double; a max-heap of negated keys tracks the worst of
+    # the best `top`, and a pair whose floor is not below it could never be returned.
+    found: list[tuple[tuple[int, ...], Score]] = []
+    kept: list[tuple[int, ...]] = []
+    pairs = commuting = floor_baseline = floor_top = cache_hits = scored = 0
+
+    for _, _, i1 in branches:
+        if not budget.complete or budget.expired():
+            break
+        m1 = moves[i1]
+        slots1 = partial_court_swap_in_place(work, *m1)
+        scorer.refresh(work, slots1)
+        h.swap_courts(*m1)
+        k1 = move_slots[i1]
+        for i2, m2 in enumerate(moves):
+            k2 = move_slots[i2]
+            if k2 == k1:
+                continue
+            pairs += 1
+            if i2 < i1 and first_ok[i2] and k1.isdisjoint(k2):
+                commuting += 1
+                continue
+            ga, ca, gb, cb = m2
+            pa, ra, _ = _COURT_KEYS[ca]
+            pb, rb, _ = _COURT_KEYS[cb]
+            A, B = work[ga - 1], work[gb - 1]
+            floor = scorer.score_floor(
+                (ga - 1, gb - 1), (*A[pa], *B[pb]), (A[ra], B[rb])
+            )
+            if floor >= baseline_key:
+                floor_baseline += 1
+                continue
+            if len(kept) == top and (*floor, i1, i2) >= tuple(-x for x in kept[0]):
+                floor_top += 1
+                continue
+            h.swap_courts(*m2)
+            verdict = cache.get(h.value)
+            if verdict is not None:
+                cache_hits += 1
+            else:
+                scored += 1
+                slots2 = partial_court_swap_in_place(work, *m2)
+                scorer.refresh(work, slots2)
+                verdict = scorer.verdict()
+                cache.put(h.value, verdict)
+                partial_court_swap_in_place(work, *m2)
+                scorer.refresh(work, slots2)
+            h.swap_courts(*m2)
+            if not verdict_blockers(verdict, lock_final_single=lock_final_single):
+                s2 = verdict[0]
+                if _better(s2, baseline):
+                    key = (*_deep_partial_sort_key((s2,)), i1, i2)
+                    found.append((key, s2))
+                    neg = tuple(-x for x in key)
+                    if len(kept) < top:
+                        heapq.heappush(kept, neg)
+                    elif neg > kept[0]:
+                        heapq.heapreplace(kept, neg)
+                    if budget.reached(s2):
+                        break
+        h.swap_courts(*m1)
+        partial_court_swap_in_place(work, *m1)
+        scorer.refresh(work, slots1)
+
+    singles.sort(key=_deep_partial_sort_key)
+    found.sort(key=lambda item: item[0])
+    doubles = [(s2, moves[key[-2]], moves[key[-1]]) for key, s2 in found[:top]]
+    counts = {
+        "first": len(first_moves),
+        "branches": len(branches),
+        "pairs": pairs,
+        "commuting": commuting,
+        "floor_baseline": floor_baseline,
+        "floor_top": floor_top,
+        "cache_hits": cache_hits,
+        "scored": scored,
+        "stopped_time": int(budget.stop_reason == "time"),
+        "stopped_target": int(budget.stop_reason == "target"),
+    }
+    return singles[:top], doubles, counts
 
 
 def format_partial_move(m: tuple[int, int, int, int]) -> str:
@@ -429,13 +1168,14 @@ def best_idle_count_after_deep_partial(
     *,
     lock_final_single: bool = True,
     top: int = 500,
+    jobs: int = 1,
 ) -> tuple[int, int]:
     """Return (best idle issue count, starting idle count) using up to two partial court swaps."""
-    teams = teams_in_week(games)
-    start = len(find_idle_streak_issues(games, teams))
-    base_sc = score_schedule(games)
+    week = WeekSchedule.from_games(games)
+    start = len(find_idle_streak_issues(week))
+    base_sc = score_schedule(week)
     singles, doubles = search_deep_partial_swap_sequences(
-        games, lock_final_single=lock_final_single, top=top
+        games, lock_final_single=lock_final_single, top=top, jobs=jobs
     )
     best = base_sc.idle_count
     for s, _m in singles:
@@ -453,22 +1193,15 @@ def run_flex_quadruplet_idle_report(
     max_games: int | None = None,
     lock_final_single: bool = True,
     deep_top: int = 500,
+    jobs: int = 1,
 ) -> None:
     """
     List balanced flex quadruplets (two movable H2Hs from week A <-> two from week B, same 4 teams),
     raw idle totals after swap, and best idle per week after search_deep_partial_swap_sequences.
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    if sheet_week_a not in wb.sheetnames:
-        wb.close()
-        raise SystemExit(f"Sheet {sheet_week_a!r} not in {wb.sheetnames}")
-    if sheet_week_b not in wb.sheetnames:
-        wb.close()
-        raise SystemExit(f"Sheet {sheet_week_b!r} not in {wb.sheetnames}")
-
-    games_a = parse_week_schedule(wb[sheet_week_a], max_games=max_games)
-    games_b = parse_week_schedule(wb[sheet_week_b], max_games=max_games)
-    wb.close()
+    weeks = read_week_sheets(file_path, [sheet_week_a, sheet_week_b], max_games=max_games)
+    games_a = weeks[sheet_week_a]["games"]
+    games_b = weeks[sheet_week_b]["games"]
 
     def collect_edges(games: list[dict[str, Any]]) -> list[tuple[Any, ...]]:
         edges: list[tuple[Any, ...]] = []
@@ -515,10 +1248,10 @@ def run_flex_quadruplet_idle_report(
 
     ba_start = idle_two_weeks(games_a, games_b)
     b_best_a, _ = best_idle_count_after_deep_partial(
-        games_a, lock_final_single=lock_final_single, top=deep_top
+        games_a, lock_final_single=lock_final_single, top=deep_top, jobs=jobs
     )
     b_best_b, _ = best_idle_count_after_deep_partial(
-        games_b, lock_final_single=lock_final_single, top=deep_top
+        games_b, lock_final_single=lock_final_single, top=deep_top, jobs=jobs
     )
     baseline_deep_total = b_best_a + b_best_b
 
@@ -565,10 +1298,10 @@ def run_flex_quadruplet_idle_report(
         )
         raw_tot = idle_two_weeks(ng_a, ng_b)
         bn_a, sna = best_idle_count_after_deep_partial(
-            ng_a, lock_final_single=lock_final_single, top=deep_top
+            ng_a, lock_final_single=lock_final_single, top=deep_top, jobs=jobs
         )
         bn_b, snb = best_idle_count_after_deep_partial(
-            ng_b, lock_final_single=lock_final_single, top=deep_top
+            ng_b, lock_final_single=lock_final_single, top=deep_top, jobs=jobs
         )
         comb = bn_a + bn_b
         post_swap_best = comb if post_swap_best is None else min(post_swap_best, comb)
@@ -599,54 +1332,168 @@ def run_flex_quadruplet_idle_report(
 def apply_ref_flip_mask(
     games: list[dict[str, Any]], mask: int
 ) -> list[dict[str, Any]]:
-    """If bit i set, swap court1Ref and court2Ref for game i. Game numbers preserved."""
-    out = copy.deepcopy(games)
-    n = len(out)
-    for i in range(n):
+    """If bit i set, swap court1Ref and court2Ref for game i. Game numbers preserved.
+
+    Only flipped rounds are copied; the rest are shared with `games`.
+    """
+    out = list(games)
+    for i in range(len(out)):
         if mask & (1 << i):
             g = out[i]
-            g["court1Ref"], g["court2Ref"] = g["court2Ref"], g["court1Ref"]
+            out[i] = {**g, "court1Ref": g["court2Ref"], "court2Ref": g["court1Ref"]}
     return out
 
 
-def search_ref_flips(games: list[dict[str, Any]]) -> list[tuple[Score, int]]:
-    """Try all 2^n within-round ref swaps; same playing set — idle streak count never changes."""
-    n = len(games)
-    results: list[tuple[Score, int]] = []
-    for mask in range(1 << n):
-        ng = apply_ref_flip_mask(games, mask)
-        s = score_schedule(ng)
-        results.append((s, mask))
-    results.sort(key=lambda x: (x[0].idle_count, x[0].ref_pairs, x[0].same_match_adj, x[0].ref_play))
-    return results
+def search_ref_flips(
+    games: list[dict[str, Any]], top: int = 10, *, profile: Profile | None = None
+) -> list[tuple[Score, int]]:
+    """Best `top` within-round ref swaps, ranked (score, mask) as if all 2^n masks were tried.
 
+    Flipping round i only changes which court its refs stand on, so idle streaks and matchups
+    are untouched, ref_play is a per-round term and ref_pairs a term over rounds (i, i+1).
+    _k_best_flip_masks runs a Viterbi pass over rounds on those terms in O(n * top); `profile`
+    gets the number of DP transitions it scored.
+    """
+    week = as_week_schedule(games)
+    baseline = score_schedule(week)
+
+    def refs_of(i: int, flip: int) -> tuple[int, int]:
+        r1, r2 = week.ref1[i], week.ref2[i]
+        return (r2, r1) if flip else (r1, r2)
+
+    def round_cost(i: int, flip: int) -> tuple[int, int]:
+        playing = week.playing[i]
+        ref_play = sum(1 for r in refs_of(i, flip) if r >= 0 and playing >> r & 1)
+        return 0, ref_play
+
+    def pair_cost(i: int, flip_i: int, flip_next: int) -> tuple[int, int]:
+        here = {r for r in refs_of(i, flip_i) if r >= 0}
+        there = {r for r in refs_of(i + 1, flip_next) if r >= 0}
+        return len(here & there), 0
+
+    ranked, transitions = _k_best_flip_masks(len(week), round_cost, pair_cost, top)
+    if profile is not None:
+        profile.count("ref-flip: DP transitions", transitions)
+    return [
+        (
+            Score(
+                idle_count=baseline.idle_count,
+                ref_pairs=ref_pairs,
+                same_match_adj=baseline.same_match_adj,
+                ref_play=ref_play,
+            ),
+            mask,
+        )
+        for (ref_pairs, ref_play), mask in ranked
+    ]
+
+
+def _k_best_flip_masks(
+    n: int,
+    round_cost: Any,
+    pair_cost: Any,
+    top: int,
+) -> tuple[list[tuple[tuple[int, ...], int]], int]:
+    """
+    `top` lowest (cost, mask) over all n-bit masks, where cost is the componentwise sum of
+    round_cost(i, bit i) and pair_cost(i, bit i, bit i+1), compared lexicographically.
 
-def search_two_round_swaps(games: list[dict[str, Any]], top: int = 25) -> list[tuple[Score, list[tuple[int, int]]]]:
-    """Apply up to two pairwise round swaps (composition on original order)."""
+    Rounds are added from the last one down, so partial masks grow from the high bits and
+    comparing them numerically matches the full-mask tie-break. Keeping `top` candidates per
+    state (the flip bit of the earliest round so far) is exact because costs only add.
+    Also returns the number of transitions scored (one per kept candidate extended by a bit).
+    """
+    if n == 0:
+        return [((0, 0), 0)], 0
+
+    def add(a: tuple[int, ...], b: tuple[int, ...]) -> tuple[int, ...]:
+        return tuple(x + y for x, y in zip(a, b))
+
+    best = [[(round_cost(n - 1, f), f << (n - 1))] for f in (0, 1)]
+    transitions = 0
+    for i in range(n - 2, -1, -1):
+        transitions += 2 * (len(best[0]) + len(best[1]))
+        best = [
+            sorted(
+                (add(add(cost, round_cost(i, f)), pair_cost(i, f, g)), mask | f << i)
+                for g in (0, 1)
+                for cost, mask in best[g]
+            )[:top]
+            for f in (0, 1)
+        ]
+    return sorted(best[0] + best[1])[:top], transitions
+
+
+def search_two_round_swaps(
+    games: list[dict[str, Any]],
+    top: int = 25,
+    cache: ScoreCache | None = None,
+    budget: SearchBudget | None = None,
+) -> list[tuple[Score, list[tuple[int, int]]]]:
+    """Apply up to two pairwise round swaps (composition on original order).
+
+    Disjoint swaps commute, so about half the pairs revisit a schedule; `cache` answers those.
+    Swaps touching promising_slots are tried first, so a `budget` cut keeps the likeliest ones;
+    ties are still listed in (i, j) order, as a full run would.
+    """
     n = len(games)
-    baseline = score_schedule(games)
-    best: list[tuple[Score, list[tuple[int, int]]]] = []
+    week = WeekSchedule.from_games(games)
+    scorer = IncrementalScorer(week)
+    baseline = scorer.score()
+    cache = ScoreCache() if cache is None else cache
+    budget = SearchBudget() if budget is None else budget
+    h = ScheduleHash(games)
+    # (score key, first pair index, second pair index or -1, score, swaps)
+    found: list[tuple[tuple[int, ...], int, int, Score, list[tuple[int, int]]]] = []
 
     pairs: list[tuple[int, int]] = []
     for i in range(n):
         for j in range(i + 1, n):
             pairs.append((i, j))
-
-    for a, b in pairs:
-        g1 = games_after_round_swap(games, a, b)
-        s1 = score_schedule(g1)
+    hot = promising_slots(week)
+    order = sorted(range(len(pairs)), key=lambda p: pairs[p][0] not in hot and pairs[p][1] not in hot)
+
+    work = rounds_for_in_place_moves(games)
+    for p in order:
+        if budget.expired():
+            break
+        a, b = pairs[p]
+        swap_rounds_in_place(work, a, b)
+        scorer.refresh(work, (a, b))
+        s1 = scorer.score()
         if _better(s1, baseline):
-            best.append((s1, [(a, b)]))
-
-        for c, d in pairs:
-            g2 = games_after_round_swap(g1, c, d)
-            s2 = score_schedule(g2)
+            found.append((_deep_partial_sort_key((s1,)), p, -1, s1, [(a, b)]))
+            if budget.reached(s1):
+                swap_rounds_in_place(work, a, b)
+                scorer.refresh(work, (a, b))
+                break
+
+        h.swap_rounds(a, b)
+        for q in order:
+            c, d = pairs[q]
+            h.swap_rounds(c, d)
+            verdict = cache.get(h.value)
+            if verdict is None:
+                swap_rounds_in_place(work, c, d)
+                scorer.refresh(work, (c, d))
+                verdict = scorer.verdict()
+                cache.put(h.value, verdict)
+                swap_rounds_in_place(work, c, d)
+                scorer.refresh(work, (c, d))
+            h.swap_rounds(c, d)
+            s2 = verdict[0]
             if _better(s2, baseline):
-                seq = [(a, b), (c, d)]
-                best.append((s2, seq))
+                found.append((_deep_partial_sort_key((s2,)), p, q, s2, [(a, b), (c, d)]))
+                if budget.reached(s2):
+                    break
+        h.swap_rounds(a, b)
+        swap_rounds_in_place(work, a, b)
+        scorer.refresh(work, (a, b))
+        if not budget.complete:
+            break
 
-    best.sort(key=lambda x: (x[0].idle_count, x[0].ref_pairs, x[0].same_match_adj, x[0].ref_play))
-    return best[:top]
+    found.sort(key=lambda x: x[:3])
+    return [(s, seq) for _key, _p, _q, s, seq in found[:top]]
 
 
 def _better(s: Score, baseline: Score) -> bool:
@@ -663,8 +1510,10 @@ def search_cross_streak_swaps(
     If team A sits rounds at slots {i,i+1} and team B sits {j,j+...}, a swap (i,j) moves
     content between those time slots (labels fixed) — can break both streak patterns.
     """
-    teams = teams_in_week(games)
-    issues = find_idle_streak_issues(games, teams)
+    week = WeekSchedule.from_games(games)
+    issues = find_idle_streak_issues(week)
+    scorer = IncrementalScorer(week)
+    work = rounds_for_in_place_moves(games)
     seen: set[tuple[int, int]] = set()
     candidates: list[tuple[Score, str, str, int, int, str, str]] = []
     for p in range(len(issues)):
@@ -680,8 +1529,11 @@ def search_cross_streak_swaps(
                     if (a, b) in seen:
                         continue
                     seen.add((a, b))
-                    ng = games_after_round_swap(games, a, b)
-                    s = score_schedule(ng)
+                    swap_rounds_in_place(work, a, b)
+                    scorer.refresh(work, (a, b))
+                    s = scorer.score()
+                    swap_rounds_in_place(work, a, b)
+                    scorer.refresh(work, (a, b))
                     candidates.append((s, ta, tb, a + 1, b + 1, gna, gnb))
     candidates.sort(
         key=lambda x: (
@@ -697,6 +1549,152 @@ def search_cross_streak_swaps(
     return candidates[:top]
 
 
+# Optimizer temperatures, in units of the lowest Score field; the start lets an extra idle streak
+# through now and then, the end only takes improvements.
+OPTIMIZE_START_IDLE_ACCEPT = 0.1
+OPTIMIZE_END_TEMPERATURE = 0.05
+OPTIMIZE_MOVES = ("both", "rounds", "partial")
+OPTIMIZE_DEFAULT_SECONDS = 10.0
+
+
+def optimize_week(
+    games: list[dict[str, Any]],
+    *,
+    fixed_slots: Any = (),
+    moves: str = "both",
+    time_budget: float = OPTIMIZE_DEFAULT_SECONDS,
+    max_iters: int | None = None,
+    seed: int = 0,
+    lock_final_single: bool = True,
+    progress: Any = None,
+    cache: ScoreCache | None = None,
+    budget: SearchBudget | None = None,
+) -> tuple[Score, int, Layout, int]:
+    """
+    Simulated annealing over full round swaps and partial court swaps, with Score as the objective.
+
+    Rounds in `fixed_slots` (0-based) never change. Weeks are ranked by the number of
+    partial_schedule_blockers problems first (IncrementalScorer.blocker_count), then by Score, so
+    the best week is blocker-free whenever any visited week is; the weeks between it and `games`
+    may not be. The run stops
+    after `time_budget` seconds or `max_iters` moves (which, with `seed`, makes it reproducible);
+    `progress(elapsed, iters, current, best)` is called about once a second. Proposals are looked
+    up in `cache` first, so a rejected move to an already scored week never touches the rounds.
+    `budget` ends the run early once a blocker-free best week reaches its target (or its own
+    deadline passes).
+
+    Returns (best score, blockers left in it, the best week's Layout, moves tried). Apply the
+    layout whole (games_after_layout / --apply-order, which checks only the final week), not
+    step by step through --apply-partial.
+    """
+    if moves not in OPTIMIZE_MOVES:
+        raise ValueError(f"moves must be one of {OPTIMIZE_MOVES}")
+    rng = random.Random(seed)
+    budget = SearchBudget() if budget is None else budget
+    n = len(games)
+    free = [k for k in range(n) if k not in set(fixed_slots)]
+    scorer = IncrementalScorer(games)
+    work = rounds_for_in_place_moves(games)
+    cache = ScoreCache() if cache is None else cache
+    h = ScheduleHash(games)
+    # origin[2k + c - 1]: which original (round, court) block sits on court c of round k
+    origin = list(range(2 * n))
+
+    # Above any single count (idle streaks, ref pairs, ...), so energy keeps (blockers, Score) order.
+    w = (len(teams_in_week(games)) + 2) * (n + 1)
+
+    def energy(blockers: int, sc: Score) -> int:
+        return (
+            ((blockers * w + sc.idle_count) * w + sc.ref_pairs) * w + sc.same_match_adj
+        ) * w + sc.ref_play
+
+    current = best = scorer.score()
+    best_blockers = scorer.blocker_count(lock_final_single=lock_final_single)
+    e_cur = e_best = energy(best_blockers, best)
+    best_origin = list(origin)
+    t_start = -w**3 / math.log(OPTIMIZE_START_IDLE_ACCEPT)
+    kinds = [k for k in ("rounds", "partial") if moves in ("both", k)]
+    if len(free) < 2 and "rounds" in kinds:
+        kinds.remove("rounds")
+    blocks = [(k, c) for k in free for c in (1, 2)]
+    if not kinds or len(blocks) < 2:
+        return best, best_blockers, identity_layout(n), 0
+
+    # A move is (i, j) for a round swap or (ga, ca, gb, cb) for a partial swap; both self-inverse.
+    def hash_move(move: tuple[int, ...]) -> None:
+        if len(move) == 2:
+            h.swap_rounds(*move)
+        else:
+            h.swap_courts(*move)
+
+    def play_move(move: tuple[int, ...]) -> None:
+        if len(move) == 2:
+            swap_rounds_in_place(work, *move)
+            scorer.refresh(work, move)
+        else:
+            scorer.refresh(work, partial_court_swap_in_place(work, *move))
+
+    def block_positions(move: tuple[int, ...]) -> list[tuple[int, int]]:
+        if len(move) == 2:
+            i, j = move
+            return [(2 * i, 2 * j), (2 * i + 1, 2 * j + 1)]
+        ga, ca, gb, cb = move
+        return [(2 * ga + ca - 3, 2 * gb + cb - 3)]
+
+    start = time.monotonic()
+    next_report = 1.0
+    iters = 0
+    while True:
+        elapsed = time.monotonic() - start
+        if max_iters is not None:
+            if iters >= max_iters:
+                break
+            frac = iters / max_iters
+        else:
+            if elapsed >= time_budget:
+                break
+            frac = elapsed / time_budget
+        if budget.expired():
+            break
+        if progress is not None and elapsed >= next_report:
+            progress(elapsed, iters, current, best)
+            next_report = elapsed + 1.0
+        iters += 1
+        temp = t_start * (OPTIMIZE_END_TEMPERATURE / t_start) ** frac
+
+        if rng.choice(kinds) == "rounds":
+            move: tuple[int, ...] = tuple(rng.sample(free, 2))
+        else:
+            (ka, ca), (kb, cb) = rng.sample(blocks, 2)
+            move = (ka + 1, ca, kb + 1, cb)
+        hash_move(move)
+        verdict = cache.get(h.value)
+        played = verdict is None
+        if played:
+            play_move(move)
+            verdict = scorer.verdict()
+            cache.put(h.value, verdict)
+        cand = verdict[0]
+        blockers = verdict_blockers(verdict, lock_final_single=lock_final_single)
+        e_new = energy(blockers, cand)
+        if e_new <= e_cur or rng.random() < math.exp((e_cur - e_new) / temp):
+            if not played:
+                play_move(move)
+            current, e_cur = cand, e_new
+            for x, y in block_positions(move):
+                origin[x], origin[y] = origin[y], origin[x]
+            if e_new < e_best:
+                best, best_blockers, e_best, best_origin = cand, blockers, e_new, list(origin)
+                if not blockers and budget.reached(best):
+                    break
+        else:
+            if played:
+                play_move(move)
+            hash_move(move)
+
+    return best, best_blockers, tuple((b // 2 + 1, b % 2 + 1) for b in best_origin), iters
+
+
 MAX_COL = 12
 
 
@@ -939,10 +1937,390 @@ def apply_cross_sheet_court_swap_to_sheets(
     write_cell(ws_b, rr_b, r_b, vals_a[2])
 
 
+def analyze_week(
+    sheet: str,
+    games: list[dict[str, Any]],
+    *,
+    deep: bool = False,
+    deep_partial: bool = False,
+    lock_final_single: bool = True,
+    ref_flip: bool = False,
+    optimize: bool = False,
+    optimize_moves: str = "both",
+    fixed_slots: Any = (),
+    time_budget: float | None = None,
+    target: tuple[int | None, ...] | None = None,
+    max_iters: int | None = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    One week's entry in the --all-weeks report (JSON-ready): baseline problems, then the best
+    result of each requested search, or None when it finds nothing better than the baseline.
+    Each search gets its own SearchBudget(time_budget, target); "complete" records which ran to
+    the end (--optimize: time_budget or OPTIMIZE_DEFAULT_SECONDS, stopping early only on target).
+    """
+    week = WeekSchedule.from_games(games)
+    baseline = score_schedule(week)
+    cache = ScoreCache()
+    out: dict[str, Any] = {
+        "sheet": sheet,
+        "rounds": len(games),
+        "score": asdict(baseline),
+        "idle_streaks": [
+            {k: x[k] for k in ("team", "streak_len", "game_numbers", "severity")}
+            for x in find_idle_streak_issues(week)
+        ],
+        "consecutive_refs": [
+            {"team": t, "from": games[i]["gameNumber"], "to": games[j]["gameNumber"]}
+            for t, i, j in find_consecutive_refs(week)
+        ],
+        "blockers": partial_schedule_blockers(week, week.teams, lock_final_single=lock_final_single),
+        "complete": {},
+    }
+    if deep:
+        budget = SearchBudget(time_budget, target)
+        top = search_two_round_swaps(games, top=1, cache=cache, budget=budget)
+        out["complete"]["deep"] = budget.complete
+        out["deep"] = (
+            {"score": asdict(top[0][0]), "swaps": [[a + 1, b + 1] for a, b in top[0][1]]}
+            if top
+            else None
+        )
+    if deep_partial:
+        budget = SearchBudget(time_budget, target)
+        singles, doubles = search_deep_partial_swap_sequences(
+            games, lock_final_single=lock_final_single, top=1, cache=cache, budget=budget
+        )
+        out["complete"]["deep_partial"] = budget.complete
+        found = [(s, [m]) for s, m in singles] + [(s, [m1, m2]) for s, m1, m2 in doubles]
+        found.sort(key=lambda x: (_deep_partial_sort_key(x), len(x[1])))
+        out["deep_partial"] = (
+            {"score": asdict(found[0][0]), "moves": [list(m) for m in found[0][1]]}
+            if found
+            else None
+        )
+    if ref_flip:
+        s, mask = search_ref_flips(games, top=1)[0]
+        out["ref_flip"] = {"score": asdict(s), "mask": mask} if s < baseline else None
+    if optimize:
+        budget = SearchBudget(target=target)
+        best, blockers, layout, iters = optimize_week(
+            games,
+            fixed_slots=fixed_slots,
+            moves=optimize_moves,
+            time_budget=OPTIMIZE_DEFAULT_SECONDS if time_budget is None else time_budget,
+            max_iters=max_iters,
+            seed=seed,
+            lock_final_single=lock_final_single,
+            cache=cache,
+            budget=budget,
+        )
+        out["complete"]["optimize"] = budget.complete
+        out["optimize"] = (
+            {"score": asdict(best), "blockers": blockers, "layout": format_layout(layout)}
+            if layout != identity_layout(len(games))
+            else None
+        )
+    return out
+
+
+def run_all_weeks_report(
+    file_path: str,
+    *,
+    max_games: int | None = None,
+    jobs: int = 1,
+    json_path: str | None = None,
+    profile: Profile | None = None,
+    **search: Any,
+) -> list[dict[str, Any]]:
+    """
+    analyze_week for every week sheet (setup_standings.detect_week_sheets) from one read-only load,
+    with weeks spread over `jobs` processes. Prints one consolidated report; `json_path` also gets
+    the per-week summaries as JSON.
+    """
+    prof = profile or Profile()
+    weeks = [
+        (sheet, week["games"])
+        for sheet, week in read_week_sheets(file_path, max_games=max_games, profile=prof).items()
+    ]
+    if not weeks:
+        raise SystemExit(f"No week sheets in {file_path}")
+
+    if jobs > 1 and len(weeks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(weeks))) as pool:
+            futures = [pool.submit(analyze_week, sheet, games, **search) for sheet, games in weeks]
+            summaries = [f.result() for f in futures]
+    else:
+        summaries = [analyze_week(sheet, games, **search) for sheet, games in weeks]
+    prof.lap("week searches")
+    prof.count("weeks", len(weeks))
+
+    print(f"File: {file_path}\nWeeks: {len(summaries)}")
+    for w in summaries:
+        print(f"\n{w['sheet']}: {w['rounds']} rounds  {format_score(Score(**w['score']))}")
+        for x in w["idle_streaks"]:
+            print(
+                f"  idle {x['team']}: {x['streak_len']} rounds "
+                f"({', '.join(x['game_numbers'])}) [{x['severity']}]"
+            )
+        for x in w["consecutive_refs"]:
+            print(f"  ref twice {x['team']}: {x['from']} → {x['to']}")
+        for reason in w["blockers"]:
+            print(f"  blocker: {reason}")
+        if w.get("deep"):
+            desc = " then ".join(f"swap({a},{b})" for a, b in w["deep"]["swaps"])
+            print(f"  --deep: {desc} -> {format_score(Score(**w['deep']['score']))}")
+        if w.get("deep_partial"):
+            desc = " then ".join(format_partial_move(tuple(m)) for m in w["deep_partial"]["moves"])
+            print(f"  --deep-partial: {desc} -> {format_score(Score(**w['deep_partial']['score']))}")
+        if w.get("ref_flip"):
+            r = w["ref_flip"]
+            print(f"  --ref-flip: mask={r['mask']:#x} -> {format_score(Score(**r['score']))}")
+        if w.get("optimize"):
+            o = w["optimize"]
+            print(
+                f"  --optimize: --apply-order {o['layout']} -> "
+                f"{format_score(Score(**o['score']))}"
+            )
+        stopped = [name for name, done in w["complete"].items() if not done]
+        if stopped:
+            print(f"  stopped early (best so far): {', '.join(stopped)}")
+
+    totals = {
+        "weeks": len(summaries),
+        "idle_count": sum(w["score"]["idle_count"] for w in summaries),
+        "ref_pairs": sum(w["score"]["ref_pairs"] for w in summaries),
+        "same_match_adj": sum(w["score"]["same_match_adj"] for w in summaries),
+        "ref_play": sum(w["score"]["ref_play"] for w in summaries),
+        "weeks_with_blockers": sum(1 for w in summaries if w["blockers"]),
+    }
+    print(
+        f"\nSeason: idle={totals['idle_count']} consecutive_ref_edges={totals['ref_pairs']} "
+        f"same_matchup_adj={totals['same_match_adj']} ref_play={totals['ref_play']}  "
+        f"weeks with blockers: {totals['weeks_with_blockers']}/{totals['weeks']}"
+    )
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"file": file_path, "totals": totals, "weeks": summaries}, f, indent=2)
+            f.write("\n")
+        print(f"JSON summary: {json_path}")
+    return summaries
+
+
+class WeekSheetSession:
+    """
+    One load_workbook per apply run: the week sheet being edited and its parsed rounds.
+
+    The workbook is loaded with formulas (data_only=False) and only written through; `games` comes
+    from the cached-values read (read_week_sheets), so a formula in a team or ref cell counts as
+    its cached value, as in every analysis run, never as formula text. Each edit writes the cells
+    and applies the matching in-memory move to `games`, keeping every slot's gameNumber / row /
+    refRow, so the after-report needs no second load.
+    """
+
+    def __init__(self, path: str, sheet: str, *, max_games: int | None = None) -> None:
+        self.path = path
+        self.wb = openpyxl.load_workbook(path, data_only=False)
+        if sheet not in self.wb.sheetnames:
+            self.wb.close()
+            raise SystemExit(f"Sheet {sheet!r} not in {self.wb.sheetnames}")
+        self.ws = self.wb[sheet]
+        self.games = read_week_sheets(path, [sheet], max_games=max_games)[sheet]["games"]
+
+    def _keep_slots(self, rounds: list[dict[str, Any]]) -> None:
+        """Install moved round content; labels and rows stay with the slot, as on the sheet."""
+        self.games = [
+            {**g, "gameNumber": slot["gameNumber"], "row": slot["row"], "refRow": slot["refRow"]}
+            for g, slot in zip(rounds, self.games)
+        ]
+
+    def swap_rounds(self, slot_a_1based: int, slot_b_1based: int) -> None:
+        apply_round_swap_to_sheet(self.ws, self.games, slot_a_1based, slot_b_1based)
+        self._keep_slots(
+            games_after_round_swap(self.games, slot_a_1based - 1, slot_b_1based - 1)
+        )
+
+    def partial_court_swap(
+        self, game_a_1based: int, court_a: int, game_b_1based: int, court_b: int
+    ) -> None:
+        apply_partial_court_swap_to_sheet(
+            self.ws, self.games, game_a_1based, court_a, game_b_1based, court_b
+        )
+        self.games = games_after_partial_court_swap(
+            self.games, game_a_1based, court_a, game_b_1based, court_b
+        )
+
+    def arrange(self, layout: Layout) -> None:
+        """Move every court to its place in `layout`; the in-between weeks are never checked."""
+        for step in layout_steps(layout):
+            self.partial_court_swap(*step)
+
+    def move_round_to_front(self, round_1based: int) -> None:
+        move_round_to_front_of_sheet(self.ws, self.games, round_1based)
+        idx = round_1based - 1
+        self._keep_slots([self.games[idx]] + self.games[:idx] + self.games[idx + 1 :])
+
+    def shift_up_from(self, first_empty_slot_1based: int) -> None:
+        shift_following_rounds_up_one_slot(self.ws, self.games, first_empty_slot_1based)
+        ie = first_empty_slot_1based - 1
+        empty = {
+            "court1Ref": "",
+            "court2Ref": "",
+            "court1_playing": ("", ""),
+            "court2_playing": ("", ""),
+            "court1_teams": frozenset(),
+            "court2_teams": frozenset(),
+            "playing": set(),
+        }
+        self._keep_slots(self.games[:ie] + self.games[ie + 1 :] + [empty])
+
+    def save(self) -> None:
+        self.wb.save(self.path)
+        self.wb.close()
+
+
+def _print_after_report(games: list[dict[str, Any]], label: str) -> None:
+    week = WeekSchedule.from_games(games)
+    after = score_schedule(week)
+    idle_after = find_idle_streak_issues(week)
+    print(f"Rounds parsed: {len(games)}\n{label}: {format_score(after)}")
+    print(f"\nIdle streak issues ({len(idle_after)}):")
+    for issue in idle_after:
+        gn = ", ".join(issue["game_numbers"])
+        print(f"  {issue['team']}: {issue['streak_len']} rounds ({gn}) [{issue['severity']}]")
+    ref_after = find_consecutive_refs(week)
+    if ref_after:
+        print("\nConsecutive referee assignments:")
+        for team, i, j in ref_after:
+            print(f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}")
+    else:
+        print("\nNo consecutive referee assignments.")
+
+
+def _write_ndjson_report(
+    args: argparse.Namespace, games: list[dict[str, Any]], cache: ScoreCache
+) -> None:
+    """--format ndjson: the same checks and searches as the text report, one record per line."""
+    from schedule_diagnostics import (
+        arrange_op,
+        flip_refs_op,
+        suggestion_record,
+        swap_courts_op,
+        swap_rounds_op,
+        week_records,
+        write_ndjson,
+    )
+
+    sheet = args.sheet
+    week = WeekSchedule.from_games(games)
+    baseline = score_schedule(week)
+    write_ndjson(week_records(week, file=args.file, sheet=sheet))
+
+    records: list[dict[str, Any]] = []
+    n = len(games)
+    improved = []
+    for i in range(n):
+        for j in range(i + 1, n):
+            s = score_schedule(games_after_round_swap(games, i, j))
+            if s < baseline:
+                improved.append((s, i + 1, j + 1))
+    improved.sort(key=lambda x: (x[0].idle_count, x[0].ref_pairs, x[0].same_match_adj, x[0].ref_play))
+    for rank, (s, a, b) in enumerate(improved[:30], 1):
+        records.append(suggestion_record(sheet, "round_swap", rank, [swap_rounds_op(a, b)], s))
+
+    if not args.no_cross_streak:
+        cross = [c for c in search_cross_streak_swaps(games, baseline, top=35) if c[0] < baseline]
+        for rank, (s, ta, tb, sa, sb, _gna, _gnb) in enumerate(cross, 1):
+            records.append(
+                suggestion_record(
+                    sheet, "cross_streak_swap", rank, [swap_rounds_op(sa, sb)], s, teams=[ta, tb]
+                )
+            )
+
+    if args.deep:
+        budget = SearchBudget(args.time_budget, args.target_score)
+        top = search_two_round_swaps(games, top=30, cache=cache, budget=budget)
+        for rank, (s, seq) in enumerate(top, 1):
+            moves = [swap_rounds_op(a + 1, b + 1) for a, b in seq]
+            records.append(
+                suggestion_record(sheet, "round_swaps", rank, moves, s, complete=budget.complete)
+            )
+
+    lock_final = not args.deep_partial_no_final_lock
+    if args.deep_partial:
+        budget = SearchBudget(args.time_budget, args.target_score)
+        singles, doubles = search_deep_partial_swap_sequences(
+            games, lock_final_single=lock_final, top=30, jobs=args.jobs, cache=cache, budget=budget
+        )
+        found = [(s, [m]) for s, m in singles] + [(s, [m1, m2]) for s, m1, m2 in doubles]
+        found.sort(key=lambda x: (_deep_partial_sort_key(x), len(x[1])))
+        for rank, (s, ms) in enumerate(found, 1):
+            moves = [swap_courts_op(m) for m in ms]
+            records.append(
+                suggestion_record(sheet, "partial_swaps", rank, moves, s, complete=budget.complete)
+            )
+
+    if args.ref_flip:
+        better = [x for x in search_ref_flips(games) if x[0] < baseline]
+        for rank, (s, mask) in enumerate(better, 1):
+            records.append(suggestion_record(sheet, "ref_flip", rank, [flip_refs_op(mask)], s))
+
+    if args.optimize:
+        budget = SearchBudget(target=args.target_score)
+        best, blockers, layout, _iters = optimize_week(
+            games,
+            fixed_slots=sorted({slot - 1 for slot in args.fix_slot if 1 <= slot <= n}),
+            moves=args.optimize_moves,
+            time_budget=OPTIMIZE_DEFAULT_SECONDS if args.time_budget is None else args.time_budget,
+            max_iters=args.max_iters,
+            seed=args.seed,
+            lock_final_single=lock_final,
+            cache=cache,
+            budget=budget,
+        )
+        if layout != identity_layout(n):
+            records.append(
+                suggestion_record(
+                    sheet,
+                    "optimize",
+                    1,
+                    [arrange_op(layout)],
+                    best,
+                    blockers=blockers,
+                    seed=args.seed,
+                    complete=budget.complete,
+                )
+            )
+    write_ndjson(records)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Idle streak analysis and swap exploration.")
     parser.add_argument("--file", required=True, help="Path to .xlsx")
-    parser.add_argument("--sheet", required=True, help='Sheet name, e.g. "Week 3 Schedule"')
+    parser.add_argument("--sheet", default=None, help='Sheet name, e.g. "Week 3 Schedule"')
+    parser.add_argument(
+        "--all-weeks",
+        action="store_true",
+        help=(
+            "Analyze every week sheet from one workbook load (weeks in parallel with --jobs) and print "
+            "one season report; runs --deep / --deep-partial / --ref-flip / --optimize if given."
+        ),
+    )
+    parser.add_argument(
+        "--json-summary",
+        default=None,
+        metavar="PATH",
+        help="With --all-weeks: also write the per-week summaries to PATH as JSON.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "ndjson"),
+        default="text",
+        help=(
+            "ndjson: one JSON record per line (week, conflicts, ranked suggestions; "
+            "see schedule_diagnostics) instead of the text report."
+        ),
+    )
     parser.add_argument(
         "--deep",
         action="store_true",
@@ -959,12 +2337,15 @@ def main() -> None:
     parser.add_argument(
         "--deep-partial-no-final-lock",
         action="store_true",
-        help="With --deep-partial, allow any last-round court pattern (not only one active matchup).",
+        help=(
+            "With --deep-partial, --optimize, --apply-partial or --apply-order, allow any last-round "
+            "court pattern (not only one active matchup)."
+        ),
     )
     parser.add_argument(
         "--ref-flip",
         action="store_true",
-        help="Exhaustive ref swap per round (court1Ref↔court2Ref); idle count unchanged; may reduce ref_pairs.",
+        help="Best ref swaps per round (court1Ref↔court2Ref), exact for any week length; idle count unchanged; may reduce ref_pairs.",
     )
     parser.add_argument(
         "--max-games",
@@ -997,6 +2378,14 @@ def main() -> None:
         metavar=("GAME_A", "COURT_A", "GAME_B", "COURT_B"),
         help="Swap court COURT_A of GAME_A with court COURT_B of GAME_B (1-based game nums, courts 1|2).",
     )
+    parser.add_argument(
+        "--apply-order",
+        metavar="LAYOUT",
+        help=(
+            "Rearrange the whole week's courts at once, e.g. 1,2,7,4.1/9.2,...: one entry per round, G for "
+            "all of former Game G or G.C/H.D per court. Only the final week is checked (see --optimize)."
+        ),
+    )
     parser.add_argument(
         "--shift-up-from",
         type=int,
@@ -1030,12 +2419,125 @@ def main() -> None:
         metavar="N",
         help="With --flex-quadruplets: top-N improving moves to keep in search_deep_partial (default 500).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for --deep-partial / --flex-quadruplets searches (default 1).",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help=(
+            "Simulated annealing over round swaps and partial court swaps for --time-budget seconds "
+            "(default 10); prints the --apply-order layout of the best week found (no write)."
+        ),
+    )
+    parser.add_argument(
+        "--optimize-moves",
+        choices=OPTIMIZE_MOVES,
+        default="both",
+        help="With --optimize: full round swaps, partial court swaps, or both (default both).",
+    )
+    parser.add_argument(
+        "--fix-slot",
+        type=int,
+        action="append",
+        default=[],
+        metavar="SLOT",
+        help="With --optimize: 1-based round slot that must not change (repeatable), e.g. --fix-slot 18.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Per search (--deep, --deep-partial, --optimize): stop after this many seconds and report "
+            "the best found so far, marked as stopped early (default: run to the end; --optimize 10)."
+        ),
+    )
+    parser.add_argument(
+        "--target-score",
+        type=parse_target_score,
+        default=None,
+        metavar="IDLE,REF_PAIRS,SAME_MATCH,REF_PLAY",
+        help=(
+            "Stop a search (--deep, --deep-partial, --optimize) as soon as it finds a week at or below "
+            "every given field, e.g. 0 or 0,1 (trailing fields may be left off, '-' skips one). "
+            "Promising swaps are tried first."
+        ),
+    )
+    parser.add_argument(
+        "--max-iters",
+        type=int,
+        default=None,
+        metavar="N",
+        help="With --optimize: stop after N moves instead of the time budget (reproducible with --seed).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="With --optimize: random seed (default 0).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per phase (load, parse, each search, writes) and candidate/prune counts to stderr.",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        metavar="PATH",
+        help="Also run under cProfile, dump pstats to PATH and print the top entries (implies --profile).",
+    )
     args = parser.parse_args()
+    prof = Profile()
+    with profile_run(prof, report=args.profile, pstats_path=args.profile_out):
+        _run(args, prof)
+
+
+def _run(args: argparse.Namespace, prof: Profile) -> None:
+    if args.all_weeks:
+        if args.format == "ndjson":
+            raise SystemExit("--all-weeks reports JSON through --json-summary, not --format ndjson")
+        if args.write or args.apply_swap or args.apply_partial or args.apply_order or args.shift_up_from is not None or args.move_round_to_front is not None:
+            raise SystemExit("--all-weeks cannot be combined with sheet mutation flags")
+        if args.flex_quadruplets:
+            raise SystemExit("--all-weeks cannot be combined with --flex-quadruplets")
+        run_all_weeks_report(
+            args.file,
+            max_games=args.max_games,
+            jobs=args.jobs,
+            json_path=args.json_summary,
+            profile=prof,
+            deep=args.deep,
+            deep_partial=args.deep_partial,
+            lock_final_single=not args.deep_partial_no_final_lock,
+            ref_flip=args.ref_flip,
+            optimize=args.optimize,
+            optimize_moves=args.optimize_moves,
+            fixed_slots=sorted({slot - 1 for slot in args.fix_slot if slot >= 1}),
+            time_budget=args.time_budget,
+            target=args.target_score,
+            max_iters=args.max_iters,
+            seed=args.seed,
+        )
+        return
+    if not args.sheet:
+        raise SystemExit("--sheet is required unless --all-weeks is given")
+    if args.format == "ndjson":
+        if args.write or args.apply_swap or args.apply_partial or args.apply_order or args.shift_up_from is not None or args.move_round_to_front is not None:
+            raise SystemExit("--format ndjson cannot be combined with sheet mutation flags")
+        if args.flex_quadruplets:
+            raise SystemExit("--format ndjson cannot be combined with --flex-quadruplets")
 
     if args.flex_quadruplets:
         if not args.sheet2:
             raise SystemExit("--flex-quadruplets requires --sheet2")
-        if args.write or args.apply_swap or args.apply_partial or args.shift_up_from is not None or args.move_round_to_front is not None:
+        if args.write or args.apply_swap or args.apply_partial or args.apply_order or args.shift_up_from is not None or args.move_round_to_front is not None:
             raise SystemExit("--flex-quadruplets cannot be combined with sheet mutation flags")
         run_flex_quadruplet_idle_report(
             args.file,
@@ -1044,18 +2546,21 @@ def main() -> None:
             max_games=args.max_games,
             lock_final_single=not args.deep_partial_no_final_lock,
             deep_top=args.flex_deep_top,
+            jobs=args.jobs,
         )
         return
 
     has_apply = bool(
         args.apply_swap
         or args.apply_partial
+        or args.apply_order
         or args.shift_up_from is not None
         or args.move_round_to_front is not None
     )
     if args.write and not has_apply:
         raise SystemExit(
-            "--write requires --apply-swap, --apply-partial, --shift-up-from, or --move-round-to-front"
+            "--write requires --apply-swap, --apply-partial, --apply-order, --shift-up-from, "
+            "or --move-round-to-front"
         )
 
     mode_count = sum(
@@ -1063,6 +2568,7 @@ def main() -> None:
         for flag in (
             args.apply_swap,
             args.apply_partial,
+            args.apply_order,
             args.shift_up_from is not None,
             args.move_round_to_front is not None,
         )
@@ -1070,7 +2576,8 @@ def main() -> None:
     )
     if mode_count > 1:
         raise SystemExit(
-            "Use only one of --apply-swap, --apply-partial, --shift-up-from, --move-round-to-front per run"
+            "Use only one of --apply-swap, --apply-partial, --apply-order, --shift-up-from, "
+            "--move-round-to-front per run"
         )
 
     if args.apply_swap:
@@ -1079,37 +2586,15 @@ def main() -> None:
                 "Refusing to modify the workbook without --write. "
                 "Example: --apply-swap 4 14 --write"
             )
-        wb = openpyxl.load_workbook(args.file, data_only=False)
-        if args.sheet not in wb.sheetnames:
-            raise SystemExit(f"Sheet {args.sheet!r} not in {wb.sheetnames}")
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
+        with prof.phase("workbook load (writable) + parse"):
+            session = WeekSheetSession(args.file, args.sheet, max_games=args.max_games)
         a, b = args.apply_swap
         print(f"Applying swap: slot {a} <-> slot {b}")
-        apply_round_swap_to_sheet(ws, games, a, b)
-        wb.save(args.file)
-        wb.close()
+        session.swap_rounds(a, b)
+        with prof.phase("sheet write"):
+            session.save()
         print(f"Saved {args.file}")
-
-        wb = openpyxl.load_workbook(args.file, data_only=True)
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
-        wb.close()
-        teams = teams_in_week(games)
-        after = score_schedule(games)
-        idle_after = find_idle_streak_issues(games, teams)
-        print(f"Rounds parsed: {len(games)}\nAfter swap: {format_score(after)}")
-        print(f"\nIdle streak issues ({len(idle_after)}):")
-        for issue in idle_after:
-            gn = ", ".join(issue["game_numbers"])
-            print(f"  {issue['team']}: {issue['streak_len']} rounds ({gn}) [{issue['severity']}]")
-        ref_after = find_consecutive_refs(games)
-        if ref_after:
-            print("\nConsecutive referee assignments:")
-            for team, i, j in ref_after:
-                print(f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}")
-        else:
-            print("\nNo consecutive referee assignments.")
+        _print_after_report(session.games, "After swap")
         return
 
     if args.apply_partial:
@@ -1121,47 +2606,51 @@ def main() -> None:
         ga, ca, gb, cb = args.apply_partial
         if ca not in (1, 2) or cb not in (1, 2):
             raise SystemExit("Courts must be 1 or 2")
-        wb = openpyxl.load_workbook(args.file, data_only=False)
-        if args.sheet not in wb.sheetnames:
-            raise SystemExit(f"Sheet {args.sheet!r} not in {wb.sheetnames}")
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
+        with prof.phase("workbook load (writable) + parse"):
+            session = WeekSheetSession(args.file, args.sheet, max_games=args.max_games)
+        games = session.games
         teams = teams_in_week(games)
         ng = games_after_partial_court_swap(games, ga, ca, gb, cb)
         if ng is None:
             raise SystemExit("Invalid partial swap (need two different court slots).")
         blockers = partial_schedule_blockers(
-            ng, teams, lock_final_single=True
+            ng, teams, lock_final_single=not args.deep_partial_no_final_lock
         )
         if blockers:
             raise SystemExit(
                 "Refusing partial swap — " + "; ".join(blockers) + "."
             )
         print(f"Applying partial swap: Game {ga} court {ca} <-> Game {gb} court {cb}")
-        apply_partial_court_swap_to_sheet(ws, games, ga, ca, gb, cb)
-        wb.save(args.file)
-        wb.close()
+        session.partial_court_swap(ga, ca, gb, cb)
+        with prof.phase("sheet write"):
+            session.save()
         print(f"Saved {args.file}")
+        _print_after_report(session.games, "After partial swap")
+        return
 
-        wb = openpyxl.load_workbook(args.file, data_only=True)
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
-        wb.close()
-        teams = teams_in_week(games)
-        after = score_schedule(games)
-        idle_after = find_idle_streak_issues(games, teams)
-        print(f"Rounds parsed: {len(games)}\nAfter partial swap: {format_score(after)}")
-        print(f"\nIdle streak issues ({len(idle_after)}):")
-        for issue in idle_after:
-            gn = ", ".join(issue["game_numbers"])
-            print(f"  {issue['team']}: {issue['streak_len']} rounds ({gn}) [{issue['severity']}]")
-        ref_after = find_consecutive_refs(games)
-        if ref_after:
-            print("\nConsecutive referee assignments:")
-            for team, i, j in ref_after:
-                print(f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}")
-        else:
-            print("\nNo consecutive referee assignments.")
+    if args.apply_order:
+        if not args.write:
+            raise SystemExit(
+                "Refusing to modify without --write. "
+                "Example: --apply-order 1,2,7,4.1/9.2,... --write"
+            )
+        with prof.phase("workbook load (writable) + parse"):
+            session = WeekSheetSession(args.file, args.sheet, max_games=args.max_games)
+        layout = parse_layout(args.apply_order, len(session.games))
+        blockers = partial_schedule_blockers(
+            games_after_layout(session.games, layout),
+            teams_in_week(session.games),
+            lock_final_single=not args.deep_partial_no_final_lock,
+        )
+        if blockers:
+            raise SystemExit("Refusing layout — " + "; ".join(blockers) + ".")
+        steps = layout_steps(layout)
+        print(f"Applying layout {format_layout(layout)} ({len(steps)} court moves)")
+        session.arrange(layout)
+        with prof.phase("sheet write"):
+            session.save()
+        print(f"Saved {args.file}")
+        _print_after_report(session.games, "After layout")
         return
 
     if args.move_round_to_front is not None:
@@ -1170,40 +2659,18 @@ def main() -> None:
                 "Refusing to modify without --write. "
                 "Example: --move-round-to-front 17 --write"
             )
-        wb = openpyxl.load_workbook(args.file, data_only=False)
-        if args.sheet not in wb.sheetnames:
-            raise SystemExit(f"Sheet {args.sheet!r} not in {wb.sheetnames}")
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
+        with prof.phase("workbook load (writable) + parse"):
+            session = WeekSheetSession(args.file, args.sheet, max_games=args.max_games)
         r = args.move_round_to_front
         print(
             f"Moving round {r} to front: new Game 01 gets former Game {r:02d} content; "
             f"former Games 01..{r - 1:02d} shift to 02..{r:02d}; Games {r + 1}.. unchanged in slots."
         )
-        move_round_to_front_of_sheet(ws, games, r)
-        wb.save(args.file)
-        wb.close()
+        session.move_round_to_front(r)
+        with prof.phase("sheet write"):
+            session.save()
         print(f"Saved {args.file}")
-
-        wb = openpyxl.load_workbook(args.file, data_only=True)
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
-        wb.close()
-        teams = teams_in_week(games)
-        after = score_schedule(games)
-        idle_after = find_idle_streak_issues(games, teams)
-        print(f"Rounds parsed: {len(games)}\nAfter move-to-front: {format_score(after)}")
-        print(f"\nIdle streak issues ({len(idle_after)}):")
-        for issue in idle_after:
-            gn = ", ".join(issue["game_numbers"])
-            print(f"  {issue['team']}: {issue['streak_len']} rounds ({gn}) [{issue['severity']}]")
-        ref_after = find_consecutive_refs(games)
-        if ref_after:
-            print("\nConsecutive referee assignments:")
-            for team, i, j in ref_after:
-                print(f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}")
-        else:
-            print("\nNo consecutive referee assignments.")
+        _print_after_report(session.games, "After move-to-front")
         return
 
     if args.shift_up_from is not None:
@@ -1212,53 +2679,33 @@ def main() -> None:
                 "Refusing to modify without --write. "
                 "Example: --shift-up-from 18 --write"
             )
-        wb = openpyxl.load_workbook(args.file, data_only=False)
-        if args.sheet not in wb.sheetnames:
-            raise SystemExit(f"Sheet {args.sheet!r} not in {wb.sheetnames}")
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
+        with prof.phase("workbook load (writable) + parse"):
+            session = WeekSheetSession(args.file, args.sheet, max_games=args.max_games)
         print(
             f"Shifting rounds up from empty slot {args.shift_up_from}: "
             f"content moves to fill gap; last slot cleared."
         )
-        shift_following_rounds_up_one_slot(ws, games, args.shift_up_from)
-        wb.save(args.file)
-        wb.close()
+        session.shift_up_from(args.shift_up_from)
+        with prof.phase("sheet write"):
+            session.save()
         print(f"Saved {args.file}")
-
-        wb = openpyxl.load_workbook(args.file, data_only=True)
-        ws = wb[args.sheet]
-        games = parse_week_schedule(ws, max_games=args.max_games)
-        wb.close()
-        teams = teams_in_week(games)
-        after = score_schedule(games)
-        idle_after = find_idle_streak_issues(games, teams)
-        print(f"Rounds parsed: {len(games)}\nAfter shift: {format_score(after)}")
-        print(f"\nIdle streak issues ({len(idle_after)}):")
-        for issue in idle_after:
-            gn = ", ".join(issue["game_numbers"])
-            print(f"  {issue['team']}: {issue['streak_len']} rounds ({gn}) [{issue['severity']}]")
-        ref_after = find_consecutive_refs(games)
-        if ref_after:
-            print("\nConsecutive referee assignments:")
-            for team, i, j in ref_after:
-                print(f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}")
-        else:
-            print("\nNo consecutive referee assignments.")
+        _print_after_report(session.games, "After shift")
         return
 
-    wb = openpyxl.load_workbook(args.file, data_only=True)
-    if args.sheet not in wb.sheetnames:
-        raise SystemExit(f"Sheet {args.sheet!r} not in {wb.sheetnames}")
-    ws = wb[args.sheet]
-    games = parse_week_schedule(ws, max_games=args.max_games)
-    wb.close()
+    weeks = read_week_sheets(args.file, [args.sheet], max_games=args.max_games, profile=prof)
+    games = weeks[args.sheet]["games"]
+
+    if args.format == "ndjson":
+        _write_ndjson_report(args, games, ScoreCache())
+        prof.lap("ndjson report")
+        return
 
     print(f"Rounds parsed: {len(games)}")
 
-    teams = teams_in_week(games)
-    baseline = score_schedule(games)
-    idle_issues = find_idle_streak_issues(games, teams)
+    week = WeekSchedule.from_games(games)
+    baseline = score_schedule(week)
+    idle_issues = find_idle_streak_issues(week)
+    cache = ScoreCache()
 
     print(f"File: {args.file}\nSheet: {args.sheet}\nBaseline: {format_score(baseline)}")
     print(f"\nIdle streak issues ({len(idle_issues)}):")
@@ -1270,7 +2717,7 @@ def main() -> None:
             f"slots {[s + 1 for s in slots]} [{issue['severity']}]"
         )
 
-    ref_issues = find_consecutive_refs(games)
+    ref_issues = find_consecutive_refs(week)
     if ref_issues:
         print("\nConsecutive referee assignments:")
         for team, i, j in ref_issues:
@@ -1278,23 +2725,24 @@ def main() -> None:
                 f"  {team}: {games[i]['gameNumber']} → {games[j]['gameNumber']}"
             )
 
-    dup_court = find_same_team_both_courts_issues(games)
+    dup_court = find_same_team_both_courts_issues(week)
     if dup_court:
         print("\nSame team on both courts in one round:")
         for x in dup_court:
             print(f"  {x['team']}: {x['gameNumber']}")
 
-    sm = find_consecutive_same_matchup(games)
+    sm = find_consecutive_same_matchup(week)
     if sm:
         print("\nSame matchup in consecutive games:")
         for i, j, m in sm:
             print(f"  games {i + 1}/{j + 1}: {tuple(m)}")
 
-    rp = ref_play_conflicts(games)
+    rp = ref_play_conflicts(week)
     if rp:
         print("\nRef also playing:")
         for ref, i, court in rp:
             print(f"  {ref} in {games[i]['gameNumber']} ({court})")
+    prof.lap("baseline checks")
 
     print("\n--- Phase A: adjacent round swaps (swap slots i and i+1) ---")
     for i in range(len(games) - 1):
@@ -1305,6 +2753,8 @@ def main() -> None:
             f"  Swap {games[i]['gameNumber']} <-> {games[i + 1]['gameNumber']}: "
             f"{format_score(s)}  ({delta})"
         )
+    prof.lap("phase A: adjacent swaps")
+    prof.count("phase A: candidates", max(0, len(games) - 1))
 
     print("\n--- Phase B: all pairwise round swaps (improving or equal-best idle) ---")
     improved: list[tuple[Score, int, int]] = []
@@ -1330,6 +2780,9 @@ def main() -> None:
     else:
         for s, a, b in improved[:30]:
             print(f"  Swap Game slots {a:02d} & {b:02d}: {format_score(s)}")
+    prof.lap("phase B: pairwise swaps")
+    prof.count("phase B: candidates", n * (n - 1) // 2)
+    prof.count("phase B: improving", len(improved), of="phase B: candidates")
 
     if not args.no_cross_streak and len(idle_issues) >= 2:
         print(
@@ -1352,10 +2805,16 @@ def main() -> None:
                 print(
                     "  No cross-streak single swap beats baseline; options above are best by score order."
                 )
+        prof.lap("phase D: cross-streak swaps")
+        prof.count("phase D: listed", len(cross))
 
     if args.deep:
         print("\n--- Phase C (--deep): up to two round-swaps, strictly better than baseline ---")
-        top = search_two_round_swaps(games, top=30)
+        hits0, misses0 = cache.hits, cache.misses
+        budget = SearchBudget(args.time_budget, args.target_score)
+        top = search_two_round_swaps(games, top=30, cache=cache, budget=budget)
+        if not budget.complete:
+            print(f"  ({budget.describe()})")
         if not top:
             print("  No improving sequence found.")
         else:
@@ -1364,6 +2823,11 @@ def main() -> None:
                     f"swap({a + 1},{b + 1})" for a, b in seq
                 )
                 print(f"  {desc} -> {format_score(s)}")
+        print(f"  Score cache: {cache.stats()}")
+        prof.lap("deep: two-round swaps")
+        prof.count("deep: sequences", cache.hits - hits0 + cache.misses - misses0)
+        prof.count("deep: cache hits", cache.hits - hits0, of="deep: sequences")
+        prof.count("deep: scored", cache.misses - misses0, of="deep: sequences")
 
     if args.deep_partial:
         lock_final = not args.deep_partial_no_final_lock
@@ -1374,9 +2838,18 @@ def main() -> None:
             "  Filters: no same team on both courts, no ref-play, no error idle streaks; "
             f"last round single-court matchup: {'required' if lock_final else 'off'}"
         )
+        budget = SearchBudget(args.time_budget, args.target_score)
         singles, doubles = search_deep_partial_swap_sequences(
-            games, lock_final_single=lock_final, top=30
+            games,
+            lock_final_single=lock_final,
+            top=30,
+            jobs=args.jobs,
+            cache=cache,
+            profile=prof,
+            budget=budget,
         )
+        if not budget.complete:
+            print(f"  ({budget.describe()})")
         if singles:
             print(f"  One partial swap ({len(singles)} improving move(s), showing up to 30):")
             for s, m in singles:
@@ -1396,28 +2869,72 @@ def main() -> None:
             print(
                 "  No two-step partial swap improves the score under these filters."
             )
+        if args.jobs <= 1:
+            print(f"  Score cache: {cache.stats()}")
+        prof.lap("deep-partial")
 
     if args.ref_flip:
         print("\n--- Ref flips (court1Ref ↔ court2Ref per selected rounds; idle unchanged) ---")
-        if len(games) > 22:
+        ranked = search_ref_flips(games, profile=prof)
+        best = ranked[0]
+        print(f"  Best mask={best[1]:#x}: {format_score(best[0])}")
+        if best[0] < baseline:
+            print("  Improves non-idle metrics vs baseline.")
+        else:
+            print("  No improvement vs baseline on ref_pairs/same_match/ref_play.")
+        base_rp = baseline.ref_pairs
+        better_rp = [x for x in ranked if x[0].ref_pairs < base_rp][:10]
+        if better_rp:
+            print(f"  Top masks lowering consecutive_ref_edges below {base_rp}:")
+            for s, mask in better_rp:
+                print(f"    mask={mask:#x} {format_score(s)}")
+        prof.lap("ref-flip")
+
+    if args.optimize:
+        lock_final = not args.deep_partial_no_final_lock
+        fixed = sorted({slot - 1 for slot in args.fix_slot if 1 <= slot <= len(games)})
+        seconds = OPTIMIZE_DEFAULT_SECONDS if args.time_budget is None else args.time_budget
+        limit = f"{args.max_iters} moves" if args.max_iters is not None else f"{seconds:g}s"
+        print(
+            f"\n--- Optimize: simulated annealing ({args.optimize_moves} moves, {limit}, "
+            f"seed {args.seed}, fixed slots {[k + 1 for k in fixed] or 'none'}) ---"
+        )
+
+        def report(elapsed: float, iters: int, current: Score, best: Score) -> None:
             print(
-                f"  Skipped: {len(games)} games → 2^n exhaustive ref-flip search too large "
-                f"(max 22)."
+                f"  [{elapsed:5.1f}s] {iters} moves  current idle={current.idle_count}  "
+                f"best {format_score(best)}",
+                flush=True,
             )
+
+        budget = SearchBudget(target=args.target_score)
+        best, blockers, layout, iters = optimize_week(
+            games,
+            fixed_slots=fixed,
+            moves=args.optimize_moves,
+            time_budget=seconds,
+            max_iters=args.max_iters,
+            seed=args.seed,
+            lock_final_single=lock_final,
+            progress=report,
+            cache=cache,
+            budget=budget,
+        )
+        if not budget.complete:
+            print(f"  ({budget.describe()})")
+        print(f"  {iters} moves tried. Best: {format_score(best)}  ({_delta_str(baseline, best)})")
+        print(f"  Score cache: {cache.stats()}")
+        if blockers:
+            print(f"  Best week still has {blockers} blocker(s) (see partial_schedule_blockers).")
+        if layout == identity_layout(len(games)):
+            print("  No change from the current week.")
         else:
-            ranked = search_ref_flips(games)
-            best = ranked[0]
-            print(f"  Best mask={best[1]:#x}: {format_score(best[0])}")
-            if best[0] < baseline:
-                print("  Improves non-idle metrics vs baseline.")
-            else:
-                print("  No improvement vs baseline on ref_pairs/same_match/ref_play.")
-            base_rp = baseline.ref_pairs
-            better_rp = [x for x in ranked if x[0].ref_pairs < base_rp][:10]
-            if better_rp:
-                print(f"  Top masks lowering consecutive_ref_edges below {base_rp}:")
-                for s, mask in better_rp:
-                    print(f"    mask={mask:#x} {format_score(s)}")
+            # One whole-week move: the single swaps in between may break partial_schedule_blockers.
+            print("  Apply with:")
+            no_lock = " --deep-partial-no-final-lock" if not lock_final else ""
+            print(f"    --apply-order {format_layout(layout)}{no_lock} --write")
+        prof.lap("optimize")
+        prof.count("optimize: moves", iters)
 
 
 def _delta_str(before: Score, after: Score) -> str:
@@ -1,20 +1,22 @@
 """
 Analyze Week 4 Schedule and suggest ways to fix "ref twice in a row".
 Recommends swapping entire rounds (both game + ref rows) so no team is double-booked.
+
+  python3 suggest_ref_swaps_week4.py
+  python3 suggest_ref_swaps_week4.py --file "..." --sheet "Week 4 Schedule" --format ndjson
 """
 
-import openpyxl
-from setup_standings import detect_teams
+import argparse
+from itertools import combinations
+
+from league_schedule_format import TEAM_REF
+from week_schedule import WeekSchedule, as_week_schedule, iter_bits
+from week_sheet_reader import read_week_sheets, read_workbook_teams
 
 WEEK_4_SHEET = "Week 4 Schedule"
 FILE_PATH = "public/league_schedules/Winter 2026 BYOT League.xlsx"
 
 
-def get_teams(wb):
-    all_teams = detect_teams(wb)
-    return [t for t in all_teams if not t.startswith("Refs:")]
-
-
 def parse_week_schedule(ws, max_games=None):
     """Parse game blocks (game row + ref row) from a week sheet.
 
@@ -62,33 +64,28 @@ def parse_week_schedule(ws, max_games=None):
 
 
 def find_consecutive_refs(games):
-    """Return list of (team, game_index_first, game_index_second)."""
+    """Return list of (team, game_index_first, game_index_second).
+
+    `games` may be parse_week_schedule dicts or a WeekSchedule; teams within a pair come out alphabetically.
+    """
+    week = as_week_schedule(games)
+    refs = week.refs
     issues = []
-    for i in range(len(games) - 1):
-        curr, next_g = games[i], games[i + 1]
-        refs_curr = {curr["court1Ref"], curr["court2Ref"]} - {""}
-        refs_next = {next_g["court1Ref"], next_g["court2Ref"]} - {""}
-        for team in refs_curr & refs_next:
-            issues.append((team, i, i + 1))
+    for i in range(len(week) - 1):
+        for t in iter_bits(refs[i] & refs[i + 1]):
+            issues.append((week.teams[t], i, i + 1))
     return issues
 
 
 def find_consecutive_same_matchup(games):
     """Warn when the same two teams play each other in consecutive games. Returns list of (i, j, matchup)."""
+    week = as_week_schedule(games)
     issues = []
-    for i in range(len(games) - 1):
-        curr, next_g = games[i], games[i + 1]
-        curr_matchups = [curr["court1_teams"], curr["court2_teams"]]
-        next_matchups = [next_g["court1_teams"], next_g["court2_teams"]]
-        for cm in curr_matchups:
-            if len(cm) != 2:
-                continue
-            for nm in next_matchups:
-                if len(nm) != 2:
-                    continue
-                if cm == nm:
-                    issues.append((i, i + 1, cm))
-                    break
+    for i in range(len(week) - 1):
+        next_matchups = (week.court1[i + 1], week.court2[i + 1])
+        for cm in (week.court1[i], week.court2[i]):
+            if cm.bit_count() == 2 and cm in next_matchups:
+                issues.append((i, i + 1, frozenset(week.names(cm))))
     return issues
 
 
@@ -105,23 +102,27 @@ def games_with_same_three_playing(games):
 
 
 def games_after_round_swap(games, i, j):
-    """Return a new list with round i and round j swapped (by ref/player content; game numbers stay in slot)."""
-    import copy
-    new_games = copy.deepcopy(games)
-    new_games[i] = copy.deepcopy(games[j])
-    new_games[j] = copy.deepcopy(games[i])
-    new_games[i]["gameNumber"] = games[i]["gameNumber"]
-    new_games[j]["gameNumber"] = games[j]["gameNumber"]
+    """Return a new list with round i and round j swapped (by ref/player content; game numbers stay in slot).
+
+    Only the two swapped round dicts are copied; untouched rounds are shared with `games`.
+    """
+    new_games = list(games)
+    new_games[i] = {**games[j], "gameNumber": games[i]["gameNumber"]}
+    new_games[j] = {**games[i], "gameNumber": games[j]["gameNumber"]}
     return new_games
 
 
+def swap_rounds_in_place(games, i, j):
+    """Swap rounds i and j inside `games` (game numbers stay in slot). Calling it again undoes it."""
+    if i == j:
+        return
+    games[i], games[j] = games[j], games[i]
+    games[i]["gameNumber"], games[j]["gameNumber"] = games[j]["gameNumber"], games[i]["gameNumber"]
+
+
 def games_after_reorder(games, perm):
     """Return new list: new_games[k] = games[perm[k]], with game numbers relabeled to match slot (Game 01, 02, ...)."""
-    import copy
-    new_games = [copy.deepcopy(games[perm[k]]) for k in range(len(games))]
-    for k in range(len(new_games)):
-        new_games[k]["gameNumber"] = f"Game {k + 1:02d}"
-    return new_games
+    return [{**games[perm[k]], "gameNumber": f"Game {k + 1:02d}"} for k in range(len(games))]
 
 
 def find_move_to_start_or_end_solutions(games, issues):
@@ -220,31 +221,147 @@ def ref_assignment_feasible(games, teams):
     """
     Check if there exists ANY ref assignment (who refs which game) for the current
     game order and matchups such that no team refs in two consecutive games.
-    Uses backtracking over games; each game needs 2 refs from (teams - playing).
+    Each game needs one ref per active court from (teams - playing).
     """
-    n = len(games)
-    if n == 0:
-        return True
-    teams_set = set(teams)
-
-    def pool(game_idx):
-        return teams_set - games[game_idx]["playing"]
-
-    def solve(game_idx, prev_refs):
-        if game_idx >= n:
-            return True
-        p = pool(game_idx)
-        # Must pick 2 refs from p that are not in prev_refs
-        available = sorted(p - prev_refs)
-        if len(available) < 2:
-            return False
-        from itertools import combinations
-        for r1, r2 in combinations(available, 2):
-            if solve(game_idx + 1, {r1, r2}):
-                return True
+    options = _ref_options(games, sorted(teams), TEAM_REF)[1]
+    if options is None:
         return False
+    return _consecutive_floor(options)[0][0] == 0
 
-    return solve(0, set())
+
+def optimal_ref_assignment(games, refs, schedule_format=TEAM_REF):
+    """
+    Best ref assignment for the current game order, or None if some game has too few eligible refs.
+
+    Each game needs one ref per court with a matchup. In team-ref weeks `refs` are the teams and a
+    team cannot ref a game it plays in; in dedicated-ref weeks `refs` are the officials and any of
+    them can ref any game. Minimizes consecutive refs first, then the spread (max - min) of ref
+    counts per ref.
+
+    Returns {"refs": [(court1Ref, court2Ref), ...], "consecutive": int, "counts": {ref: n},
+    "spread": int}. A ref who already had a game keeps that court when possible.
+    """
+    names = sorted(refs)
+    valid, options = _ref_options(games, names, schedule_format)
+    if options is None:
+        return None
+    n = len(options)
+    floor = _consecutive_floor(options)
+    best = floor[0][0]
+    total = sum(len(valid_sides) for valid_sides in valid)
+    t_count = len(names)
+    # avail_after[t][k]: games k.. where ref t could be picked (upper bound on refs still to come)
+    avail_after = []
+    for t in range(t_count):
+        counts = [0] * (n + 1)
+        for k in range(n - 1, -1, -1):
+            counts[k] = counts[k + 1] + any(o >> t & 1 for o in options[k])
+        avail_after.append(counts)
+
+    # Counts live in the band [lo, lo + spread]; try the narrowest band first. Memoized DFS over
+    # (game, previous refs, counts, consecutive so far), pruned by the count-free floor.
+    path = None
+    spread = 0
+    while path is None and t_count:
+        for lo in range(max(0, -(-total // t_count) - spread), total // t_count + 1):
+            hi = lo + spread
+            dead = set()
+
+            def solve(k, prev, counts, used, lo=lo, hi=hi, dead=dead):
+                if k == n:
+                    return []
+                key = (k, prev, counts, used)
+                if key in dead:
+                    return None
+                for o in options[k]:
+                    u = used + (o & prev).bit_count()
+                    if u + floor[k + 1][o] > best:
+                        continue
+                    nxt = list(counts)
+                    for t in iter_bits(o):
+                        nxt[t] += 1
+                    if any(
+                        c > hi or c + avail_after[t][k + 1] < lo
+                        for t, c in enumerate(nxt)
+                    ):
+                        continue
+                    rest = solve(k + 1, o, tuple(nxt), u)
+                    if rest is not None:
+                        return [o] + rest
+                dead.add(key)
+                return None
+
+            path = solve(0, 0, (0,) * t_count, 0)
+            if path is not None:
+                break
+        else:
+            spread += 1
+    if path is None:
+        path = [0] * n
+
+    out = []
+    counts = dict.fromkeys(names, 0)
+    for g, sides, o in zip(games, valid, path):
+        chosen = [names[t] for t in iter_bits(o)]
+        for r in chosen:
+            counts[r] += 1
+        slots = {1: "", 2: ""}
+        for court in sides:
+            current = g[f"court{court}Ref"]
+            if current in chosen:
+                slots[court] = current
+                chosen.remove(current)
+        for court in sides:
+            if not slots[court]:
+                slots[court] = chosen.pop(0)
+        out.append((slots[1], slots[2]))
+    return {
+        "refs": out,
+        "consecutive": best,
+        "counts": counts,
+        "spread": max(counts.values()) - min(counts.values()) if counts else 0,
+    }
+
+
+def _ref_options(games, names, schedule_format):
+    """
+    Per game: the courts needing a ref, and every eligible ref set as a bitmask over `names`
+    (None instead if some game cannot be staffed).
+    """
+    week = as_week_schedule(games)
+    ids = {name: t for t, name in enumerate(names)}
+    valid = []
+    options = []
+    for k, g in enumerate(games):
+        sides = [court for court in (1, 2) if week.valid_courts[k] >> (court - 1) & 1]
+        pool = [
+            ids[name]
+            for name in names
+            if schedule_format != TEAM_REF or name not in g["playing"]
+        ]
+        if len(pool) < len(sides):
+            return valid, None
+        valid.append(sides)
+        options.append([sum(1 << t for t in c) for c in combinations(pool, len(sides))])
+    return valid, options
+
+
+def _consecutive_floor(options):
+    """
+    floor[k][prev]: fewest consecutive refs over games k.. when game k-1 used ref set `prev`
+    (floor[0][0] is the optimum for the week, ignoring balance). Backward DP over ref sets.
+    """
+    n = len(options)
+    floor = [None] * (n + 1)
+    floor[n] = dict.fromkeys(options[n - 1] if n else [0], 0)
+    for k in range(n - 1, -1, -1):
+        prevs = options[k - 1] if k else [0]
+        nxt = floor[k + 1]
+        floor[k] = {
+            prev: min((o & prev).bit_count() + nxt[o] for o in options[k])
+            for prev in prevs
+        }
+    return floor
 
 
 def print_four_games_highlight(games, issues):
@@ -326,25 +443,77 @@ def find_safe_swaps(games, issues, teams):
                 opts.append({
                     "problem": f"{team} refs in {games[i]['gameNumber']} and {games[j]['gameNumber']}",
                     "fix": f"Swap: {games[j]['gameNumber']} {j_court_label} ref ({team}) ↔ {games[game_idx]['gameNumber']} {g_court_label} ref ({other_ref})",
+                    "slot": j + 1,
+                    "court": j_court,
+                    "other_slot": game_idx + 1,
+                    "other_court": court,
                 })
         suggestions.append((team, games[i]["gameNumber"], games[j]["gameNumber"], opts))
     return suggestions
 
 
+def write_ndjson_report(file_path, sheet, games, teams):
+    """--format ndjson: conflicts plus every ref fix this script finds, one JSON record per line
+    (record layout in schedule_diagnostics)."""
+    from schedule_diagnostics import suggestion_record, swap_rounds_op, week_records, write_ndjson
+
+    week = WeekSchedule.from_games(games)
+    write_ndjson(week_records(week, file=file_path, sheet=sheet))
+    issues = find_consecutive_refs(week)
+    records = []
+    for rank, (desc, perm) in enumerate(find_move_to_start_or_end_solutions(games, issues), 1):
+        records.append(suggestion_record(
+            sheet, "move_round", rank, [{"op": "reorder", "order": [k + 1 for k in perm]}], description=desc
+        ))
+    # find_insert_between_solutions is written for the 10-round Week 4 layout.
+    insert_solutions = find_insert_between_solutions(games, issues) if len(games) == 10 else []
+    for rank, (desc, perm) in enumerate(insert_solutions, 1):
+        records.append(suggestion_record(
+            sheet, "insert_between", rank, [{"op": "reorder", "order": [k + 1 for k in perm]}], description=desc
+        ))
+    for rank, (a, b) in enumerate(find_safe_round_swaps(games, issues), 1):
+        records.append(suggestion_record(sheet, "round_swap", rank, [swap_rounds_op(a, b)]))
+    rank = 0
+    for _team, _g_i, _g_j, opts in find_safe_swaps(games, issues, teams):
+        for o in opts:
+            rank += 1
+            move = {"op": "swapRefs", "a": o["slot"], "courtA": o["court"], "b": o["other_slot"], "courtB": o["other_court"]}
+            records.append(suggestion_record(sheet, "ref_swap", rank, [move], description=o["fix"]))
+    best = optimal_ref_assignment(games, teams)
+    if best is not None:
+        moves = [
+            {"op": "setRefs", "slot": k + 1, "court1Ref": r1, "court2Ref": r2}
+            for k, (g, (r1, r2)) in enumerate(zip(games, best["refs"]))
+            if (r1, r2) != (g["court1Ref"], g["court2Ref"])
+        ]
+        records.append(suggestion_record(
+            sheet, "ref_assignment", 1, moves,
+            consecutive=best["consecutive"], counts=best["counts"], spread=best["spread"],
+        ))
+    write_ndjson(records)
+
+
 def main():
-    wb = openpyxl.load_workbook(FILE_PATH)
-    if WEEK_4_SHEET not in wb.sheetnames:
-        print(f"Sheet '{WEEK_4_SHEET}' not found.")
-        return
-    ws = wb[WEEK_4_SHEET]
-    games = parse_week_schedule(ws)
+    parser = argparse.ArgumentParser(description="Consecutive-ref fixes for one week sheet.")
+    parser.add_argument("--file", default=FILE_PATH, help="Path to .xlsx")
+    parser.add_argument("--sheet", default=WEEK_4_SHEET, help="Week sheet name")
+    parser.add_argument(
+        "--format", choices=("text", "ndjson"), default="text",
+        help="ndjson: one JSON record per line (see schedule_diagnostics) instead of the text report.",
+    )
+    args = parser.parse_args()
+    games = read_week_sheets(args.file, [args.sheet])[args.sheet]["games"]
     if len(games) < 10:
         print(f"Only found {len(games)} games.")
         return
-    teams = get_teams(wb)
+    teams = [t for t in read_workbook_teams(args.file) if not t.startswith("Refs:")]
+    if args.format == "ndjson":
+        write_ndjson_report(args.file, args.sheet, games, teams)
+        return
     print("Order in sheet (as read):", ", ".join(g["gameNumber"] for g in games))
     print()
-    issues = find_consecutive_refs(games)
+    week = WeekSchedule.from_games(games)
+    issues = find_consecutive_refs(week)
     if not issues:
         print("No consecutive ref issues found.")
         return
@@ -382,7 +551,7 @@ def main():
             print(f"  Move {games[idx]['gameNumber']} to start:  {desc_rem(reordered_start, rem_start)}")
         print()
 
-    same_matchup = find_consecutive_same_matchup(games)
+    same_matchup = find_consecutive_same_matchup(week)
     if same_matchup:
         print("Warning — same teams playing each other in consecutive games:")
         for i, j, matchup in same_matchup:
@@ -418,7 +587,7 @@ def main():
             print("  (No two games share exactly 3 participants.)")
         print()
 
-    insert_solutions = find_insert_between_solutions(games, issues)
+    insert_solutions = find_insert_between_solutions(games, issues) if len(games) == 10 else []
     if insert_solutions:
         print("Move one round between the other pair (fixes both; no double-booking):")
         for desc, perm in insert_solutions:
@@ -484,6 +653,15 @@ def main():
     if not feasible:
         print("  (With 6 teams there are only 2 refs per game, so not every game order has a valid")
         print("  ref assignment from scratch; fixing the current assignment with swaps can still work.)")
+    best = optimal_ref_assignment(games, teams)
+    if best is not None:
+        print(
+            f"  Best ref assignment for this game order: {best['consecutive']} consecutive ref(s), "
+            f"ref counts spread {best['spread']}."
+        )
+        for g, (r1, r2) in zip(games, best["refs"]):
+            if (r1, r2) != (g["court1Ref"], g["court2Ref"]):
+                print(f"    {g['gameNumber']}: Court 1 ref {r1 or '-'}, Court 2 ref {r2 or '-'}")
     print()
     if not suggestions:
         print("No ref-only swap options found (any swap would put a team reffing a game they're playing in).")
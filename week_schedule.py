@@ -0,0 +1,208 @@
+"""
+Compact week schedule for the idle/ref checkers.
+
+parse_week_schedule (suggest_ref_swaps_week4) returns one dict per round with team-name strings,
+sets and frozensets. WeekSchedule interns every team name as a small int (ids follow sorted name
+order, so iterating bits ascending lists teams alphabetically) and stores each round as fixed-width
+slot arrays plus team bitmasks, so checkers work with integer AND/OR instead of hashing strings.
+
+  week = WeekSchedule.from_games(parse_week_schedule(ws))
+  games = week.to_games()   # same dicts parse_week_schedule returns
+
+Build it once per week and hand the same WeekSchedule to every checker; suggest_idle_swaps'
+IncrementalScorer starts from it too and re-encodes moved rounds with encode_round.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterator
+
+NO_TEAM = -1
+# Court cell values that never count as a team playing (team_is_playing in suggest_idle_swaps).
+NON_TEAM_SLOTS = ("", "BYE", "TBD")
+TWO_COURTS = 0b11
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Team ids set in `mask`, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class WeekSchedule:
+    """
+    One week of rounds. Per round k:
+      home1/away1/home2/away2/ref1/ref2[k]  team id or NO_TEAM (int16 arrays)
+      court1[k], court2[k]                  bits of the named teams on that court (court*_teams)
+      court1_active[k], court2_active[k]    same, without BYE/TBD
+      playing[k]                            court1 | court2 (the dict's `playing` set)
+      refs[k]                               bits of the named refs
+      valid_courts[k]                       bit 0: court 1 has a valid matchup (valid_matchup_side), bit 1: court 2;
+                                            TWO_COURTS when both do (round_has_two_courts)
+    """
+
+    __slots__ = (
+        "teams",
+        "team_ids",
+        "non_team_mask",
+        "game_numbers",
+        "rows",
+        "ref_rows",
+        "home1",
+        "away1",
+        "home2",
+        "away2",
+        "ref1",
+        "ref2",
+        "court1",
+        "court2",
+        "court1_active",
+        "court2_active",
+        "playing",
+        "refs",
+        "valid_courts",
+    )
+
+    def __init__(self, teams: list[str]) -> None:
+        self.teams = list(teams)
+        self.team_ids = {t: i for i, t in enumerate(self.teams)}
+        self.non_team_mask = _mask(tuple(self.team_ids.get(t, NO_TEAM) for t in NON_TEAM_SLOTS[1:]))
+        self.game_numbers: list[str] = []
+        self.rows = array("i")
+        self.ref_rows = array("i")
+        self.home1 = array("h")
+        self.away1 = array("h")
+        self.home2 = array("h")
+        self.away2 = array("h")
+        self.ref1 = array("h")
+        self.ref2 = array("h")
+        self.court1: list[int] = []
+        self.court2: list[int] = []
+        self.court1_active: list[int] = []
+        self.court2_active: list[int] = []
+        self.playing: list[int] = []
+        self.refs: list[int] = []
+        self.valid_courts = array("b")
+
+    def __len__(self) -> int:
+        return len(self.game_numbers)
+
+    @classmethod
+    def from_games(cls, games: list[dict[str, Any]]) -> WeekSchedule:
+        """Build from parse_week_schedule dicts. Teams are every player or ref name in the week."""
+        names: set[str] = set()
+        for g in games:
+            names |= {t for t in (*g["court1_playing"], *g["court2_playing"]) if t}
+            names |= {r for r in (g["court1Ref"], g["court2Ref"]) if r}
+        week = cls(sorted(names))
+        for g in games:
+            week.append_round(
+                g["gameNumber"],
+                g["court1_playing"],
+                g["court2_playing"],
+                g["court1Ref"],
+                g["court2Ref"],
+                g.get("row", 0),
+                g.get("refRow", 0),
+            )
+        return week
+
+    def append_round(
+        self,
+        game_number: str,
+        court1_playing: tuple[str, str],
+        court2_playing: tuple[str, str],
+        court1_ref: str,
+        court2_ref: str,
+        row: int = 0,
+        ref_row: int = 0,
+    ) -> None:
+        h1, a1, h2, a2, r1, r2, c1, c2, valid = self.encode_round(
+            court1_playing, court2_playing, court1_ref, court2_ref
+        )
+        self.game_numbers.append(game_number)
+        self.rows.append(row)
+        self.ref_rows.append(ref_row)
+        self.home1.append(h1)
+        self.away1.append(a1)
+        self.home2.append(h2)
+        self.away2.append(a2)
+        self.ref1.append(r1)
+        self.ref2.append(r2)
+        self.court1.append(c1)
+        self.court2.append(c2)
+        self.court1_active.append(c1 & ~self.non_team_mask)
+        self.court2_active.append(c2 & ~self.non_team_mask)
+        self.playing.append(c1 | c2)
+        self.refs.append(_mask((r1, r2)))
+        self.valid_courts.append(valid)
+
+    def encode_round(
+        self,
+        court1_playing: tuple[str, str],
+        court2_playing: tuple[str, str],
+        court1_ref: str,
+        court2_ref: str,
+    ) -> tuple[int, int, int, int, int, int, int, int, int]:
+        """(home1, away1, home2, away2, ref1, ref2, court1, court2, valid_courts) for one round."""
+        ids = self.team_ids
+        h1, a1 = (ids[t] if t else NO_TEAM for t in court1_playing)
+        h2, a2 = (ids[t] if t else NO_TEAM for t in court2_playing)
+        r1 = ids[court1_ref] if court1_ref else NO_TEAM
+        r2 = ids[court2_ref] if court2_ref else NO_TEAM
+        valid = _valid_side(court1_playing) | _valid_side(court2_playing) << 1
+        return h1, a1, h2, a2, r1, r2, _mask((h1, a1)), _mask((h2, a2)), valid
+
+    def active_mask(self, k: int) -> int:
+        """Teams actually playing in round k (court cells minus BYE/TBD)."""
+        return self.court1_active[k] | self.court2_active[k]
+
+    def name(self, team_id: int) -> str:
+        return self.teams[team_id] if team_id != NO_TEAM else ""
+
+    def names(self, mask: int) -> list[str]:
+        return [self.teams[i] for i in iter_bits(mask)]
+
+    def to_games(self) -> list[dict[str, Any]]:
+        """Round dicts in parse_week_schedule form."""
+        name = self.name
+        games: list[dict[str, Any]] = []
+        for k in range(len(self)):
+            c1 = (name(self.home1[k]), name(self.away1[k]))
+            c2 = (name(self.home2[k]), name(self.away2[k]))
+            games.append({
+                "gameNumber": self.game_numbers[k],
+                "court1Ref": name(self.ref1[k]),
+                "court2Ref": name(self.ref2[k]),
+                "court1_playing": c1,
+                "court2_playing": c2,
+                "court1_teams": frozenset(self.names(self.court1[k])),
+                "court2_teams": frozenset(self.names(self.court2[k])),
+                "playing": set(self.names(self.playing[k])),
+                "row": self.rows[k],
+                "refRow": self.ref_rows[k],
+            })
+        return games
+
+
+def as_week_schedule(games: list[dict[str, Any]] | WeekSchedule) -> WeekSchedule:
+    """Checkers accept either form; dict lists are converted once per call."""
+    if isinstance(games, WeekSchedule):
+        return games
+    return WeekSchedule.from_games(games)
+
+
+def _mask(team_ids: tuple[int, ...]) -> int:
+    m = 0
+    for t in team_ids:
+        if t != NO_TEAM:
+            m |= 1 << t
+    return m
+
+
+def _valid_side(pair: tuple[str, str]) -> int:
+    home, away = pair
+    return int(home not in NON_TEAM_SLOTS and away not in NON_TEAM_SLOTS)
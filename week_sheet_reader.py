@@ -0,0 +1,342 @@
+"""
+One-pass reader for week sheets, for analysis-only runs.
+
+parse_week_schedule (suggest_ref_swaps_week4), count_games_on_week_sheet and
+detect_format_from_week_sheet (league_schedule_format) and the week-sheet part of detect_teams each
+walk a sheet with ws.cell(row, col). read_week_sheet walks rows 1-500, columns A-I once with
+iter_rows(values_only=True) and returns all of it together; open_schedule_workbook loads read-only
+(cached values, no cell objects), so nothing builds the full openpyxl object graph.
+
+  wb = open_schedule_workbook(path)
+  week = read_week_sheet(wb["Week 3 Schedule"])
+  week["games"], week["format"], week["game_count"], week["teams"]
+  wb.close()
+
+Sheets that will be edited still need a writable load and parse_week_schedule (row numbers match).
+
+read_week_sheets and read_workbook_teams keep what they read in a sidecar next to the workbook
+(.<name>.xlsx.parsed, zlib-compressed JSON) keyed by size, mtime and SHA-256 of the file, so
+repeat runs on an unchanged workbook skip openpyxl entirely. Any edit to the workbook invalidates it;
+a changed mtime with the same content only re-stamps the sidecar. The sidecar is plain data, so an
+unreadable or unexpected one is just a cache miss. SCHEDULE_PARSE_CACHE=0 in the
+environment turns it off (cache=None below means "use the environment").
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Iterable
+
+import openpyxl
+from league_schedule_format import DEDICATED_REF, TEAM_REF
+from profiling import Profile
+from setup_standings import detect_teams, detect_week_sheets
+from week_schedule import NON_TEAM_SLOTS
+
+# count_games_on_week_sheet scans rows 1-499; parse_week_schedule stops at 200 (+ its ref row).
+SCAN_ROWS = 500
+PARSE_ROWS = 200
+FORMAT_ROWS = 40
+# Columns read: A game number, B/D court 1 home/away (ref on the next row in B), G/I court 2.
+SCAN_COLS = 9
+
+
+def open_schedule_workbook(path: str) -> Any:
+    """Read-only, cached-values load. Close it when done (read-only keeps the file open)."""
+    return openpyxl.load_workbook(path, read_only=True, data_only=True)
+
+
+def read_week_sheet(ws: Any, *, max_games: int | None = None) -> dict[str, Any]:
+    """
+    games: same dicts as parse_week_schedule(ws, max_games); format: detect_format_from_week_sheet;
+    game_count: count_games_on_week_sheet; teams: sorted player and ref names in `games`.
+    """
+    return scan_week_rows(
+        ws.iter_rows(min_row=1, max_row=SCAN_ROWS, max_col=SCAN_COLS, values_only=True),
+        max_games=max_games,
+    )
+
+
+def read_week_sheets(
+    path: str,
+    sheets: list[str] | None = None,
+    *,
+    max_games: int | None = None,
+    cache: bool | None = None,
+    profile: Profile | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    read_week_sheet for each of `sheets` (default: detect_week_sheets order), from the sidecar
+    when it is current, else from one read-only load (which then updates the sidecar).
+    `profile` times the sidecar read, workbook load, parse and sidecar write separately.
+    """
+    prof = profile or Profile()
+    cache = _cache_enabled(cache)
+    with prof.phase("parse cache read"):
+        entry = _load_entry(path) if cache else None
+    if entry is None:
+        entry = {"sheetnames": None, "week_sheets": None, "teams": None, "sheets": {}}
+    wanted = sheets
+    if entry["sheetnames"] is not None:
+        if wanted is None:
+            wanted = entry["week_sheets"]
+        _check_sheets(wanted, entry["sheetnames"])
+    if entry["sheetnames"] is None or any(s not in entry["sheets"] for s in wanted):
+        with prof.phase("workbook load"):
+            wb = open_schedule_workbook(path)
+        try:
+            entry["sheetnames"] = list(wb.sheetnames)
+            entry["week_sheets"] = detect_week_sheets(wb)
+            if wanted is None:
+                wanted = entry["week_sheets"]
+            _check_sheets(wanted, wb.sheetnames)
+            with prof.phase("parse"):
+                for s in wanted:
+                    if s not in entry["sheets"]:
+                        entry["sheets"][s] = read_week_sheet(wb[s])
+        finally:
+            wb.close()
+        if cache:
+            with prof.phase("parse cache write"):
+                _store_entry(path, entry)
+    return {s: _first_games(entry["sheets"][s], max_games) for s in wanted}
+
+
+def read_workbook_teams(path: str, *, cache: bool | None = None) -> list[str]:
+    """setup_standings.detect_teams on a read-only load, kept in the same sidecar."""
+    cache = _cache_enabled(cache)
+    entry = _load_entry(path) if cache else None
+    if entry is not None and entry["teams"] is not None:
+        return list(entry["teams"])
+    wb = open_schedule_workbook(path)
+    try:
+        teams = detect_teams(wb)
+        if entry is None:
+            entry = {
+                "sheetnames": list(wb.sheetnames),
+                "week_sheets": detect_week_sheets(wb),
+                "teams": None,
+                "sheets": {},
+            }
+    finally:
+        wb.close()
+    entry["teams"] = teams
+    if cache:
+        _store_entry(path, entry)
+    return list(teams)
+
+
+def scan_week_rows(
+    rows: Iterable[tuple[Any, ...]], *, max_games: int | None = None
+) -> dict[str, Any]:
+    """The read_week_sheet pass over value tuples for rows 1, 2, ... (short or missing rows are blank)."""
+    grid: list[tuple[Any, ...]] = []
+    for values in rows:
+        if len(values) < SCAN_COLS:
+            values = tuple(values) + (None,) * (SCAN_COLS - len(values))
+        grid.append(values)
+    blank = (None,) * SCAN_COLS
+
+    def at(row: int) -> tuple[Any, ...]:
+        return grid[row - 1] if row <= len(grid) else blank
+
+    game_count = 0
+    schedule_format = None
+    for row in range(1, min(len(grid), SCAN_ROWS - 1) + 1):
+        cell = at(row)[0]
+        if not (cell and isinstance(cell, str) and cell.strip().startswith("Game ")):
+            continue
+        game_count += 1
+        if schedule_format is None and row < FORMAT_ROWS:
+            schedule_format = _format_after_first_game(at(row + 1))
+    if schedule_format is None:
+        schedule_format = TEAM_REF
+
+    games = _games(at, max_games)
+    names: set[str] = set()
+    for g in games:
+        names |= g["playing"]
+        names |= {r for r in (g["court1Ref"], g["court2Ref"]) if r}
+    return {
+        "games": games,
+        "format": schedule_format,
+        "game_count": game_count,
+        "teams": sorted(t for t in names if t not in NON_TEAM_SLOTS),
+    }
+
+
+def _format_after_first_game(next_row: tuple[Any, ...]) -> str:
+    next_a, next_b = next_row[0], next_row[1]
+    if next_a and isinstance(next_a, str) and next_a.strip().startswith("Game "):
+        return DEDICATED_REF
+    if next_b and isinstance(next_b, str):
+        lower = next_b.strip().lower()
+        if lower in ("ref", "refs") or lower.startswith("refs:"):
+            return TEAM_REF
+    return DEDICATED_REF
+
+
+def _games(at: Any, max_games: int | None) -> list[dict[str, Any]]:
+    games: list[dict[str, Any]] = []
+    row = 1
+    while row <= PARSE_ROWS:
+        values = at(row)
+        a1 = values[0]
+        if not a1 or "Game" not in str(a1):
+            row += 1
+            continue
+        game_num = str(a1).strip()
+        c1_home = (values[1] or "").strip()
+        c1_away = (values[3] or "").strip()
+        c2_home = (values[6] or "").strip()
+        c2_away = (values[8] or "").strip()
+        ref_row = row + 1
+        ref_values = at(ref_row)
+        ref1_raw = (ref_values[1] or "").strip()
+        ref2_raw = (ref_values[6] or "").strip()
+        ref1 = ref1_raw.replace("Refs:", "").strip() if ref1_raw.startswith("Refs:") else ref1_raw
+        ref2 = ref2_raw.replace("Refs:", "").strip() if ref2_raw.startswith("Refs:") else ref2_raw
+        games.append({
+            "gameNumber": game_num,
+            "court1Ref": ref1,
+            "court2Ref": ref2,
+            "court1_playing": (c1_home, c1_away),
+            "court2_playing": (c2_home, c2_away),
+            "court1_teams": frozenset({c1_home, c1_away} - {""}),
+            "court2_teams": frozenset({c2_home, c2_away} - {""}),
+            "playing": {t for t in (c1_home, c1_away, c2_home, c2_away) if t},
+            "row": row,
+            "refRow": ref_row,
+        })
+        row = ref_row + 1
+        if max_games is not None and len(games) >= max_games:
+            break
+    return games
+
+
+# Bump when the sidecar layout or the parse itself changes.
+CACHE_VERSION = 2
+
+
+def cache_path(path: str) -> str:
+    head, name = os.path.split(os.path.abspath(path))
+    return os.path.join(head, f".{name}.parsed")
+
+
+def _cache_enabled(cache: bool | None) -> bool:
+    if cache is None:
+        return os.environ.get("SCHEDULE_PARSE_CACHE", "1") != "0"
+    return cache
+
+
+def _check_sheets(sheets: list[str], sheetnames: list[str]) -> None:
+    missing = [s for s in sheets if s not in sheetnames]
+    if missing:
+        raise SystemExit(f"Sheet {missing[0]!r} not in {sheetnames}")
+
+
+def _first_games(week: dict[str, Any], max_games: int | None) -> dict[str, Any]:
+    """The cache holds full parses; parse_week_schedule's max_games only truncates the rounds."""
+    if max_games is None or len(week["games"]) <= max_games:
+        return week
+    games = week["games"][:max_games]
+    names: set[str] = set()
+    for g in games:
+        names |= g["playing"]
+        names |= {r for r in (g["court1Ref"], g["court2Ref"]) if r}
+    return {**week, "games": games, "teams": sorted(t for t in names if t not in NON_TEAM_SLOTS)}
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_entry(path: str) -> dict[str, Any] | None:
+    """The sidecar's entry if it matches the workbook on disk, else None."""
+    try:
+        st = os.stat(path)
+        with open(cache_path(path), "rb") as f:
+            stored = json.loads(zlib.decompress(f.read()))
+        if not isinstance(stored, dict) or stored.get("version") != CACHE_VERSION:
+            return None
+        if stored["size"] != st.st_size:
+            return None
+        entry = _entry_from_json(stored["entry"])
+        if stored["mtime_ns"] != st.st_mtime_ns:
+            if stored["sha256"] != _file_sha256(path):
+                return None
+            stored["mtime_ns"] = st.st_mtime_ns
+            _write_sidecar(path, stored)
+    except (OSError, zlib.error, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return entry
+
+
+def _entry_from_json(raw: dict[str, Any]) -> dict[str, Any]:
+    """Undo _json_default: the game fields read_week_sheet builds as tuples and sets."""
+    sheets = {}
+    for name, week in raw["sheets"].items():
+        games = [
+            {
+                **g,
+                "court1_playing": tuple(g["court1_playing"]),
+                "court2_playing": tuple(g["court2_playing"]),
+                "court1_teams": frozenset(g["court1_teams"]),
+                "court2_teams": frozenset(g["court2_teams"]),
+                "playing": set(g["playing"]),
+            }
+            for g in week["games"]
+        ]
+        sheets[name] = {**week, "games": games}
+    return {
+        "sheetnames": raw["sheetnames"],
+        "week_sheets": raw["week_sheets"],
+        "teams": raw["teams"],
+        "sheets": sheets,
+    }
+
+
+def _json_default(value: Any) -> list[Any]:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _store_entry(path: str, entry: dict[str, Any]) -> None:
+    try:
+        st = os.stat(path)
+        sha = _file_sha256(path)
+    except OSError:
+        return
+    _write_sidecar(
+        path,
+        {
+            "version": CACHE_VERSION,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha,
+            "entry": entry,
+        },
+    )
+
+
+def _write_sidecar(path: str, stored: dict[str, Any]) -> None:
+    """Best effort: an unwritable directory just means no cache."""
+    target = cache_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(json.dumps(stored, default=_json_default).encode(), 1))
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass